@@ -1,93 +1,231 @@
+import json
 import logging
-from fastapi import APIRouter, UploadFile, File, HTTPException, Query
-from app.schemas.resume import UploadResponse, SearchResponse, SearchChunk
+from typing import Any, AsyncIterator, List, Literal, Optional, Tuple
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from app.schemas.resume import (
+    IngestJobResponse, BulkUploadResponse, DeleteResponse, SearchResponse, SearchChunk,
+    BatchSearchRequest, BatchSearchResponse
+)
 from app.schemas.question import QuestionRequest, QuestionResponse
 from app.schemas.evaluation import EvaluationRequest, EvaluationResponse
 from app.schemas.auditor import AuditRequest, AuditResponse
 from app.schemas.decision import DecisionRequest, DecisionResponse
-from app.utils.pdf_parser import extract_text_from_pdf
-from app.utils.chunking import chunk_text
 from app.services.embeddings import get_embeddings
+from app.services.embedding_cache import embedding_cache
+from app.services.llm_cache import llm_cache
+from app.services.llm_scheduler import llm_scheduler, LLMUnavailableError
+from app.services.prompt_builder import prompt_stats
 from app.services.faiss_store import faiss_store
-from app.services.question_agent import generate_interview_questions
-from app.services.evaluation_agent import evaluate_candidate_answer
+from app.core.config import settings
+from app.services.ingest_service import ingest_pipeline, create_job, get_job, expand_uploads, ingest_bulk
+from app.services.question_agent import generate_interview_questions, stream_interview_questions
+from app.services.evaluation_agent import evaluate_candidate_answer, stream_candidate_evaluation
 from app.services.auditor_agent import audit_evaluation
 from app.services.decision_agent import make_hiring_decision
+from app.services.auth_service import get_current_user, get_optional_user
+from app.services.user_cache import user_cache
+from app.services.warmup import ensure_vector_store
+from app.services.retrieval import retrieve_chunks
+from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.post("/upload-resume", response_model=UploadResponse)
-async def upload_resume(file: UploadFile = File(...)):
+@router.post("/upload-resume", response_model=IngestJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def upload_resume(file: UploadFile = File(...), current_user: Optional[User] = Depends(get_optional_user)):
+    """Accepts a resume and queues it for background parsing, chunking, embedding and indexing."""
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are supported.")
     
     try:
         content = await file.read()
-        text = extract_text_from_pdf(content)
+        job = await create_job(file.filename, content, owner_id=current_user.id if current_user else None)
+        await ingest_pipeline.submit(job)
+        return job
         
-        if not text:
-            raise HTTPException(status_code=400, detail="Could not extract text from PDF.")
-            
-        chunks = chunk_text(text)
-        
-        if not chunks:
-            raise HTTPException(status_code=400, detail="No chunks generated from text.")
-            
-        embeddings = await get_embeddings(chunks)
-        
-        metadatas = [
-            {"filename": file.filename, "text": chunk, "chunk_index": i} 
-            for i, chunk in enumerate(chunks)
-        ]
-        
-        faiss_store.add_vectors(embeddings, metadatas)
-        
-        return UploadResponse(
-            filename=file.filename,
-            num_chunks=len(chunks),
-            message="Resume successfully ingested and indexed."
+    except Exception as e:
+        logger.error(f"Error queuing resume: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/upload-resumes", response_model=BulkUploadResponse)
+async def upload_resumes(files: List[UploadFile] = File(...), current_user: Optional[User] = Depends(get_optional_user)):
+    """Ingests many PDFs (or zip archives of PDFs) with shared embedding calls and a single index write."""
+    for file in files:
+        if not file.filename.lower().endswith((".pdf", ".zip")):
+            raise HTTPException(status_code=400, detail=f"Unsupported file type: {file.filename}")
+
+    try:
+        uploads = expand_uploads([(file.filename, await file.read()) for file in files])
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not read upload: {e}")
+
+    if not uploads:
+        raise HTTPException(status_code=400, detail="No PDF files found in upload.")
+    if len(uploads) > settings.bulk_upload_max_files:
+        raise HTTPException(status_code=400, detail=f"At most {settings.bulk_upload_max_files} files can be uploaded at once.")
+
+    try:
+        results = await ingest_bulk(uploads, owner_id=current_user.id if current_user else None)
+        return BulkUploadResponse(
+            total_files=len(results),
+            total_chunks=sum(result.num_chunks or 0 for result in results),
+            results=results
         )
-        
-    except HTTPException:
-        raise
     except Exception as e:
-        logger.error(f"Error processing resume: {e}")
+        logger.error(f"Error processing bulk upload: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/ingest-jobs/{job_id}", response_model=IngestJobResponse)
+async def get_ingest_job(job_id: str):
+    """Reports the current stage of a resume ingestion job."""
+    job = await get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Ingestion job not found.")
+    return job
+
+@router.delete("/resumes/{resume_id:path}", response_model=DeleteResponse)
+async def delete_resume(resume_id: str, current_user: User = Depends(get_current_user)):
+    """
+    Removes every indexed chunk of a resume the signed-in user uploaded, given its filename or
+    the id of the ingest job /upload-resume returned for it. Anonymous uploads have no owner to
+    prove, so they cannot be deleted, and another user's resume of the same filename is left untouched.
+    """
+    await ensure_vector_store()
+    job = await get_job(resume_id)
+    if job:
+        filename, job_id = job.filename, job.id
+        owners = {job.owner_id} if job.owner_id else set()
+    else:
+        filename, job_id = resume_id, None
+        owners = await run_in_threadpool(faiss_store.document_owners, filename)
+    if owners and current_user.id not in owners:
+        raise HTTPException(status_code=403, detail="Not allowed to delete this resume.")
+
+    try:
+        if job_id:
+            deleted = await run_in_threadpool(faiss_store.delete_document, owner_id=current_user.id, job_id=job_id)
+        else:
+            deleted = await run_in_threadpool(faiss_store.delete_document, filename, current_user.id)
+    except Exception as e:
+        logger.error(f"Error deleting resume: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Resume not found among your uploads.")
+    return DeleteResponse(filename=filename, job_id=job_id, num_chunks=deleted, message="Resume removed from the index.")
+
+def _owner_scope(mine: bool, current_user: Optional[User]) -> Optional[str]:
+    """Resolves the 'only my uploads' search scope to an owner id."""
+    if not mine:
+        return None
+    if current_user is None:
+        raise HTTPException(status_code=401, detail="Sign in to search only your own uploads.", headers={"WWW-Authenticate": "Bearer"})
+    return current_user.id
+
+def _search_chunks(results) -> List[SearchChunk]:
+    chunks = []
+    for metadata, score in results:
+        chunk_info = {"filename": metadata.get("filename", ""), "chunk_index": metadata.get("chunk_index", -1)}
+        # Chunks indexed before page tracking have no page range
+        if "page_start" in metadata:
+            chunk_info["page_start"] = metadata["page_start"]
+            chunk_info["page_end"] = metadata["page_end"]
+        chunks.append(SearchChunk(text=metadata.get("text", ""), metadata=chunk_info, score=score))
+    return chunks
+
 @router.get("/search", response_model=SearchResponse)
-async def search_resume(query: str = Query(..., min_length=1), top_k: int = Query(5, ge=1, le=20)):
+async def search_resume(
+    query: str = Query(..., min_length=1),
+    top_k: int = Query(5, ge=1, le=20),
+    filename: Optional[str] = Query(None, description="Only search chunks of this resume"),
+    mine: bool = Query(False, description="Only search resumes uploaded by the signed-in user"),
+    mode: Optional[Literal["vector", "lexical", "hybrid"]] = Query(
+        None, description="vector, lexical (BM25 keyword match, no OpenAI call) or hybrid; defaults to the server's search_mode"
+    ),
+    current_user: Optional[User] = Depends(get_optional_user)
+):
+    owner_id = _owner_scope(mine, current_user)
     try:
-        query_embedding = (await get_embeddings([query]))[0]
-        results = faiss_store.search(query_embedding, top_k=top_k)
-        
-        search_chunks = [
-            SearchChunk(
-                text=metadata.get("text", ""),
-                metadata={"filename": metadata.get("filename", ""), "chunk_index": metadata.get("chunk_index", -1)},
-                score=score
-            )
-            for metadata, score in results
-        ]
-        
-        return SearchResponse(query=query, results=search_chunks)
+        results = await retrieve_chunks(query, top_k=top_k, filename=filename, owner_id=owner_id, mode=mode)
+        return SearchResponse(query=query, results=_search_chunks(results))
         
+    except LLMUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error searching: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_resume_batch(request: BatchSearchRequest, current_user: Optional[User] = Depends(get_optional_user)):
+    """Runs many searches with one embeddings call and one FAISS query over the whole batch."""
+    if len(request.queries) > settings.search_batch_max_queries:
+        raise HTTPException(status_code=400, detail=f"At most {settings.search_batch_max_queries} queries can be searched at once.")
+    owner_id = _owner_scope(request.mine, current_user)
+    try:
+        query_embeddings = await get_embeddings([item.query for item in request.queries])
+        await ensure_vector_store()
+        batch_results = await run_in_threadpool(
+            faiss_store.search_batch,
+            query_embeddings,
+            [item.top_k for item in request.queries],
+            filename=request.filename,
+            owner_id=owner_id
+        )
+        return BatchSearchResponse(results=[
+            SearchResponse(query=item.query, results=_search_chunks(results))
+            for item, results in zip(request.queries, batch_results)
+        ])
+
+    except LLMUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error batch searching: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/generate-questions", response_model=QuestionResponse)
-async def generate_questions(request: QuestionRequest):
+async def generate_questions(request: QuestionRequest, current_user: Optional[User] = Depends(get_optional_user)):
+    owner_id = _owner_scope(request.mine, current_user)
     try:
-        response = await generate_interview_questions(request.role)
+        response = await generate_interview_questions(request.role, filename=request.filename, owner_id=owner_id)
         return response
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
+    except LLMUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error generating questions: {e}")
         raise HTTPException(status_code=500, detail="Failed to generate questions. Please try again.")
 
+def _sse_response(events: AsyncIterator[Tuple[str, Any]], failure_message: str) -> StreamingResponse:
+    """Streams (event, data) pairs as server-sent events, ending with an error event if the stream fails."""
+    async def encode():
+        try:
+            async for event, data in events:
+                payload = data.model_dump(mode="json") if isinstance(data, BaseModel) else data
+                yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+        except LLMUnavailableError as e:
+            yield f"event: error\ndata: {json.dumps({'status': 503, 'detail': str(e)})}\n\n"
+        except Exception as e:
+            logger.error(f"{failure_message}: {e}")
+            yield f"event: error\ndata: {json.dumps({'status': 500, 'detail': failure_message})}\n\n"
+
+    # Disable proxy buffering so each event reaches the client as soon as it is written
+    return StreamingResponse(encode(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.post("/generate-questions/stream")
+async def generate_questions_stream(request: QuestionRequest, current_user: Optional[User] = Depends(get_optional_user)):
+    """
+    Streams interview questions as server-sent events: one `question` event per question
+    as soon as it is generated, then a `result` event with the full QuestionResponse.
+    """
+    owner_id = _owner_scope(request.mine, current_user)
+    events = stream_interview_questions(request.role, filename=request.filename, owner_id=owner_id)
+    return _sse_response(events, "Failed to generate questions. Please try again.")
+
 @router.post("/evaluate-answer", response_model=EvaluationResponse)
 async def evaluate_answer(request: EvaluationRequest):
     try:
@@ -95,10 +233,20 @@ async def evaluate_answer(request: EvaluationRequest):
         return response
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
+    except LLMUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error evaluating answer: {e}")
         raise HTTPException(status_code=500, detail="Failed to evaluate answer. Please try again.")
 
+@router.post("/evaluate-answer/stream")
+async def evaluate_answer_stream(request: EvaluationRequest):
+    """
+    Streams an evaluation as server-sent events: one `field` event per top-level field
+    as soon as it is generated, then a `result` event with the full EvaluationResponse.
+    """
+    return _sse_response(stream_candidate_evaluation(request), "Failed to evaluate answer. Please try again.")
+
 @router.post("/audit-evaluation", response_model=AuditResponse)
 async def audit_eval(request: AuditRequest):
     try:
@@ -106,19 +254,35 @@ async def audit_eval(request: AuditRequest):
         return response
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
+    except LLMUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error executing evaluation audit: {e}")
         raise HTTPException(status_code=500, detail="Failed to complete audit. Please try again.")
 
 @router.post("/make-decision", response_model=DecisionResponse)
-async def make_decision(request: DecisionRequest):
+async def make_decision(
+    request: DecisionRequest,
+    mode: Literal["full", "fast"] = Query("full", description="fast skips the LLM and returns a rule-based justification")
+):
     try:
-        response = await make_hiring_decision(request)
+        response = await make_hiring_decision(request, mode=mode)
         return response
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
+    except LLMUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error executing hiring decision aggregation: {e}")
         raise HTTPException(status_code=500, detail="Failed to complete decision evaluation. Please try again.")
 
-
+@router.get("/cache-stats")
+async def cache_stats():
+    """Reports hit/miss counters for the shared caches, the OpenAI call scheduler, prompt token usage and the token cache."""
+    return {
+        "embeddings": embedding_cache.stats(),
+        "llm_responses": llm_cache.stats(),
+        "llm_scheduler": llm_scheduler.stats(),
+        "prompts": prompt_stats.stats(),
+        "auth": user_cache.stats(),
+    }
@@ -1,62 +1,89 @@
-from typing import List
-from fastapi import APIRouter, Depends, status
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas.session import SessionCreate, SessionResponse, SessionDetailResponse, RoundCreate, RoundResponse
+from app.schemas.session import SessionCreate, SessionResponse, SessionDetailResponse, RoundCreate, BulkRoundCreate, RoundResponse
 from app.services.session_service import (
     create_session, 
     get_user_sessions, 
     get_session_detail, 
     add_evaluation_round,
+    add_evaluation_rounds,
     complete_session
 )
-from app.services.auth_service import get_current_user
+from app.services.auth_service import get_current_user_id
+from app.core.config import settings
 from app.core.database import get_db
-from app.models.user import User
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
 @router.post("", response_model=SessionResponse, status_code=status.HTTP_201_CREATED)
 async def init_session(
     session_in: SessionCreate, 
-    current_user: User = Depends(get_current_user), 
+    user_id: str = Depends(get_current_user_id), 
     db: AsyncSession = Depends(get_db)
 ):
     """Creates a new interview session."""
-    return await create_session(db, current_user.id, session_in)
+    return await create_session(db, user_id, session_in)
 
 @router.get("", response_model=List[SessionResponse])
 async def list_sessions(
-    current_user: User = Depends(get_current_user), 
+    response: Response,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=settings.session_page_size_max, description="Sessions per page"),
+    status_filter: Optional[Literal["active", "completed"]] = Query(None, alias="status", description="Only sessions with this status"),
+    role: Optional[str] = Query(None, description="Only sessions for this role"),
+    user_id: str = Depends(get_current_user_id), 
     db: AsyncSession = Depends(get_db)
 ):
-    """Lists all past and active interview sessions for the user."""
-    return await get_user_sessions(db, current_user.id)
+    """
+    Lists the user's past and active interview sessions, newest first, one page at a time.
+    The body stays a plain list; when more sessions follow, the X-Next-Cursor header holds the
+    value to pass as `cursor` for the next page.
+    """
+    items, next_cursor = await get_user_sessions(
+        db, user_id, limit or settings.session_page_size, cursor=cursor, status=status_filter, role=role
+    )
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
 @router.get("/{session_id}", response_model=SessionDetailResponse)
 async def get_session(
     session_id: str, 
-    current_user: User = Depends(get_current_user), 
+    user_id: str = Depends(get_current_user_id), 
     db: AsyncSession = Depends(get_db)
 ):
     """Retrieves full details of a specific interview session, including its rounds."""
-    return await get_session_detail(db, current_user.id, session_id)
+    return await get_session_detail(db, user_id, session_id)
 
 @router.post("/{session_id}/add-round", response_model=RoundResponse, status_code=status.HTTP_201_CREATED)
 async def add_round(
     session_id: str, 
     round_in: RoundCreate, 
-    current_user: User = Depends(get_current_user), 
+    user_id: str = Depends(get_current_user_id), 
     db: AsyncSession = Depends(get_db)
 ):
     """Saves an evaluation result tightly coupled into the interview session."""
-    return await add_evaluation_round(db, current_user.id, session_id, round_in)
+    return await add_evaluation_round(db, user_id, session_id, round_in)
+
+@router.post("/{session_id}/rounds:bulk", response_model=List[RoundResponse], status_code=status.HTTP_201_CREATED)
+async def add_rounds_bulk(
+    session_id: str,
+    rounds_in: BulkRoundCreate,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """Saves many evaluation results into the interview session in one transaction, numbered in request order."""
+    if len(rounds_in.rounds) > settings.session_bulk_rounds_max:
+        raise HTTPException(status_code=400, detail=f"At most {settings.session_bulk_rounds_max} rounds can be added at once.")
+    return await add_evaluation_rounds(db, user_id, session_id, rounds_in.rounds)
 
 @router.post("/{session_id}/complete", response_model=SessionResponse)
 async def finish_session(
     session_id: str, 
-    current_user: User = Depends(get_current_user), 
+    user_id: str = Depends(get_current_user_id), 
     db: AsyncSession = Depends(get_db)
 ):
     """Marks an interview session as completed."""
-    return await complete_session(db, current_user.id, session_id)
+    return await complete_session(db, user_id, session_id)
@@ -7,14 +7,72 @@ load_dotenv()
 class Settings(BaseSettings):
     openai_api_key: str = Field(default="", alias="OPENAI_API_KEY", validation_alias="OPENAI_API_KEY")
     faiss_index_path: str = "faiss_index.bin"
+    faiss_snapshot_interval: int = 10000  # Logged vectors before a background full snapshot
+    faiss_index_type: str = "flat"  # flat, ivf_flat, ivf_pq, hnsw, sq8 or fp16
+    faiss_migrate_threshold: int = 100000  # Vectors before migrating from flat to faiss_index_type
+    faiss_nlist: int = 1024  # IVF coarse clusters
+    faiss_nprobe: int = 32  # IVF clusters scanned per query
+    faiss_pq_m: int = 64  # PQ sub-quantizers (must divide the dimension)
+    faiss_hnsw_m: int = 32  # HNSW graph neighbours per node
+    faiss_ef_search: int = 128  # HNSW search beam width
+    faiss_compaction_ratio: float = 0.2  # Tombstoned share of the index that triggers a compaction
+    faiss_exact_scope_max: int = 4096  # Scoped searches over at most this many ids are scored exactly
+    faiss_mmap: bool = True  # Memory-map the snapshot read-only so worker processes share its pages
+    faiss_rerank_factor: int = 4  # Compressed indexes (sq8, fp16, ivf_pq) over-fetch top_k times this and re-rank exactly; 0 disables
+    search_batch_max_queries: int = 128  # Max queries accepted by POST /search/batch
+    search_mode: str = "vector"  # vector, lexical (BM25, no OpenAI call) or hybrid; default for /search and question retrieval
+    hybrid_rrf_k: int = 60  # Reciprocal-rank fusion constant; larger values flatten the weight of top ranks
+    hybrid_candidates: int = 50  # Results taken from each of the lexical and vector rankings before fusion
+    hybrid_embedding_timeout_s: float = 2.0  # Hybrid searches fall back to lexical results if the query embedding takes longer; 0 waits
+    chunk_store_compress: bool = True  # zlib-compress chunk text in the on-disk chunk metadata store
     embedding_model: str = "text-embedding-3-small"
+    embedding_batch_size: int = 256  # Max texts per embeddings API call
+    embedding_coalesce_window_ms: float = 5.0  # 0 disables query micro-batching
+    embedding_coalesce_max_batch: int = 64
+    embedding_cache_enabled: bool = True
+    embedding_cache_path: str = "embedding_cache.db"
+    embedding_cache_memory_items: int = 10000
+    embedding_cache_disk_items: int = 200000  # ~6 KB per cached 1536-d vector
+    llm_requests_per_minute: int = 500  # Account-wide pacing for all OpenAI calls; 0 disables
+    llm_tokens_per_minute: int = 200000  # Estimated with tiktoken; 0 disables
+    llm_completion_token_estimate: int = 1000  # Output tokens assumed per chat call when pacing
+    tokenizer_retry_seconds: float = 300.0  # After tiktoken fails to load, wait this long before trying again
+    llm_burst_seconds: float = 5.0  # Budget that may be spent in one burst, in seconds of rate
+    llm_max_concurrency: int = 16
+    llm_max_retries: int = 5
+    llm_backoff_base_s: float = 0.5
+    llm_backoff_max_s: float = 20.0
+    llm_cache_enabled: bool = True  # Cache validated temperature-0 agent responses
+    llm_cache_path: str = "llm_cache.db"
+    llm_cache_memory_items: int = 1000
+    llm_cache_disk_items: int = 50000
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600
+    prompt_budget_questions: int = 4000  # Max prompt tokens (system + user) per agent; context is trimmed to fit
+    prompt_budget_evaluation: int = 6000
+    prompt_budget_audit: int = 6000
+    prompt_budget_decision: int = 3000
     chunk_size: int = 500
     chunk_overlap: int = 100
+    pdf_max_pages: int = 1000  # Larger PDFs are rejected; far above any resume or portfolio, it only stops runaway documents
+    pdf_timeout_s: float = 30.0  # Max text extraction time per PDF
+    pdf_parallel_min_pages: int = 16  # PDFs with at least this many pages are extracted by the process pool
+    pdf_min_pages_per_task: int = 8
+    pdf_workers: int = 4  # Processes extracting pages of large PDFs, capped at the CPU count
+    ingest_workers: int = 2  # Worker tasks per ingestion pipeline stage
+    ingest_queue_size: int = 16  # Max jobs buffered between two ingestion stages
+    ingest_lease_seconds: float = 60.0  # Unfinished jobs whose worker stopped renewing its claim this long are taken over
+    bulk_upload_max_files: int = 1000
+    session_bulk_rounds_max: int = 200  # Max rounds accepted by POST /sessions/{id}/rounds:bulk
+    session_page_size: int = 50  # Sessions per GET /sessions page unless the request sets a limit
+    session_page_size_max: int = 200
     
     # Auth and Database Settings
     database_url: str = Field(default="sqlite+aiosqlite:///./interview_engine.db", alias="DATABASE_URL")
     jwt_secret: str = Field(default="YOUR_SUPER_SECRET_KEY_CHANGE_IN_PRODUCTION", alias="JWT_SECRET")
     access_token_expire_minutes: int = Field(default=60, alias="ACCESS_TOKEN_EXPIRE_MINUTES")
+    auth_cache_enabled: bool = True  # Remember verified bearer tokens in-process to skip the per-request users lookup
+    auth_cache_items: int = 10000
+    auth_cache_ttl_seconds: float = 60.0  # Also how long a changed or deleted user may stay signed in on other workers
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
@@ -1,7 +1,10 @@
 from typing import AsyncGenerator
 import logging
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.schema import CreateColumn
 
 from app.core.config import settings
 
@@ -25,6 +28,42 @@ AsyncSessionLocal = async_sessionmaker(
 
 Base = declarative_base()
 
+def upgrade_schema(conn: Connection):
+    """
+    Adds model columns and indexes that are missing from tables created by an earlier release.
+    create_all only creates missing tables, so a column added to an existing model is
+    added here, then its info["backfill"] (if any) fills it in for existing rows. A backfill
+    is SQL, or a function of the connection for data SQL cannot portably reach (e.g. JSON);
+    one shared by several new columns runs once, after all of them exist.
+    """
+    inspector = inspect(conn)
+    preparer = conn.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        backfills = {}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_ddl = CreateColumn(column).compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {column_ddl}"))
+            logger.info(f"Added column {table.name}.{column.name}.")
+            backfill = column.info.get("backfill")
+            if backfill is not None:
+                backfills.setdefault(backfill, column.name)
+        for backfill, column_name in backfills.items():
+            if callable(backfill):
+                backfill(conn)
+            else:
+                conn.execute(text(backfill))
+            logger.info(f"Backfilled {table.name}.{column_name}{' and related columns' if callable(backfill) else ''}.")
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in indexes:
+                index.create(conn)
+                logger.info(f"Created index {index.name}.")
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency returning an asynchronous database session.
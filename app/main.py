@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from fastapi import FastAPI
 from app.api.endpoints import router as api_router
@@ -5,8 +6,11 @@ from app.services.decision_agent import make_hiring_decision
 
 from app.api.auth import router as auth_router
 from app.api.sessions import router as sessions_router
-from app.core.database import engine, Base
-from app.models import user, session  # Import models to register them with Base.metadata
+from app.core.database import engine, Base, upgrade_schema
+from app.models import user, session, ingest_job  # Import models to register them with Base.metadata
+from app.services.ingest_service import ingest_pipeline
+from app.services.warmup import READY, readiness, warm_up
+from app.utils.pdf_parser import shutdown_pool
 from contextlib import asynccontextmanager
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
@@ -17,8 +21,16 @@ async def lifespan(app: FastAPI):
     # Auto-create tables if they don't exist
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(upgrade_schema)
+    readiness.mark("database", READY)
+    await ingest_pipeline.start()
+    # Heavy subsystems load in the background so the server starts accepting connections right away
+    warmup_task = asyncio.create_task(warm_up())
     yield
     # Cleanup if needed
+    warmup_task.cancel()
+    await ingest_pipeline.stop()
+    shutdown_pool()
     await engine.dispose()
 
 app = FastAPI(
@@ -29,7 +41,7 @@ app = FastAPI(
 
 import os
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 
 # Read FRONTEND_URL if deployed in production, otherwise allow all origins
 frontend_url = os.environ.get("FRONTEND_URL", "*")
@@ -41,6 +53,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Browsers only let the frontend read response headers that are listed here
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(api_router)
@@ -50,6 +64,13 @@ app.include_router(sessions_router)
 @app.get("/", include_in_schema=False)
 async def root():
     return RedirectResponse(url="/docs")
+
+@app.get("/ready", include_in_schema=False)
+async def ready():
+    """Readiness probe: 200 once every subsystem has loaded, 503 with per-subsystem status until then."""
+    report = readiness.report()
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,29 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, LargeBinary, Text
+
+from app.core.database import Base
+
+class IngestJob(Base):
+    __tablename__ = "ingest_jobs"
+
+    id = Column(
+        String, 
+        primary_key=True, 
+        default=lambda: str(uuid.uuid4()), 
+        index=True
+    )
+    filename = Column(String, nullable=False)
+    owner_id = Column(String, ForeignKey("users.id"), nullable=True, index=True) # Set when uploaded by a signed-in user
+    status = Column(String, default="queued", nullable=False, index=True) # queued, parsing, chunking, embedding, indexing, completed, failed
+    num_chunks = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+    
+    # Raw upload kept until the job finishes so unfinished jobs can be resumed after a restart
+    content = Column(LargeBinary, nullable=True)
+
+    # Worker process currently running the job, and when its claim lapses unless renewed
+    claimed_by = Column(String, nullable=True)
+    lease_until = Column(DateTime, nullable=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,12 +1,62 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Boolean, JSON
+from typing import Dict
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Boolean, Float, JSON, Index, bindparam, select
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.schemas.decision import SCORE_AXES
+
+def backfill_score_aggregates(conn: Connection):
+    """Computes the score aggregates of sessions that predate them from their existing rounds."""
+    rounds = RoundEvaluation.__table__
+    sessions = InterviewSession.__table__
+    totals: Dict[str, dict] = {}
+    rows = conn.execute(
+        select(rounds.c.session_id, rounds.c.final_score, rounds.c.hallucination_detected, rounds.c.raw_evaluation_json)
+        .order_by(rounds.c.session_id, rounds.c.round_number)
+    )
+    for session_id, final_score, hallucinated, raw in rows:
+        total = totals.get(session_id)
+        if total is None:
+            total = totals[session_id] = {"rounds": 0, "score_sum": 0, "hallucination_count": 0}
+            total.update({f"{axis}_{part}": 0 for axis in SCORE_AXES for part in ("sum", "rounds")})
+        total["rounds"] += 1
+        total["score_sum"] += final_score
+        total["hallucination_count"] += int(bool(hallucinated))
+        total["last_score"] = final_score
+        scores = (raw or {}).get("scores") or {}
+        for axis in SCORE_AXES:
+            if scores.get(axis) is not None:
+                total[f"{axis}_sum"] += float(scores[axis])
+                total[f"{axis}_rounds"] += 1
+    if not totals:
+        return
+    names = [name for name in next(iter(totals.values())) if name != "rounds"] + ["mean_score"]
+    conn.execute(
+        sessions.update()
+        .where(sessions.c.id == bindparam("session_id"))
+        .values({name: bindparam(f"new_{name}") for name in names}),
+        [
+            {"session_id": session_id, "new_mean_score": total["score_sum"] / total["rounds"],
+             **{f"new_{name}": value for name, value in total.items() if name != "rounds"}}
+            for session_id, total in totals.items()
+        ]
+    )
+
+def _aggregate(type_, nullable: bool = False) -> Column:
+    """A per-session score aggregate, filled in for sessions that predate it by backfill_score_aggregates."""
+    if nullable:
+        return Column(type_, nullable=True, info={"backfill": backfill_score_aggregates})
+    return Column(type_, default=0, server_default="0", nullable=False, info={"backfill": backfill_score_aggregates})
 
 class InterviewSession(Base):
     __tablename__ = "interview_sessions"
+    __table_args__ = (
+        # Serves a user's session list newest first, and seeks straight to a keyset page cursor
+        Index("ix_interview_sessions_user_created", "user_id", "created_at", "id"),
+    )
 
     id = Column(
         String, 
@@ -17,11 +67,44 @@ class InterviewSession(Base):
     user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
     role = Column(String, nullable=False)
     status = Column(String, default="active", nullable=False) # active, completed
+    # Rounds added so far; bumped atomically to number new rounds without loading the existing ones
+    round_count = Column(
+        Integer, default=0, server_default="0", nullable=False,
+        info={"backfill": (
+            "UPDATE interview_sessions SET round_count = (SELECT COALESCE(MAX(round_number), 0) "
+            "FROM round_evaluations WHERE round_evaluations.session_id = interview_sessions.id)"
+        )}
+    )
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Aggregates over the session's rounds, updated in the same transaction as each round insert
+    score_sum = _aggregate(Integer)
+    mean_score = _aggregate(Float, nullable=True)
+    last_score = _aggregate(Integer, nullable=True)
+    hallucination_count = _aggregate(Integer)
+    # Per-axis sums, with the number of rounds that reported the axis since a round may leave one out
+    conceptual_clarity_sum = _aggregate(Float)
+    conceptual_clarity_rounds = _aggregate(Integer)
+    technical_depth_sum = _aggregate(Float)
+    technical_depth_rounds = _aggregate(Integer)
+    real_world_application_sum = _aggregate(Float)
+    real_world_application_rounds = _aggregate(Integer)
+    communication_precision_sum = _aggregate(Float)
+    communication_precision_rounds = _aggregate(Integer)
+
     user = relationship("User", backref="sessions")
     rounds = relationship("RoundEvaluation", back_populates="session", cascade="all, delete-orphan")
 
+    @property
+    def axis_means(self) -> Dict[str, float]:
+        """Mean score per axis over the rounds that reported it."""
+        means = {}
+        for axis in SCORE_AXES:
+            reported = getattr(self, f"{axis}_rounds")
+            if reported:
+                means[axis] = round(getattr(self, f"{axis}_sum") / reported, 2)
+        return means
+
 class RoundEvaluation(Base):
     __tablename__ = "round_evaluations"
 
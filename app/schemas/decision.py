@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import List, Literal, Optional
 
+SCORE_AXES = ("conceptual_clarity", "technical_depth", "real_world_application", "communication_precision")
+
 class RoundAudit(BaseModel):
     hallucination_detected: bool = Field(..., description="Whether a hallucination was detected in this round's evaluation")
     reasoning_alignment_score: int = Field(..., description="Alignment score from 1-10")
@@ -25,3 +27,6 @@ class DecisionResponse(BaseModel):
     overall_confidence: Literal["Low", "Medium", "High"] = Field(..., description="Confidence in this decision")
     hire_recommendation: Literal["Strong Hire", "Hire", "Leaning Hire", "Leaning No Hire", "No Hire"] = Field(..., description="The final hiring recommendation")
     justification: str = Field(..., description="A brief text justification aggregating the structured data")
+
+class DecisionJustification(BaseModel):
+    justification: str = Field(..., description="A brief text justification of the computed decision")
@@ -1,8 +1,10 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 
 class QuestionRequest(BaseModel):
     role: str = Field(..., description="The role the candidate is interviewing for (e.g., Backend Engineer)")
+    filename: Optional[str] = Field(None, description="Only use context from this candidate's resume")
+    mine: bool = Field(False, description="Only use context from resumes uploaded by the signed-in user")
 
 class QuestionResponse(BaseModel):
     questions: List[str] = Field(..., description="List of generated interview questions")
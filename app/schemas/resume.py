@@ -1,5 +1,7 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+import uuid
 
 class SearchChunk(BaseModel):
     text: str
@@ -10,7 +12,43 @@ class SearchResponse(BaseModel):
     query: str
     results: List[SearchChunk]
 
-class UploadResponse(BaseModel):
+class BatchSearchQuery(BaseModel):
+    query: str = Field(..., min_length=1)
+    top_k: int = Field(5, ge=1, le=20)
+
+class BatchSearchRequest(BaseModel):
+    queries: List[BatchSearchQuery] = Field(..., min_length=1)
+    filename: Optional[str] = Field(None, description="Only search chunks of this resume")
+    mine: bool = Field(False, description="Only search resumes uploaded by the signed-in user")
+
+class BatchSearchResponse(BaseModel):
+    results: List[SearchResponse]
+
+class DeleteResponse(BaseModel):
     filename: str
+    job_id: Optional[uuid.UUID] = Field(None, description="Ingest job whose resume was deleted, when deleted by job id")
     num_chunks: int
     message: str
+
+class IngestJobResponse(BaseModel):
+    id: uuid.UUID
+    filename: str
+    status: str
+    num_chunks: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class BulkFileResult(BaseModel):
+    filename: str
+    status: str  # indexed, failed
+    num_chunks: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkUploadResponse(BaseModel):
+    total_files: int
+    total_chunks: int
+    results: List[BulkFileResult]
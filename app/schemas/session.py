@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 import uuid
 from app.schemas.decision import RoundEvaluation as DecisionRoundEvaluation
@@ -13,6 +13,12 @@ class SessionResponse(BaseModel):
     role: str
     status: str
     created_at: datetime
+    round_count: int = 0
+    score_sum: int = Field(0, description="Sum of the rounds' final scores")
+    mean_score: Optional[float] = Field(None, description="Mean final score over the rounds; null before the first round")
+    last_score: Optional[int] = Field(None, description="Final score of the latest round")
+    hallucination_count: int = Field(0, description="Rounds whose evaluation the auditor flagged as hallucinated")
+    axis_means: Dict[str, float] = Field(default_factory=dict, description="Mean score per axis over the rounds that reported it")
 
     class Config:
         from_attributes = True
@@ -20,6 +26,9 @@ class SessionResponse(BaseModel):
 class RoundCreate(BaseModel):
     round_evaluation: DecisionRoundEvaluation
 
+class BulkRoundCreate(BaseModel):
+    rounds: List[RoundCreate] = Field(..., min_length=1, description="Rounds to add, numbered in this order")
+
 class RoundResponse(BaseModel):
     id: uuid.UUID
     session_id: uuid.UUID
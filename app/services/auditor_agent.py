@@ -1,6 +1,9 @@
 import json
 import logging
-from app.services.embeddings import client
+from app.core.config import settings
+from app.services.llm_cache import cached_json_completion
+from app.services.llm_scheduler import LLMUnavailableError
+from app.services.prompt_builder import PromptSection, build_user_prompt, compact_json, split_chunks
 from app.schemas.auditor import AuditRequest, AuditResponse
 
 logger = logging.getLogger(__name__)
@@ -52,40 +55,27 @@ Return STRICT JSON only matching this format:
   "verdict": "<Valid Evaluation | Potential Hallucination>"
 }"""
 
-    # We need to present the JSON evaluation as a formatted string to the LLM
-    eval_json_str = json.dumps(request.evaluation_json, indent=2)
-
-    user_prompt = f"""Question:
-{request.question}
-
-Candidate Answer:
-{request.candidate_answer}
-
-Resume Context:
-{request.resume_context}
-
-Evaluation Output:
-{eval_json_str}
-
-Evaluate the integrity of the evaluation based on the instructions."""
+    user_prompt = build_user_prompt(
+        "audit",
+        system_prompt,
+        [
+            PromptSection("Question:", [request.question]),
+            PromptSection("Candidate Answer:", [request.candidate_answer], drop_priority=1),
+            PromptSection("Resume Context:", split_chunks(request.resume_context), drop_priority=2),
+            # Compact JSON: indentation only costs tokens, the model reads it the same
+            PromptSection("Evaluation Output:", [compact_json(request.evaluation_json)]),
+        ],
+        "Evaluate the integrity of the evaluation based on the instructions.",
+        settings.prompt_budget_audit
+    )
 
     try:
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.0,  # Deterministic output
-            response_format={"type": "json_object"}
-        )
-        
-        content = response.choices[0].message.content
-        parsed_json = json.loads(content)
-        
-        # Pydantic will automatically validate the schema structure
-        return AuditResponse(**parsed_json)
+        # Served from the response cache when this exact prompt was answered before
+        return await cached_json_completion("audit", AuditResponse, system_prompt, user_prompt)
 
+    except LLMUnavailableError:
+        # Rate limited or down even after retries: surface it rather than returning a fallback verdict
+        raise
     except json.JSONDecodeError as e:
         logger.error(f"Audit LLM did not return valid JSON: {e}")
         return FALLBACK_AUDIT
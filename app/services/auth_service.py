@@ -8,9 +8,11 @@ from app.models.user import User
 from app.schemas.auth import UserCreate, TokenData
 from app.core.security import get_password_hash, verify_password, create_access_token
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal, get_db
+from app.services.user_cache import CachedUser, user_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
 async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
     result = await db.execute(select(User).where(User.email == email))
@@ -39,24 +41,58 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> User
         
     return user
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+async def _resolve_token(token: str, db: AsyncSession | None) -> CachedUser:
+    """
+    Verifies a bearer token and returns the identity of its user.
+    Tokens seen recently are served from the in-process user cache without touching the database;
+    otherwise the token is decoded and the user loaded, with `db` or a session opened just for it.
+    """
+    if settings.auth_cache_enabled:
+        cached = user_cache.get(token)
+        if cached is not None:
+            return cached
+
     try:
         payload = jwt.decode(token, settings.jwt_secret, algorithms=["HS256"])
         user_id: str = payload.get("sub")
         if user_id is None:
-            raise credentials_exception
+            raise _credentials_exception()
         token_data = TokenData(user_id=user_id)
     except JWTError:
-        raise credentials_exception
-        
-    result = await db.execute(select(User).where(User.id == token_data.user_id))
-    user = result.scalars().first()
-    
+        raise _credentials_exception()
+
+    query = select(User).where(User.id == token_data.user_id)
+    if db is not None:
+        user = (await db.execute(query)).scalars().first()
+    else:
+        async with AsyncSessionLocal() as own_db:
+            user = (await own_db.execute(query)).scalars().first()
+
     if user is None:
-        raise credentials_exception
-    return user
+        raise _credentials_exception()
+    if not settings.auth_cache_enabled:
+        return CachedUser(id=user.id, email=user.email, created_at=user.created_at)
+    return user_cache.put(token, user, token_expires_at=payload.get("exp"))
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> User:
+    return (await _resolve_token(token, db)).to_user()
+
+async def get_current_user_id(token: str = Depends(oauth2_scheme)) -> str:
+    """
+    Resolves just the signed-in user's id, for endpoints that need nothing else about the user.
+    A cached token is answered without a database session at all.
+    """
+    return (await _resolve_token(token, None)).id
+
+async def get_optional_user(token: str | None = Depends(optional_oauth2_scheme), db: AsyncSession = Depends(get_db)) -> User | None:
+    """Resolves the current user when a bearer token is sent, for endpoints that also allow anonymous use."""
+    if token is None:
+        return None
+    return await get_current_user(token, db)
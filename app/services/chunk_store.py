@@ -0,0 +1,264 @@
+import json
+import logging
+import re
+import sqlite3
+import threading
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Metadata keys with their own columns; anything else is kept in the `extra` JSON column
+_COLUMNS = ("filename", "owner_id", "chunk_index", "text", "job_id")
+
+# Distinct query terms kept for a lexical search; a pasted job description should not become a 500-term OR
+_MAX_QUERY_TERMS = 32
+
+
+def _match_expression(query: str) -> Optional[str]:
+    """Turns free text into an FTS5 query matching any of its words, each quoted so none is read as syntax."""
+    terms = list(dict.fromkeys(re.findall(r"\w+", query.lower())))[:_MAX_QUERY_TERMS]
+    return " OR ".join(f'"{term}"' for term in terms) if terms else None
+
+
+
+class ChunkStore:
+    """
+    On-disk chunk metadata keyed by vector id, backed by SQLite.
+    Only the rows for ids a search actually returns are read, so resident memory and
+    startup time do not grow with the number of chunks. Chunk text can be zlib-compressed.
+
+    Chunk text is also indexed in an FTS5 table for BM25 keyword search. The table is
+    contentless (it stores only the inverted index, not a second copy of the text) and is
+    kept in step with `chunks` inside the same transactions, so every process sees it.
+    A store opened over chunks written before the index existed builds it on first use.
+    """
+
+    def __init__(self, path: str, compress: bool = True):
+        self.path = path
+        self.compress = compress
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # The segment log is the durable record until a snapshot; checkpoint() syncs before log segments are dropped
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "id INTEGER PRIMARY KEY, filename TEXT NOT NULL, owner_id TEXT, chunk_index INTEGER, "
+            "text BLOB, compressed INTEGER NOT NULL DEFAULT 0, extra TEXT, job_id TEXT)"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(chunks)")}
+        if "job_id" not in columns:
+            self._db.execute("ALTER TABLE chunks ADD COLUMN job_id TEXT")
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_chunks_filename ON chunks (filename, id)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_chunks_owner_id ON chunks (owner_id, id)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_chunks_job_id ON chunks (job_id) WHERE job_id IS NOT NULL")
+        self._db.commit()
+        # Building the lexical index over an existing corpus can take a while, so it is left to
+        # ensure_lexical_index() (called by warm-up) rather than blocking the import that creates the store
+        self._lexical_ready = self._has_lexical_index()
+
+    def _has_lexical_index(self) -> bool:
+        return self._db.execute("SELECT 1 FROM sqlite_master WHERE name = 'chunks_fts'").fetchone() is not None
+
+    def ensure_lexical_index(self):
+        """Creates the lexical index, indexing any existing chunks, unless it already exists."""
+        if not self._lexical_ready:
+            with self._lock:
+                self._ensure_lexical_index()
+
+    def _ensure_lexical_index(self):
+        """Same as ensure_lexical_index; the caller holds self._lock."""
+        if self._lexical_ready:
+            return
+        # One write transaction creates and fills the table, so another process (or a crash
+        # halfway through) never leaves an index that exists but misses rows
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            if not self._has_lexical_index():
+                self._db.execute(
+                    "CREATE VIRTUAL TABLE chunks_fts USING fts5(text, content='', tokenize='porter unicode61')"
+                )
+                self._backfill_lexical_index()
+            self._db.commit()
+        except BaseException:
+            self._db.rollback()
+            raise
+        self._lexical_ready = True
+
+    def _backfill_lexical_index(self):
+        """Indexes the text of rows written before the lexical index existed."""
+        rows = self._db.execute("SELECT id, text, compressed FROM chunks")
+        total = 0
+        while batch := rows.fetchmany(1000):
+            self._db.executemany(
+                "INSERT INTO chunks_fts (rowid, text) VALUES (?, ?)",
+                [(idx, self._decode_text(text, compressed)) for idx, text, compressed in batch]
+            )
+            total += len(batch)
+        if total:
+            logger.info(f"Built the lexical index over {total} existing chunks.")
+
+    def _encode_row(self, idx: int, metadata: Dict[str, Any]) -> tuple:
+        text = metadata.get("text", "").encode("utf-8")
+        compressed = self.compress and len(text) > 64
+        extra = {k: v for k, v in metadata.items() if k not in _COLUMNS}
+        return (
+            idx,
+            metadata.get("filename", ""),
+            metadata.get("owner_id"),
+            metadata.get("chunk_index"),
+            zlib.compress(text) if compressed else text,
+            int(compressed),
+            json.dumps(extra) if extra else None,
+            metadata.get("job_id"),
+        )
+
+    @staticmethod
+    def _decode_text(text: bytes, compressed: int) -> str:
+        return (zlib.decompress(text) if compressed else text).decode("utf-8")
+
+    @classmethod
+    def _decode_row(cls, row: tuple) -> Dict[str, Any]:
+        _, filename, owner_id, chunk_index, text, compressed, extra, job_id = row
+        metadata = {
+            "filename": filename,
+            "text": cls._decode_text(text, compressed),
+            "chunk_index": chunk_index,
+        }
+        if owner_id is not None:
+            metadata["owner_id"] = owner_id
+        if job_id is not None:
+            metadata["job_id"] = job_id
+        if extra:
+            metadata.update(json.loads(extra))
+        return metadata
+
+    def put_many(self, ids: Iterable[int], metadatas: Iterable[Dict[str, Any]]):
+        """Inserts or replaces metadata rows. Idempotent, so log replay can re-apply them."""
+        metadatas = list(metadatas)
+        rows = [self._encode_row(int(idx), metadata) for idx, metadata in zip(ids, metadatas)]
+        with self._lock:
+            self._ensure_lexical_index()
+            # Rows being replaced must leave the lexical index first
+            self._unindex([row[0] for row in rows])
+            self._db.executemany("INSERT OR REPLACE INTO chunks VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._db.executemany(
+                "INSERT INTO chunks_fts (rowid, text) VALUES (?, ?)",
+                [(row[0], metadata.get("text", "")) for row, metadata in zip(rows, metadatas)]
+            )
+            self._db.commit()
+
+    def _unindex(self, ids: List[int]):
+        """
+        Drops existing rows among `ids` from the lexical index. A contentless FTS5 table can only
+        remove a row given the exact text it indexed, so that is read back from `chunks`.
+        """
+        for start in range(0, len(ids), 500):
+            batch = ids[start:start + 500]
+            rows = self._db.execute(
+                f"SELECT id, text, compressed FROM chunks WHERE id IN ({','.join('?' * len(batch))})", batch
+            ).fetchall()
+            self._db.executemany(
+                "INSERT INTO chunks_fts (chunks_fts, rowid, text) VALUES ('delete', ?, ?)",
+                [(idx, self._decode_text(text, compressed)) for idx, text, compressed in rows]
+            )
+
+    def get_many(self, ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Fetches metadata for just the given ids."""
+        ids = [int(idx) for idx in ids]
+        found = {}
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT * FROM chunks WHERE id IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                for row in rows:
+                    found[row[0]] = self._decode_row(row)
+        return found
+
+    def ids_for(
+        self, filename: Optional[str] = None, owner_id: Optional[str] = None, job_id: Optional[str] = None
+    ) -> np.ndarray:
+        """Returns the sorted ids of chunks matching every given filter, served from the column indexes."""
+        clauses, params = [], []
+        if job_id is not None:
+            clauses.append("job_id = ?")
+            params.append(job_id)
+        if filename is not None:
+            clauses.append("filename = ?")
+            params.append(filename)
+        if owner_id is not None:
+            clauses.append("owner_id = ?")
+            params.append(owner_id)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._db.execute(f"SELECT id FROM chunks{where} ORDER BY id", params).fetchall()
+        return np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+
+    def lexical_search(
+        self, query: str, k: int, filename: Optional[str] = None, owner_id: Optional[str] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Ranks chunks by BM25 against the words of `query`, optionally scoped like ids_for.
+        Returns up to k (id, score) pairs, best first; higher scores are better.
+        """
+        expression = _match_expression(query)
+        if expression is None:
+            return []
+        clauses, params = ["chunks_fts MATCH ?"], [expression]
+        join = ""
+        if filename is not None or owner_id is not None:
+            join = " JOIN chunks ON chunks.id = chunks_fts.rowid"
+            if filename is not None:
+                clauses.append("chunks.filename = ?")
+                params.append(filename)
+            if owner_id is not None:
+                clauses.append("chunks.owner_id = ?")
+                params.append(owner_id)
+        # FTS5's bm25() is negative, lower being a better match
+        sql = (
+            f"SELECT chunks_fts.rowid, -bm25(chunks_fts) AS score FROM chunks_fts{join} "
+            f"WHERE {' AND '.join(clauses)} ORDER BY score DESC LIMIT ?"
+        )
+        with self._lock:
+            self._ensure_lexical_index()
+            return self._db.execute(sql, params + [k]).fetchall()
+
+    def owners(self, filename: str) -> set:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT owner_id FROM chunks WHERE filename = ? AND owner_id IS NOT NULL", (filename,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def delete(self, ids: Iterable[int]):
+        ids = [int(idx) for idx in ids]
+        with self._lock:
+            self._ensure_lexical_index()
+            self._unindex(ids)
+            self._db.executemany("DELETE FROM chunks WHERE id = ?", [(idx,) for idx in ids])
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._ensure_lexical_index()
+            self._db.execute("DELETE FROM chunks")
+            self._db.execute("INSERT INTO chunks_fts (chunks_fts) VALUES ('delete-all')")
+            self._db.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def checkpoint(self):
+        """Flushes the SQLite WAL into the main database file and syncs it to disk."""
+        with self._lock:
+            self._db.execute("PRAGMA wal_checkpoint(FULL)")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -1,92 +1,63 @@
-import json
 import logging
-from app.services.embeddings import client
-from app.schemas.decision import DecisionRequest, DecisionResponse
+from dataclasses import asdict
+from app.core.config import settings
+from app.services.llm_cache import cached_json_completion
+from app.services.llm_scheduler import LLMUnavailableError
+from app.services.prompt_builder import PromptSection, build_user_prompt, compact_json
+from app.services.decision_engine import compute_decision_metrics, template_justification
+from app.schemas.decision import DecisionRequest, DecisionResponse, DecisionJustification
 
 logger = logging.getLogger(__name__)
 
-# Fallback response in case OpenAI fails to return a valid JSON structure
-FALLBACK_DECISION = DecisionResponse(
-    overall_average=0.0,
-    consistency_trend="Unknown",
-    recurring_weaknesses=["Could not evaluate structure"],
-    dominant_strengths=[],
-    hallucination_risk_flag=True,
-    overall_confidence="Low",
-    hire_recommendation="No Hire",
-    justification="System error: Could not complete decision aggregation."
-)
-
-async def make_hiring_decision(request: DecisionRequest) -> DecisionResponse:
+async def make_hiring_decision(request: DecisionRequest, mode: str = "full") -> DecisionResponse:
     """
     Aggregates multiple interview question evaluations into a final structured hiring decision.
+    Every number, flag and the recommendation are computed locally from the round data.
+    In "full" mode the LLM writes the justification text; "fast" mode uses a rule-based one and never calls it.
     """
-    system_prompt = """You are a senior AI interview decision engine.
-Your job is to aggregate multiple interview question evaluations into a final structured hiring decision.
-
-You will receive:
-- Interview role
-- Multiple Q&A rounds
-- Structured evaluation scores for each round
-- Hallucination audit results for each evaluation
+    metrics = compute_decision_metrics(request)
+    decision = DecisionResponse(
+        overall_average=metrics.overall_average,
+        consistency_trend=metrics.consistency_trend,
+        recurring_weaknesses=metrics.recurring_weaknesses,
+        dominant_strengths=metrics.dominant_strengths,
+        hallucination_risk_flag=metrics.hallucination_risk_flag,
+        overall_confidence=metrics.overall_confidence,
+        hire_recommendation=metrics.hire_recommendation,
+        justification=template_justification(metrics)
+    )
+    if mode == "fast":
+        return decision
 
-YOUR TASKS:
-1. Compute overall performance trends based purely on the structured data provided.
-2. Detect recurring weaknesses across the rounds.
-3. Detect dominant strengths.
-4. Penalize evaluations flagged as hallucinated or inconsistent.
-   - If ANY round has `hallucination_detected == true`, you MUST set `hallucination_risk_flag = true` and lower the `overall_confidence`.
-5. Assess consistency across answers (e.g. "Stable", "Variable", "Improving", "Declining").
-6. Produce a final hiring recommendation.
+    system_prompt = """You are a senior AI interview decision engine.
+The hiring decision has already been computed from structured interview data. Your only job
+is to write a brief justification (3-5 sentences) explaining it to a hiring manager.
 
 CRITICAL INSTRUCTIONS:
-- You must NOT generate new critique.
-- You must ONLY aggregate and reason over the provided structured data.
-- Output MUST be STRICT JSON matching the exact schema below.
-
-JSON SCHEMA EXPECTED:
-{
-  "overall_average": <float 0.0-10.0>,
-  "consistency_trend": "<string>",
-  "recurring_weaknesses": ["<weakness 1>", "<weakness 2>"],
-  "dominant_strengths": ["<strength 1>", "<strength 2>"],
-  "hallucination_risk_flag": <true/false>,
-  "overall_confidence": "<Low | Medium | High>",
-  "hire_recommendation": "<Strong Hire | Hire | Leaning Hire | Leaning No Hire | No Hire>",
-  "justification": "<A brief text justification>"
-}"""
-
-    # Format the input data cleanly
-    rounds_data = [round_item.model_dump() for round_item in request.rounds]
-    rounds_json_str = json.dumps(rounds_data, indent=2)
-
-    user_prompt = f"""Role: {request.role}
-
-Rounds Data:
-{rounds_json_str}
-
-Compute the final hiring recommendation based on the instructions."""
+- You must NOT change, recompute or contradict any number, flag or recommendation provided.
+- You must NOT generate new critique; only reason over the provided data.
+- If the hallucination risk flag is true, mention that the decision is less certain.
+- Output MUST be STRICT JSON matching: {"justification": "<text>"}"""
+
+    user_prompt = build_user_prompt(
+        "decision",
+        system_prompt,
+        [
+            PromptSection("Role:", [request.role]),
+            PromptSection("Computed Decision:", [compact_json(asdict(metrics))]),
+        ],
+        "Write the justification for this decision based on the instructions.",
+        settings.prompt_budget_decision
+    )
 
     try:
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.0,  # Deterministic output
-            response_format={"type": "json_object"}
-        )
-        
-        content = response.choices[0].message.content
-        parsed_json = json.loads(content)
-        
-        # Pydantic will automatically validate the schema structure
-        return DecisionResponse(**parsed_json)
+        result = await cached_json_completion("decision", DecisionJustification, system_prompt, user_prompt)
+        return decision.model_copy(update={"justification": result.justification})
 
-    except json.JSONDecodeError as e:
-        logger.error(f"Decision Engine LLM did not return valid JSON: {e}")
-        return FALLBACK_DECISION
+    except LLMUnavailableError:
+        # Rate limited or down even after retries: surface it rather than returning a fallback verdict
+        raise
     except Exception as e:
-        logger.error(f"Error executing decision engine aggregation: {e}")
-        return FALLBACK_DECISION
+        # The computed decision stands on its own; keep the rule-based justification
+        logger.error(f"Error generating decision justification: {e}")
+        return decision
@@ -0,0 +1,174 @@
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+from app.schemas.decision import SCORE_AXES, DecisionRequest
+
+# Rounds whose evaluation was flagged by the auditor count half as much towards the average
+FLAGGED_ROUND_WEIGHT = 0.5
+# Change in round score (out of 10) per round that counts as a trend rather than noise
+TREND_SLOPE = 0.5
+# Spread of round scores (out of 10) above which a flat trend is reported as Variable
+VARIABLE_STD = 1.5
+# Token-set Jaccard similarity at which two weaknesses are treated as the same issue
+WEAKNESS_SIMILARITY = 0.5
+STRENGTH_THRESHOLD = 7.0
+
+# (minimum weighted average out of 10, recommendation), checked in order
+RECOMMENDATION_THRESHOLDS = (
+    (8.5, "Strong Hire"),
+    (7.0, "Hire"),
+    (6.0, "Leaning Hire"),
+    (4.5, "Leaning No Hire"),
+)
+# Position in RECOMMENDATION_THRESHOLDS of the best recommendation allowed when any round hallucinated
+HALLUCINATION_CAP = 2
+CONFIDENCE_LEVELS = ("Low", "Medium", "High")
+
+# Filler and negation words that say a topic was missing rather than which topic it was
+_STOPWORDS = {
+    "a", "an", "the", "of", "in", "on", "for", "to", "and", "or", "with", "about", "any",
+    "no", "not", "did", "does", "lack", "lacks", "lacked", "missing", "insufficient", "limited",
+    "mention", "mentioned", "discuss", "discussed", "explain", "explained",
+}
+
+@dataclass
+class DecisionMetrics:
+    overall_average: float
+    axis_means: Dict[str, float]
+    round_scores: List[float]
+    trend_slope: float
+    consistency_trend: str
+    recurring_weaknesses: List[str]
+    dominant_strengths: List[str]
+    hallucination_risk_flag: bool
+    overall_confidence: str
+    hire_recommendation: str
+    flagged_rounds: List[int] = field(default_factory=list)
+
+def _score_matrix(request: DecisionRequest) -> np.ndarray:
+    """Rounds x axes matrix of scores out of 10; axes a round did not report are NaN."""
+    return np.array(
+        [[float(round_item.scores.get(axis, np.nan)) for axis in SCORE_AXES] for round_item in request.rounds],
+        dtype=np.float64
+    )
+
+def _trend(round_scores: np.ndarray) -> tuple:
+    if round_scores.size < 2:
+        return 0.0, "Stable"
+    slope = float(np.polyfit(np.arange(round_scores.size), round_scores, 1)[0])
+    if slope >= TREND_SLOPE:
+        return slope, "Improving"
+    if slope <= -TREND_SLOPE:
+        return slope, "Declining"
+    if round_scores.std() > VARIABLE_STD:
+        return slope, "Variable"
+    return slope, "Stable"
+
+def _tokens(text: str) -> frozenset:
+    return frozenset(word for word in re.findall(r"[a-z0-9+#]+", text.lower()) if word not in _STOPWORDS)
+
+def recurring_weaknesses(weaknesses_per_round: List[List[str]], limit: int = 5) -> List[str]:
+    """
+    Greedily clusters near-duplicate weaknesses by token overlap and returns one label per
+    cluster that appears in at least two rounds, most widespread first.
+    """
+    clusters = []  # [token set of the first member, rounds seen, Counter of member texts]
+    for round_index, weaknesses in enumerate(weaknesses_per_round):
+        for text in weaknesses:
+            tokens = _tokens(text)
+            if not tokens:
+                continue
+            for cluster in clusters:
+                if len(tokens & cluster[0]) / len(tokens | cluster[0]) >= WEAKNESS_SIMILARITY:
+                    break
+            else:
+                cluster = [tokens, set(), Counter()]
+                clusters.append(cluster)
+            cluster[1].add(round_index)
+            cluster[2][text.strip()] += 1
+
+    recurring = [cluster for cluster in clusters if len(cluster[1]) >= 2]
+    recurring.sort(key=lambda cluster: (-len(cluster[1]), -sum(cluster[2].values())))
+    return [cluster[2].most_common(1)[0][0] for cluster in recurring[:limit]]
+
+def _confidence(request: DecisionRequest, hallucination: bool) -> str:
+    level = min(len(request.rounds), 3) - 1  # one round: Low, two: Medium, three or more: High
+    if hallucination:
+        level -= 1
+    if any(round_item.audit.score_consistency.lower() == "inconsistent" for round_item in request.rounds):
+        level -= 1
+    return CONFIDENCE_LEVELS[max(level, 0)]
+
+def _recommendation(average: float, hallucination: bool) -> str:
+    for position, (threshold, recommendation) in enumerate(RECOMMENDATION_THRESHOLDS):
+        if average >= threshold:
+            # A hallucinated evaluation makes the evidence unreliable, so never go above Leaning Hire
+            if hallucination and position < HALLUCINATION_CAP:
+                return RECOMMENDATION_THRESHOLDS[HALLUCINATION_CAP][1]
+            return recommendation
+    return "No Hire"
+
+def compute_decision_metrics(request: DecisionRequest) -> DecisionMetrics:
+    """Aggregates the structured round data into decision metrics without calling the LLM."""
+    if not request.rounds:
+        raise ValueError("At least one evaluated round is required to make a decision.")
+
+    scores = _score_matrix(request)
+    flagged = np.array([
+        round_item.audit.hallucination_detected or round_item.audit.score_consistency.lower() == "inconsistent"
+        for round_item in request.rounds
+    ])
+    weights = np.where(flagged, FLAGGED_ROUND_WEIGHT, 1.0)
+
+    present = ~np.isnan(scores)
+    filled = np.where(present, scores, 0.0)
+
+    # Per-round score from the axes it reported, falling back to final_score when it reported none
+    axis_counts = present.sum(axis=1)
+    final_scores = np.array([round_item.final_score / 10 for round_item in request.rounds], dtype=np.float64)
+    round_scores = np.divide(filled.sum(axis=1), axis_counts, out=final_scores, where=axis_counts > 0)
+
+    # Weighted mean of each axis over the rounds that reported it
+    axis_totals = present.T.astype(np.float64) @ weights
+    axis_means = np.divide(filled.T @ weights, axis_totals, out=np.full(len(SCORE_AXES), np.nan), where=axis_totals > 0)
+
+    overall_average = round(float(np.average(round_scores, weights=weights)), 2)
+    slope, trend = _trend(round_scores)
+    hallucination = any(round_item.audit.hallucination_detected for round_item in request.rounds)
+
+    return DecisionMetrics(
+        overall_average=overall_average,
+        axis_means={axis: round(float(mean), 2) for axis, mean in zip(SCORE_AXES, axis_means) if not np.isnan(mean)},
+        round_scores=[round(float(score), 2) for score in round_scores],
+        trend_slope=round(slope, 3),
+        consistency_trend=trend,
+        recurring_weaknesses=recurring_weaknesses([round_item.weaknesses for round_item in request.rounds]),
+        dominant_strengths=[
+            f"{axis.replace('_', ' ').capitalize()} (avg {mean:.1f}/10)"
+            for axis, mean in zip(SCORE_AXES, axis_means) if not np.isnan(mean) and mean >= STRENGTH_THRESHOLD
+        ],
+        hallucination_risk_flag=hallucination,
+        overall_confidence=_confidence(request, hallucination),
+        hire_recommendation=_recommendation(overall_average, hallucination),
+        flagged_rounds=[int(i) for i in np.flatnonzero(flagged)],
+    )
+
+def template_justification(metrics: DecisionMetrics) -> str:
+    """Rule-based justification used when no LLM-written text is requested or available."""
+    parts = [
+        f"Weighted average of {metrics.overall_average:.1f}/10 across {len(metrics.round_scores)} round(s) "
+        f"with a {metrics.consistency_trend.lower()} trend ({metrics.trend_slope:+.2f} per round)."
+    ]
+    if metrics.dominant_strengths:
+        parts.append(f"Strongest areas: {', '.join(metrics.dominant_strengths)}.")
+    if metrics.recurring_weaknesses:
+        parts.append(f"Recurring weaknesses: {'; '.join(metrics.recurring_weaknesses)}.")
+    if metrics.flagged_rounds:
+        rounds = ", ".join(str(i + 1) for i in metrics.flagged_rounds)
+        parts.append(f"Round(s) {rounds} were flagged by the auditor and weighted down.")
+    parts.append(f"Recommendation: {metrics.hire_recommendation}.")
+    return " ".join(parts)
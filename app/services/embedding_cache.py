@@ -0,0 +1,87 @@
+import hashlib
+import logging
+from typing import List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.tiered_cache import TieredCache
+
+logger = logging.getLogger(__name__)
+
+def _to_float32_rows(vectors: List[List[float]]) -> List[np.ndarray]:
+    # One row copy per vector, so an evicted row does not keep the rest of its batch alive
+    return [row.copy() for row in np.asarray(vectors, dtype=np.float32)]
+
+class EmbeddingCache(TieredCache):
+    """
+    Content-addressed embedding cache keyed by sha256(model, text).
+    A bounded in-memory LRU sits in front of a SQLite file that evicts its
+    least recently used rows once it grows past its configured size.
+    Both tiers hold float32 vectors (6 KB at 1536 dims, against ~50 KB as a list of
+    Python floats); callers get lists, built only for the vectors they asked for.
+    """
+
+    def __init__(self, path: str, memory_items: int, disk_items: int):
+        super().__init__(path, "embeddings", "vector BLOB", memory_items, disk_items)
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.upstream_calls = 0
+        self.upstream_texts = 0
+        self.upstream_seconds = 0.0
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).digest()
+
+    def _encode(self, vector: np.ndarray) -> bytes:
+        return vector.tobytes()
+
+    def _decode(self, blob: bytes) -> np.ndarray:
+        return np.frombuffer(blob, dtype=np.float32)
+
+    async def get_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """Returns the cached vector for each text, or None where it has never been embedded."""
+        keys = [self.key(model, text) for text in texts]
+        found = self._memory_get_many(keys)
+        self.memory_hits += sum(1 for key in keys if key in found)
+        disk_keys = [key for key in dict.fromkeys(keys) if key not in found]
+        if disk_keys:
+            from_disk = await self._disk_get_many(disk_keys)
+            found.update(from_disk)
+            self.disk_hits += sum(1 for key in keys if key in from_disk)
+        self.misses += sum(1 for key in keys if key not in found)
+        return [found[key].tolist() if key in found else None for key in keys]
+
+    async def put_many(self, model: str, texts: List[str], vectors: List[List[float]]):
+        """Stores freshly embedded vectors in both tiers."""
+        # Converting a batch of Python floats is itself a stall, so it runs on the cache's thread too
+        arrays = await self._run(_to_float32_rows, vectors)
+        await self._put_many([(self.key(model, text), array) for text, array in zip(texts, arrays)])
+
+    def record_upstream(self, num_texts: int, seconds: float):
+        """Tracks provider calls made for cache misses so savings can be estimated."""
+        self.upstream_calls += 1
+        self.upstream_texts += num_texts
+        self.upstream_seconds += seconds
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            **self._tier_stats(),
+            "upstream_calls": self.upstream_calls,
+            "upstream_texts": self.upstream_texts,
+            "avg_upstream_call_ms": 1000 * self.upstream_seconds / self.upstream_calls if self.upstream_calls else 0.0,
+        }
+
+# Singleton instance
+embedding_cache = EmbeddingCache(
+    settings.embedding_cache_path,
+    memory_items=settings.embedding_cache_memory_items,
+    disk_items=settings.embedding_cache_disk_items
+)
@@ -1,31 +1,141 @@
+import asyncio
 import logging
-from typing import List
-from openai import AsyncOpenAI
+import time
+from typing import Dict, List, Optional, Tuple
 from app.core.config import settings
+from app.services.embedding_cache import embedding_cache
+from app.services.llm_scheduler import create_embeddings, llm_scheduler, PRIORITY_INTERACTIVE
+from app.utils.tokens import token_lengths
 
 logger = logging.getLogger(__name__)
 
-# Note: The AsyncOpenAI client will read OPENAI_API_KEY from environment 
-# or it can be explicitly passed.
-client = AsyncOpenAI(api_key=settings.openai_api_key)
-
-async def get_embeddings(texts: List[str]) -> List[List[float]]:
+async def get_embeddings(texts: List[str], priority: int = PRIORITY_INTERACTIVE) -> List[List[float]]:
     """
-    Generate embeddings for a list of texts using OpenAI.
+    Generate embeddings for a list of texts, serving repeats from the embedding cache.
+    Only distinct cache misses are sent to OpenAI, in a single batched call.
     """
     if not texts:
         return []
-        
+
+    if not settings.embedding_cache_enabled:
+        return await _fetch_embeddings(texts, priority)
+
+    embeddings = await embedding_cache.get_many(settings.embedding_model, texts)
+    missing = list(dict.fromkeys(text for text, embedding in zip(texts, embeddings) if embedding is None))
+    if missing:
+        start = time.perf_counter()
+        fetched = await _fetch_embeddings(missing, priority)
+        embedding_cache.record_upstream(len(missing), time.perf_counter() - start)
+        await embedding_cache.put_many(settings.embedding_model, missing, fetched)
+        by_text = dict(zip(missing, fetched))
+        embeddings = [embedding if embedding is not None else by_text[text] for text, embedding in zip(texts, embeddings)]
+    return embeddings
+
+def _split_calls(lengths: List[int], max_texts: int, max_tokens: Optional[float]) -> List[Tuple[int, int]]:
+    """
+    Splits texts (given their token counts) into contiguous [start, end) ranges of at most
+    max_texts texts and max_tokens tokens; a single text over max_tokens gets a call of its own.
+    """
+    ranges = []
+    start, total = 0, 0
+    for i, length in enumerate(lengths):
+        if i > start and (i - start >= max_texts or (max_tokens is not None and total + length > max_tokens)):
+            ranges.append((start, i))
+            start, total = i, 0
+        total += length
+    ranges.append((start, len(lengths)))
+    return ranges
+
+async def _fetch_embeddings(texts: List[str], priority: int = PRIORITY_INTERACTIVE) -> List[List[float]]:
+    """
+    Generate embeddings for a list of texts using OpenAI.
+    Each call is kept within the scheduler's token burst, so a large bulk batch is paced as
+    several calls that interactive requests can be dispatched between, instead of one call
+    that drains the token budget for everyone.
+    """
     try:
-        response = await client.embeddings.create(
-            model=settings.embedding_model,
-            input=texts
-        )
+        lengths = await asyncio.to_thread(token_lengths, texts)
+        ranges = _split_calls(lengths, settings.embedding_batch_size, llm_scheduler.max_call_tokens)
+        responses = await asyncio.gather(*(
+            create_embeddings(
+                priority=priority,
+                tokens=sum(lengths[start:end]),
+                model=settings.embedding_model,
+                input=texts[start:end]
+            )
+            for start, end in ranges
+        ))
         # Ensure embeddings are returned in the same order as input texts
         embeddings = [None] * len(texts)
-        for entry in response.data:
-            embeddings[entry.index] = entry.embedding
+        for (start, _), response in zip(ranges, responses):
+            for entry in response.data:
+                embeddings[start + entry.index] = entry.embedding
         return embeddings
     except Exception as e:
         logger.error(f"Error generating embeddings: {e}")
         raise
+
+class EmbeddingCoalescer:
+    """
+    Micro-batches concurrent single-text embedding requests.
+    Requests arriving within a short window (or until the batch fills) share one
+    get_embeddings call, and identical texts in the same window share one slot.
+    """
+
+    def __init__(self, window_ms: float, max_batch: int):
+        self.window_s = window_ms / 1000
+        self.max_batch = max_batch
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._timer = None
+        self._inflight = set()
+
+    async def embed(self, text: str) -> List[float]:
+        future = self._pending.get(text)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[text] = future
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window_s, self._flush)
+        # Shield so one cancelled caller does not cancel the shared result for the others
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._resolve(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    @staticmethod
+    async def _resolve(batch: Dict[str, asyncio.Future]):
+        texts = list(batch)
+        try:
+            embeddings = await get_embeddings(texts)
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for text, embedding in zip(texts, embeddings):
+            if not batch[text].done():
+                batch[text].set_result(embedding)
+
+# Singleton instance
+query_coalescer = EmbeddingCoalescer(
+    window_ms=settings.embedding_coalesce_window_ms,
+    max_batch=settings.embedding_coalesce_max_batch
+)
+
+async def get_query_embedding(text: str) -> List[float]:
+    """
+    Embeds a single query string, coalescing it with other concurrent queries when enabled.
+    """
+    if settings.embedding_coalesce_window_ms <= 0:
+        return (await get_embeddings([text]))[0]
+    return await query_coalescer.embed(text)
@@ -1,6 +1,10 @@
 import json
 import logging
-from app.services.embeddings import client
+from typing import Any, AsyncIterator, Tuple
+from app.core.config import settings
+from app.services.llm_cache import cached_json_completion, stream_json_completion
+from app.services.llm_scheduler import LLMUnavailableError
+from app.services.prompt_builder import PromptSection, build_user_prompt, split_chunks
 from app.schemas.evaluation import EvaluationRequest, EvaluationResponse, Scores
 
 logger = logging.getLogger(__name__)
@@ -20,11 +24,8 @@ FALLBACK_EVALUATION = EvaluationResponse(
     final_score=0
 )
 
-async def evaluate_candidate_answer(request: EvaluationRequest) -> EvaluationResponse:
-    """
-    Evaluates a candidate's answer using GPT-4o against the provided question and their resume context.
-    Enforces a strict deterministic JSON output scale.
-    """
+def _evaluation_prompts(request: EvaluationRequest) -> Tuple[str, str]:
+    """Builds the (system, user) prompts for evaluating one answer."""
     system_prompt = """You are an expert technical interviewer and senior engineering manager evaluating a candidate's answer.
 You will be provided with:
 1. The Question asked
@@ -55,34 +56,34 @@ RETURN FORMAT (STRICT JSON):
 }
 """
 
-    user_prompt = f"""Question:
-{request.question}
-
-Candidate Resume Context:
-{request.resume_context}
+    user_prompt = build_user_prompt(
+        "evaluation",
+        system_prompt,
+        [
+            PromptSection("Question:", [request.question]),
+            # Resume chunks go first when over budget, least relevant (last retrieved) first
+            PromptSection("Candidate Resume Context:", split_chunks(request.resume_context), drop_priority=2),
+            PromptSection("Candidate Answer:", [request.answer], drop_priority=1),
+        ],
+        "Evaluate the candidate's answer based on the criteria.",
+        settings.prompt_budget_evaluation
+    )
+    return system_prompt, user_prompt
 
-Candidate Answer:
-{request.answer}
-
-Evaluate the candidate's answer based on the criteria."""
+async def evaluate_candidate_answer(request: EvaluationRequest) -> EvaluationResponse:
+    """
+    Evaluates a candidate's answer using GPT-4o against the provided question and their resume context.
+    Enforces a strict deterministic JSON output scale.
+    """
+    system_prompt, user_prompt = _evaluation_prompts(request)
 
     try:
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.0,  # Deterministic output
-            response_format={"type": "json_object"}
-        )
-        
-        content = response.choices[0].message.content
-        parsed_json = json.loads(content)
-        
-        # Pydantic will automatically validate the schema structure, raising ValueError if malformed
-        return EvaluationResponse(**parsed_json)
+        # Served from the response cache when this exact prompt was answered before
+        return await cached_json_completion("evaluation", EvaluationResponse, system_prompt, user_prompt)
 
+    except LLMUnavailableError:
+        # Rate limited or down even after retries: surface it rather than returning a fallback verdict
+        raise
     except json.JSONDecodeError as e:
         logger.error(f"LLM did not return valid JSON: {e}")
         return FALLBACK_EVALUATION
@@ -90,3 +91,27 @@ Evaluate the candidate's answer based on the criteria."""
         logger.error(f"Error evaluating answer: {e}")
         # Return fallback to avoid crashing the endpoint and dropping the interview state
         return FALLBACK_EVALUATION
+
+async def stream_candidate_evaluation(request: EvaluationRequest) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Streaming variant of evaluate_candidate_answer.
+    Yields ("field", {"name", "value"}) for each top-level field as soon as it has streamed in,
+    then ("result", EvaluationResponse) with the validated evaluation (or the fallback).
+    """
+    system_prompt, user_prompt = _evaluation_prompts(request)
+
+    try:
+        async for path, value in stream_json_completion("evaluation", EvaluationResponse, system_prompt, user_prompt, max_depth=1):
+            if path:
+                yield "field", {"name": path[0], "value": value}
+            else:
+                yield "result", value
+
+    except LLMUnavailableError:
+        raise
+    except json.JSONDecodeError as e:
+        logger.error(f"LLM did not return valid JSON: {e}")
+        yield "result", FALLBACK_EVALUATION
+    except Exception as e:
+        logger.error(f"Error evaluating answer: {e}")
+        yield "result", FALLBACK_EVALUATION
@@ -3,104 +3,703 @@ import numpy as np
 import json
 import os
 import logging
-from typing import List, Tuple, Dict, Any
+import threading
+from typing import List, Tuple, Dict, Any, Optional
 from app.core.config import settings
+from app.services.segment_log import SegmentLog, RECORD_DELETE
+from app.services.chunk_store import ChunkStore
+from app.services.index_lock import IndexLock
+from app.services.vector_file import VectorFile
 
 logger = logging.getLogger(__name__)
 
+INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw", "sq8", "fp16")
+# Types that store lossy codes; their searches are re-ranked against full-precision vectors on disk
+COMPRESSED_TYPES = ("ivf_pq", "sq8", "fp16")
+# Maps flat vector storage (flat and HNSW indexes) straight from the snapshot file instead of copying
+# it into process memory; IO_FLAG_MMAP alone only applies to on-disk inverted lists.
+# Older faiss builds lack IO_FLAG_MMAP_IFC, and then snapshots are read into memory.
+MMAP_FLAGS = faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY if hasattr(faiss, "IO_FLAG_MMAP_IFC") else None
+if settings.faiss_mmap and MMAP_FLAGS is None:
+    logger.warning(f"faiss {faiss.__version__} cannot memory-map indexes; snapshots are read into memory.")
+
+def build_index(index_type: str, dimension: int) -> faiss.Index:
+    """
+    Builds an empty inner-product index of the given type wrapped in an IDMap,
+    so every type exposes the same custom-id interface.
+    IVF and SQ8 types must be trained before vectors are added.
+    """
+    if index_type == "flat":
+        description = "IDMap,Flat"
+    elif index_type == "ivf_flat":
+        description = f"IDMap,IVF{settings.faiss_nlist},Flat"
+    elif index_type == "ivf_pq":
+        description = f"IDMap,IVF{settings.faiss_nlist},PQ{settings.faiss_pq_m}"
+    elif index_type == "hnsw":
+        description = f"IDMap,HNSW{settings.faiss_hnsw_m},Flat"
+    elif index_type == "sq8":
+        description = "IDMap,SQ8"
+    elif index_type == "fp16":
+        description = "IDMap,SQfp16"
+    else:
+        raise ValueError(f"Unknown FAISS index type '{index_type}'. Expected one of {INDEX_TYPES}.")
+    index = faiss.index_factory(dimension, description, faiss.METRIC_INNER_PRODUCT)
+    apply_search_params(index)
+    return index
+
+def index_type_of(index: faiss.Index) -> str:
+    """Reports which of INDEX_TYPES an IDMap-wrapped index is."""
+    inner = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap) else index
+    if isinstance(inner, faiss.IndexIVFPQ):
+        return "ivf_pq"
+    if isinstance(inner, faiss.IndexIVF):
+        return "ivf_flat"
+    if isinstance(inner, faiss.IndexHNSW):
+        return "hnsw"
+    if isinstance(inner, faiss.IndexScalarQuantizer):
+        return "fp16" if inner.sq.qtype == faiss.ScalarQuantizer.QT_fp16 else "sq8"
+    return "flat"
+
+def apply_search_params(index: faiss.Index):
+    """Applies the configured nprobe / efSearch tunables to an index."""
+    inner = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap) else index
+    if isinstance(inner, faiss.IndexIVF):
+        inner.nprobe = settings.faiss_nprobe
+    elif isinstance(inner, faiss.IndexHNSW):
+        inner.hnsw.efSearch = settings.faiss_ef_search
+
+def _search_params(index: faiss.Index, selector: faiss.IDSelector, probe_all: bool = False) -> faiss.SearchParameters:
+    """Builds search parameters of the right type for the index, carrying an id selector."""
+    inner = faiss.downcast_index(index.index)
+    if isinstance(inner, faiss.IndexIVF):
+        return faiss.SearchParametersIVF(sel=selector, nprobe=inner.nlist if probe_all else inner.nprobe)
+    if isinstance(inner, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=inner.hnsw.efSearch)
+    return faiss.SearchParameters(sel=selector)
+
+def _without_ids(index: faiss.Index, dead: np.ndarray, dimension: int) -> faiss.Index:
+    """Returns an IDMap-wrapped index holding everything in `index` except the `dead` ids."""
+    inner = faiss.downcast_index(index.index)
+    if isinstance(inner, faiss.IndexFlatCodes):
+        # Flat and scalar-quantized storage compacts in place and keeps the remaining ids in order
+        index.remove_ids(faiss.IDSelectorBatch(dead.size, faiss.swig_ptr(dead)))
+        return index
+
+    id_map = faiss.vector_to_array(index.id_map)
+    keep = ~np.isin(id_map, dead)
+    if isinstance(inner, faiss.IndexHNSW):
+        # HNSW graphs cannot drop nodes, so rebuild from the full-precision storage
+        storage = faiss.downcast_index(inner.storage)
+        rebuilt = build_index("hnsw", dimension)
+        rebuilt.add_with_ids(storage.reconstruct_n(0, storage.ntotal)[keep], id_map[keep])
+        return rebuilt
+
+    # IVF: copy surviving codes list by list into an emptied clone (same trained quantizer),
+    # renumbering internal ids so they stay dense. Codes are copied as-is, so PQ is not re-encoded.
+    new_position = np.cumsum(keep) - 1
+    rebuilt_inner = faiss.clone_index(inner)
+    rebuilt_inner.reset()
+    rebuilt = faiss.IndexIDMap(rebuilt_inner)
+    invlists = inner.invlists
+    code_size = invlists.code_size
+    for list_no in range(inner.nlist):
+        size = invlists.list_size(list_no)
+        if size == 0:
+            continue
+        internal = faiss.rev_swig_ptr(invlists.get_ids(list_no), size).copy()
+        codes = faiss.rev_swig_ptr(invlists.get_codes(list_no), size * code_size).copy().reshape(size, code_size)
+        survivors = keep[internal]
+        if not survivors.any():
+            continue
+        new_ids = np.ascontiguousarray(new_position[internal[survivors]], dtype=np.int64)
+        new_codes = np.ascontiguousarray(codes[survivors])
+        rebuilt_inner.invlists.add_entries(list_no, new_ids.size, faiss.swig_ptr(new_ids), faiss.swig_ptr(new_codes))
+    rebuilt_inner.ntotal = int(keep.sum())
+    faiss.copy_array_to_vector(np.ascontiguousarray(id_map[keep]), rebuilt.id_map)
+    rebuilt.ntotal = rebuilt_inner.ntotal
+    return rebuilt
+
+def _merge_results(parts: List[Tuple[np.ndarray, np.ndarray]], k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Merges per-index (scores, ids) result matrices into the overall top k per query."""
+    if len(parts) == 1:
+        return parts[0]
+    scores = np.hstack([part[0] for part in parts])
+    ids = np.hstack([part[1] for part in parts])
+    order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(ids, order, axis=1)
+
+def _fuse_rankings(rankings: List[List[int]], k: int) -> List[Tuple[int, float]]:
+    """Reciprocal-rank fusion of several best-first id rankings into one, with each id's fused score."""
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, idx in enumerate(ranking, start=1):
+            scores[idx] = scores.get(idx, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
 class FaissStore:
+    """
+    Vector index that every worker process serving the API can share.
+
+    The last snapshot is the base index, memory-mapped read-only so processes share its pages.
+    Vectors logged since that snapshot live in a small in-memory delta index, which each process
+    rebuilds from the segment log. Writes from any process are serialized by an exclusive file
+    lock and bump a shared generation counter; before searching, a process compares generations
+    and hot-reloads what others wrote, replaying new log records or loading a newer snapshot.
+    """
+
     def __init__(self):
         self.index_path = settings.faiss_index_path
         self.metadata_path = self.index_path.replace(".bin", "_meta.json")
         self.dimension = 1536  # Dimension for text-embedding-3-small
-        self.index = None
-        self.metadata = {}  # Map int ID to dict with 'text' and other metadata
+        self.index = None  # Base index, loaded from the snapshot
+        self.delta = None  # Vectors added since the snapshot
+        # Chunk text, filename, owner and chunk_index per vector id live on disk, not in memory
+        self.chunks = ChunkStore(self.index_path.replace(".bin", "_chunks.db"), compress=settings.chunk_store_compress)
         self._next_id = 0
-        self.load_index()
+        # Deleted ids still physically present in the index; excluded from every search until compaction
+        self._tombstones: set = set()
+        self.snapshot_interval = settings.faiss_snapshot_interval
+        self._log = SegmentLog(self.index_path.replace(".bin", "_wal"))
+        self._shared = IndexLock(self.index_path.replace(".bin", ""))
+        # Generations of the shared files this process has caught up with
+        self._generation = 0
+        self._snapshot_generation = 0
+        # The base index as read from the snapshot file, to tell it apart from an in-memory one
+        self._disk_base = None
+        self._snapshot_thread = None
+        self.index_type = settings.faiss_index_type
+        self.migrate_threshold = settings.faiss_migrate_threshold
+        self.compaction_ratio = settings.faiss_compaction_ratio
+        self.rerank_factor = settings.faiss_rerank_factor
+        # Full-precision copies of every vector, kept on disk when the index stores lossy codes
+        self.vectors = None
+        if self.rerank_factor > 0 and self.index_type in COMPRESSED_TYPES:
+            self.vectors = VectorFile(self.index_path.replace(".bin", "_vectors.f32"), self.dimension)
+        # False when the vector file does not cover the loaded index, e.g. re-ranking was enabled later
+        self._rerank_ok = self.vectors is not None
+        # The index is read on first use or by the startup warm-up, not when the module is imported
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def ensure_loaded(self):
+        """Loads the index unless warm-up or an earlier call already has."""
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self.load_index()
 
     def load_index(self):
-        """Loads the FAISS index and metadata from disk if they exist."""
-        if os.path.exists(self.index_path) and os.path.exists(self.metadata_path):
+        """Loads the last FAISS snapshot from disk, then replays the segment log on top of it."""
+        self.chunks.ensure_lexical_index()
+        with self._shared.exclusive():
+            self._generation, self._snapshot_generation = self._shared.generations()
             try:
-                self.index = faiss.read_index(self.index_path)
-                with open(self.metadata_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.metadata = {int(k): v for k, v in data.get("metadata", {}).items()}
-                    self._next_id = data.get("next_id", 0)
-                logger.info("Loaded FAISS index from disk.")
+                self._load_snapshot()
             except Exception as e:
                 logger.error(f"Failed to load FAISS index: {e}")
                 self._initialize_empty_index()
-        else:
+                # Rows of the lost snapshot would point at vectors that no longer exist; replay restores the rest
+                self.chunks.clear()
+            # Startup may follow a crash, so chunk rows are restored from the log as well
+            self._replay_log(persist=True)
+        self._loaded = True
+
+    def _load_snapshot(self):
+        """Switches to the snapshot on disk, or to an empty index if there is none yet."""
+        if not (os.path.exists(self.index_path) and os.path.exists(self.metadata_path)):
             self._initialize_empty_index()
+            return
+        flags = MMAP_FLAGS if settings.faiss_mmap and MMAP_FLAGS is not None else 0
+        index = faiss.read_index(self.index_path, flags)
+        with open(self.metadata_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        apply_search_params(index)
+        rerank_ok = self.vectors is not None
+        if rerank_ok and index.ntotal and self.vectors.rows <= index.id_map.at(index.ntotal - 1):
+            logger.warning("Full-precision vectors do not cover the FAISS index; searching it without re-ranking.")
+            rerank_ok = False
+
+        # Swap the delta out first: a search in between then misses vectors rather than seeing them twice
+        self.delta = build_index("flat", self.dimension)
+        self.index = self._disk_base = index
+        self._rerank_ok = rerank_ok
+        self._next_id = data.get("next_id", 0)
+        self._tombstones = set(data.get("tombstones", []))
+        self._log.position = (0, 0)
+        if "metadata" in data:
+            self._migrate_json_metadata(data["metadata"])
+        logger.info(f"Loaded {index_type_of(self.index)} FAISS index from disk.")
+
+    def _migrate_json_metadata(self, metadata: Dict[str, Any]):
+        """
+        One-time import of the legacy all-in-memory JSON metadata into the chunk store.
+        The manifest is rewritten without it only after the rows are durable.
+        """
+        logger.info(f"Migrating {len(metadata)} chunk metadata entries from JSON to {self.chunks.path}.")
+        self.chunks.put_many((int(k) for k in metadata), metadata.values())
+        self.chunks.checkpoint()
+        self._write_manifest(self._next_id, sorted(self._tombstones))
+
+    def _replay_log(self, persist: bool, since: Tuple[int, int] = (0, 0)):
+        """
+        Re-applies every logged batch that is newer than what this process holds, reading the log
+        from `since`. With persist, chunk rows and deletions are written to the chunk store too, to
+        recover from a crash; processes catching up with another writer skip that, since the writer
+        committed them before publishing.
+        """
+        # The metadata file is replaced last, so its next_id is the snapshot's commit point.
+        # If a snapshot crashed between the two renames the index may already hold newer vectors.
+        index_next = int(self.index.id_map.at(self.index.ntotal - 1)) + 1 if self.index.ntotal else 0
+        replayed = 0
+        for record_type, ids, vectors, metadatas in self._log.replay(since):
+            if record_type == RECORD_DELETE:
+                # Deletes are idempotent, so re-applying one the snapshot already reflects is harmless
+                self._apply_delete(ids, persist)
+                continue
+            mask = ids >= self._next_id
+            if not mask.any():
+                continue
+            vector_mask = ids >= max(self._next_id, index_next)
+            if vector_mask.any():
+                self.delta.add_with_ids(vectors[vector_mask], ids[vector_mask])
+            if persist:
+                if self.vectors is not None:
+                    self.vectors.put(ids[mask], vectors[mask])
+                self.chunks.put_many(
+                    (idx_val for idx_val, keep in zip(ids, mask) if keep),
+                    (metadata for metadata, keep in zip(metadatas, mask) if keep)
+                )
+            self._next_id = int(ids[mask].max()) + 1
+            replayed += int(mask.sum())
+        if replayed and persist:
+            logger.info(f"Replayed {replayed} vectors from the FAISS segment log.")
 
     def _initialize_empty_index(self):
-        """Initializes a new empty FAISS index."""
-        self.index = faiss.IndexFlatIP(self.dimension)  # Inner Product for cosine similarity (assuming normalized vectors)
-        # Create an IDMap to store custom integer IDs
-        self.index = faiss.IndexIDMap(self.index)
-        self.metadata = {}
+        """
+        Initializes a new empty FAISS index.
+        Every store starts flat; approximate index types need training data, so the store
+        migrates to the configured type once it holds faiss_migrate_threshold vectors.
+        """
+        # Inner Product for cosine similarity (assuming normalized vectors), wrapped in an IDMap for custom IDs
+        self.delta = build_index("flat", self.dimension)
+        self.index = build_index("flat", self.dimension)
+        self._disk_base = None
+        self._rerank_ok = self.vectors is not None
+        self._tombstones = set()
         self._next_id = 0
+        self._log.position = (0, 0)
         logger.info("Initialized new empty FAISS index.")
 
+    def _catch_up(self):
+        """Hot-reloads whatever other processes have written since this one last looked."""
+        if self._shared.generations() != (self._generation, self._snapshot_generation):
+            with self._shared.shared():
+                self._refresh_locked()
+
+    def _refresh_locked(self):
+        """Applies changes published by other processes. The caller holds the shared or exclusive lock."""
+        generation, snapshot_generation = self._shared.generations()
+        if (generation, snapshot_generation) == (self._generation, self._snapshot_generation):
+            return
+        try:
+            if snapshot_generation != self._snapshot_generation:
+                self._load_snapshot()
+                self._replay_log(persist=False)
+            else:
+                self._replay_log(persist=False, since=self._log.position)
+        except Exception as e:
+            # Keep serving the current view; the next search or write retries
+            logger.error(f"Failed to reload the shared FAISS index: {e}")
+            return
+        self._generation, self._snapshot_generation = generation, snapshot_generation
+
+    def _publish(self):
+        """Marks a committed change so other processes reload it. The caller holds the exclusive lock."""
+        self._generation += 1
+        self._shared.publish(self._generation, self._snapshot_generation)
+
     def save_index(self):
-        """Saves the FAISS index and metadata to disk."""
+        """Writes a full snapshot of the FAISS index to disk synchronously."""
+        self.ensure_loaded()
+        self.wait_for_snapshot()
+        self._snapshot(blocking=True)
+
+    def wait_for_snapshot(self):
+        """Blocks until any in-flight background snapshot has finished."""
+        thread = self._snapshot_thread
+        if thread is not None:
+            thread.join()
+
+    def _snapshot(self, blocking: bool = False):
+        """
+        Writes the base and delta indexes as one new snapshot and switches every process to it.
+        Tombstoned vectors are dropped when they make up faiss_compaction_ratio of the index, and a
+        flat index big enough is migrated to the configured type. Only one process builds a snapshot
+        at a time; the build runs without the writer lock, so writes continue into a fresh log segment.
+        """
+        if not self._shared.acquire_snapshot(blocking):
+            return
         try:
-            faiss.write_index(self.index, self.index_path)
-            with open(self.metadata_path, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "next_id": self._next_id,
-                    "metadata": self.metadata
-                }, f)
-            logger.info("Saved FAISS index to disk.")
+            with self._shared.exclusive():
+                self._refresh_locked()
+                sealed = self._log.rotate()
+                base = self.index
+                delta = self.delta
+                delta_vectors = faiss.downcast_index(delta.index).reconstruct_n(0, delta.ntotal)
+                delta_ids = faiss.vector_to_array(delta.id_map).copy()
+                next_id = self._next_id
+                tombstones = set(self._tombstones)
+
+            # A memory-mapped base is read-only, so the snapshot is built in a private copy
+            index = faiss.read_index(self.index_path) if base is self._disk_base else faiss.clone_index(base)
+            if delta_ids.size:
+                index.add_with_ids(delta_vectors, delta_ids)
+            dropped = set()
+            if tombstones and len(tombstones) >= self.compaction_ratio * max(index.ntotal, 1):
+                logger.info(f"Compacting FAISS index: dropping {len(tombstones)} of {index.ntotal} vectors.")
+                index = _without_ids(index, np.fromiter(tombstones, dtype=np.int64, count=len(tombstones)), self.dimension)
+                dropped = tombstones
+            if self._migration_due(index):
+                index = self._migrated(index)
+
+            index_tmp = self.index_path + ".tmp"
+            faiss.write_index(index, index_tmp)
+            with self._shared.exclusive():
+                self._refresh_locked()
+                # Readers that still map the old file keep its pages until they reload
+                os.replace(index_tmp, self.index_path)
+                # Chunk rows must be on disk before the log records that could rebuild them are dropped
+                self.chunks.checkpoint()
+                if self.vectors is not None:
+                    self.vectors.sync()
+                self._write_manifest(next_id, sorted(tombstones - dropped))
+                self._log.remove(sealed)
+                self._snapshot_generation += 1
+                self._publish()
+                self._load_snapshot()
+                self._replay_log(persist=False)
+            logger.info("Saved FAISS index snapshot to disk.")
         except Exception as e:
             logger.error(f"Failed to save FAISS index: {e}")
             raise
+        finally:
+            self._shared.release_snapshot()
+
+    def _write_manifest(self, next_id: int, tombstones: List[int]):
+        """Atomically replaces the small JSON manifest that marks a snapshot as committed."""
+        metadata_tmp = self.metadata_path + ".tmp"
+        with open(metadata_tmp, 'w', encoding='utf-8') as f:
+            json.dump({
+                "next_id": next_id,
+                "tombstones": tombstones
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(metadata_tmp, self.metadata_path)
+
+    def _maybe_snapshot(self):
+        """
+        Starts a background snapshot once enough vectors have been logged since the last one,
+        enough of the index is tombstoned, or the index has grown past the migration threshold.
+        """
+        total = self.index.ntotal + self.delta.ntotal
+        due = (
+            self.delta.ntotal >= self.snapshot_interval
+            or (self._tombstones and len(self._tombstones) >= self.compaction_ratio * max(total, 1))
+            or self._migration_due(self.index, total)
+        )
+        if not due or (self._snapshot_thread is not None and self._snapshot_thread.is_alive()):
+            return
+        self._snapshot_thread = threading.Thread(target=self._snapshot, daemon=True)
+        self._snapshot_thread.start()
 
-    def add_vectors(self, embeddings: List[List[float]], metadatas: List[Dict[str, Any]]):
-        """Adds vectors and their corresponding metadata to the index."""
+    def add_vectors(self, embeddings: List[List[float]], metadatas: List[Dict[str, Any]], job_id: Optional[str] = None):
+        """
+        Adds vectors and their corresponding metadata to the index.
+        With a job_id the chunks are tagged with it, and any chunks an earlier attempt at the
+        same job already indexed are deleted in the same critical section, so re-running a
+        job whose completion was never recorded does not index the resume twice.
+        """
         if not embeddings:
             return
 
         assert len(embeddings) == len(metadatas), "Embeddings and metadata must have same length."
+        self.ensure_loaded()
 
         # Normalize vectors for cosine similarity
         vectors = np.array(embeddings, dtype=np.float32)
         faiss.normalize_L2(vectors)
 
-        # Generate IDs
-        ids = np.arange(self._next_id, self._next_id + len(vectors), dtype=np.int64)
-        
-        # Add to FAISS
-        self.index.add_with_ids(vectors, ids)
-
-        # Update metadata Map
-        for i, idx_val in enumerate(ids):
-            self.metadata[int(idx_val)] = metadatas[i]
-
-        self._next_id += len(vectors)
-        self.save_index()
-
-    def search(self, query_embedding: List[float], top_k: int = 5) -> List[Tuple[Dict[str, Any], float]]:
-        """Searches the index for the top_k most similar vectors."""
-        if self.index.ntotal == 0:
-            return []
-
-        # Prepare query vector
-        query_vector = np.array([query_embedding], dtype=np.float32)
-        faiss.normalize_L2(query_vector)
-
-        # Perform search
-        scores, ids = self.index.search(query_vector, top_k)
-        
-        results = []
-        for j, idx in enumerate(ids[0]):
-            if idx != -1:  # -1 means no result found
-                item_metadata = self.metadata.get(int(idx), {})
-                score = float(scores[0][j])
-                results.append((item_metadata, score))
-                
-        return results
+        with self._shared.exclusive():
+            # Ids continue from whatever any process has written so far
+            self._refresh_locked()
+            if job_id is not None:
+                metadatas = [{**metadata, "job_id": job_id} for metadata in metadatas]
+                stale = self.chunks.ids_for(job_id=job_id)
+                if stale.size:
+                    logger.info(f"Replacing {stale.size} chunks indexed by an earlier attempt at ingestion job {job_id}.")
+                    self._log.append_delete(stale)
+                    self._apply_delete(stale, persist=True)
+            ids = np.arange(self._next_id, self._next_id + len(vectors), dtype=np.int64)
+
+            # Persist only the new batch before acknowledging it
+            self._log.append_add(ids, vectors, metadatas)
+            if self.vectors is not None:
+                self.vectors.put(ids, vectors)
+
+            # Add to FAISS
+            self.delta.add_with_ids(vectors, ids)
+
+            # Store metadata on disk
+            self.chunks.put_many(ids, metadatas)
+
+            self._next_id += len(vectors)
+            self._publish()
+        self._maybe_snapshot()
+
+    def delete_document(
+        self, filename: Optional[str] = None, owner_id: Optional[str] = None, job_id: Optional[str] = None
+    ) -> int:
+        """
+        Deletes every chunk of a resume, or only those uploaded by owner_id. The resume is picked by
+        filename or by job_id, the id of the ingest job that indexed it. The ids are tombstoned
+        so searches stop returning them immediately; the vectors are physically dropped by the next
+        compacting snapshot. Returns the number of chunks deleted.
+        """
+        if filename is None and job_id is None:
+            raise ValueError("A filename or job id is required to delete a resume.")
+        self.ensure_loaded()
+        with self._shared.exclusive():
+            self._refresh_locked()
+            ids = self.chunks.ids_for(filename=filename, owner_id=owner_id, job_id=job_id)
+            if ids.size == 0:
+                return 0
+            self._log.append_delete(ids)
+            self._apply_delete(ids, persist=True)
+            self._publish()
+        self._maybe_snapshot()
+        return int(ids.size)
+
+    def document_owners(self, filename: str) -> set:
+        """Returns the uploader ids recorded on a resume's chunks."""
+        self.ensure_loaded()
+        return self.chunks.owners(filename)
+
+    def _apply_delete(self, ids: np.ndarray, persist: bool):
+        if persist:
+            self.chunks.delete(ids)
+        # Replaced rather than updated in place, since searches read it without the lock
+        self._tombstones = self._tombstones | {int(idx) for idx in ids}
+
+    def _migration_due(self, index: faiss.Index, total: int = None) -> bool:
+        if self.index_type == "flat" or index_type_of(index) != "flat":
+            return False
+        return (index.ntotal if total is None else total) >= self.migrate_threshold
+
+    def _migrated(self, index: faiss.Index) -> faiss.Index:
+        """Trains and fills an index of the configured type from a flat one."""
+        flat = faiss.downcast_index(index.index)
+        vectors = flat.reconstruct_n(0, index.ntotal)
+        ids = faiss.vector_to_array(index.id_map)
+
+        logger.info(f"Migrating FAISS index from flat to {self.index_type} with {index.ntotal} vectors.")
+        target = build_index(self.index_type, self.dimension)
+        if not target.is_trained:
+            # Enough points for both the coarse quantizer and PQ codebooks (256 centroids each)
+            sample_size = min(index.ntotal, max(settings.faiss_nlist, 256) * 64)
+            sample = vectors[np.random.default_rng(0).choice(index.ntotal, sample_size, replace=False)]
+            target.train(sample)
+        target.add_with_ids(vectors, ids)
+        if self.vectors is not None:
+            # A store that re-ranks from its first vector already has these; one switched over later does not
+            self.vectors.put(ids, vectors)
+        return target
+
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filename: Optional[str] = None,
+        owner_id: Optional[str] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Searches the index for the top_k most similar vectors.
+        When filename and/or owner_id are given, only vectors from that resume / uploader are considered.
+        """
+        return self.search_batch([query_embedding], [top_k], filename=filename, owner_id=owner_id)[0]
+
+    def search_batch(
+        self,
+        query_embeddings: List[List[float]],
+        top_ks: List[int],
+        filename: Optional[str] = None,
+        owner_id: Optional[str] = None
+    ) -> List[List[Tuple[Dict[str, Any], float]]]:
+        """
+        Searches many queries with one FAISS call over the whole query matrix.
+        Each query gets its own top_k; the index is searched once at the largest and results are trimmed.
+        """
+        scores, ids = self._search_ids(query_embeddings, max(top_ks), filename, owner_id)
+
+        # Only the returned rows are read from the chunk store, in one lookup for the whole batch
+        found = self.chunks.get_many({int(idx) for idx in ids.ravel() if idx != -1})
+        batch_results = []
+        for row, top_k in enumerate(top_ks):
+            results = []
+            for j, idx in enumerate(ids[row][:top_k]):
+                if idx != -1:  # -1 means no result found
+                    item_metadata = found.get(int(idx), {})
+                    score = float(scores[row][j])
+                    results.append((item_metadata, score))
+            batch_results.append(results)
+
+        return batch_results
+
+    def search_lexical(
+        self,
+        query: str,
+        top_k: int = 5,
+        filename: Optional[str] = None,
+        owner_id: Optional[str] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Ranks chunks by BM25 keyword relevance. Needs no query embedding, so it never waits on OpenAI.
+        Scores are BM25 scores and not comparable with cosine similarities.
+        """
+        hits = self.chunks.lexical_search(query, top_k, filename=filename, owner_id=owner_id)
+        found = self.chunks.get_many(idx for idx, _ in hits)
+        return [(found[idx], score) for idx, score in hits if idx in found]
+
+    def search_hybrid(
+        self,
+        query: str,
+        query_embedding: Optional[List[float]],
+        top_k: int = 5,
+        filename: Optional[str] = None,
+        owner_id: Optional[str] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Fuses the BM25 and vector rankings of a query with reciprocal-rank fusion: a chunk scores
+        the sum of 1 / (hybrid_rrf_k + rank) over the rankings it appears in. Without a query
+        embedding (e.g. OpenAI is unavailable) only the lexical ranking is used.
+        """
+        pool = max(top_k, settings.hybrid_candidates)
+        rankings = [[idx for idx, _ in self.chunks.lexical_search(query, pool, filename=filename, owner_id=owner_id)]]
+        if query_embedding is not None:
+            _, ids = self._search_ids([query_embedding], pool, filename, owner_id)
+            rankings.append([int(idx) for idx in ids[0] if idx != -1])
+        fused = _fuse_rankings(rankings, settings.hybrid_rrf_k)[:top_k]
+        found = self.chunks.get_many(idx for idx, _ in fused)
+        return [(found[idx], score) for idx, score in fused if idx in found]
+
+    def _search_ids(
+        self,
+        query_embeddings: List[List[float]],
+        k: int,
+        filename: Optional[str],
+        owner_id: Optional[str]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the (scores, ids) matrices of the top k vectors per query, -1 padding missing results."""
+        self.ensure_loaded()
+        self._catch_up()
+        nothing = (np.empty((len(query_embeddings), 0), dtype=np.float32), np.empty((len(query_embeddings), 0), dtype=np.int64))
+        # A reload in another thread swaps these, so the whole search works on one view
+        base, delta = self.index, self.delta
+        parts = [index for index in (base, delta) if index.ntotal]
+        if not parts:
+            return nothing
+
+        # Prepare query matrix
+        query_vectors = np.array(query_embeddings, dtype=np.float32)
+        faiss.normalize_L2(query_vectors)
+        tombstones = self._tombstones
+
+        # Perform search over the base and delta indexes, then merge
+        if filename is None and owner_id is None:
+            selector = None
+            if tombstones:
+                # Skip deleted ids inside FAISS rather than over-fetching and filtering afterwards
+                dead = np.fromiter(tombstones, dtype=np.int64, count=len(tombstones))
+                dead_selector = faiss.IDSelectorBatch(dead.size, faiss.swig_ptr(dead))
+                selector = faiss.IDSelectorNot(dead_selector)
+            return _merge_results([self._search_index(index, query_vectors, k, selector) for index in parts], k)
+
+        candidates = self.chunks.ids_for(filename=filename, owner_id=owner_id)
+        if candidates.size == 0:
+            return nothing
+        # Delta ids all come after the base's, so the candidates split at the delta's first id
+        split = np.searchsorted(candidates, delta.id_map.at(0)) if delta.ntotal else candidates.size
+        scoped = [
+            self._search_scoped(index, query_vectors, part, k)
+            for index, part in ((base, candidates[:split]), (delta, candidates[split:])) if part.size and index.ntotal
+        ]
+        if not scoped:
+            return nothing
+        return _merge_results(scoped, k)
+
+    def _reranks(self, index: faiss.Index) -> bool:
+        return self._rerank_ok and index_type_of(index) in COMPRESSED_TYPES
+
+    def _search_index(self, index: faiss.Index, query_vectors: np.ndarray, k: int, selector: Optional[faiss.IDSelector]) -> Tuple[np.ndarray, np.ndarray]:
+        """Searches one index; compressed ones are over-fetched by rerank_factor and re-ranked exactly."""
+        params = _search_params(index, selector) if selector is not None else None
+        if not self._reranks(index):
+            return index.search(query_vectors, k, params=params)
+        _, ids = index.search(query_vectors, k * self.rerank_factor, params=params)
+        return self._rerank(query_vectors, ids, k)
+
+    def _rerank(self, query_vectors: np.ndarray, ids: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Scores each query's shortlist against the full-precision vectors on disk and keeps the top k."""
+        valid = ids != -1
+        shortlist = np.unique(ids[valid])
+        scores = np.full(ids.shape, -np.inf, dtype=np.float32)
+        if shortlist.size:
+            # One read and one matrix product for the shortlists of every query in the batch
+            similarities = query_vectors @ self.vectors.get(shortlist).T
+            scores[valid] = similarities[np.nonzero(valid)[0], np.searchsorted(shortlist, ids[valid])]
+        order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+        return np.take_along_axis(scores, order, axis=1), np.take_along_axis(ids, order, axis=1)
+
+    def _search_scoped(self, index: faiss.Index, query_vectors: np.ndarray, candidates: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Searches only the candidate ids of one index.
+        Small scopes are scored exactly against just those vectors, read from flat storage or, for
+        compressed indexes, from the full-precision vector file; larger scopes use an IDSelector so
+        FAISS skips every other id during the scan.
+        """
+        rerank = self._reranks(index)
+        inner = faiss.downcast_index(index.index)
+        storage = inner if isinstance(inner, faiss.IndexFlat) else None
+        if isinstance(inner, faiss.IndexHNSW):
+            storage = faiss.downcast_index(inner.storage)
+
+        if (storage is not None or rerank) and candidates.size <= settings.faiss_exact_scope_max:
+            # IDs are assigned in ascending order, so a vector's position in id_map is its internal id
+            id_map = faiss.vector_to_array(index.id_map)
+            positions = np.minimum(np.searchsorted(id_map, candidates), id_map.size - 1)
+            # Rows another process committed after this one caught up have no vectors here yet
+            present = id_map[positions] == candidates
+            candidates, positions = candidates[present], positions[present]
+            top_k = min(top_k, candidates.size)
+            if top_k == 0:
+                return np.empty((len(query_vectors), 0), dtype=np.float32), np.empty((len(query_vectors), 0), dtype=np.int64)
+            vectors = self.vectors.get(candidates) if rerank else storage.reconstruct_batch(positions)
+            similarities = query_vectors @ vectors.T
+            order = np.argsort(-similarities, axis=1)[:, :top_k]
+            return np.take_along_axis(similarities, order, axis=1), candidates[order]
+
+        top_k = min(top_k, candidates.size)
+        selector = faiss.IDSelectorBatch(candidates.size, faiss.swig_ptr(candidates))
+        # Scoped ids can sit in any inverted list, so probe them all; the selector keeps the scan cheap
+        params = _search_params(index, selector, probe_all=True)
+        if rerank:
+            _, ids = index.search(query_vectors, min(top_k * self.rerank_factor, candidates.size), params=params)
+            return self._rerank(query_vectors, ids, top_k)
+        return index.search(query_vectors, top_k, params=params)
 
 # Singleton instance
 faiss_store = FaissStore()
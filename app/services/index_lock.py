@@ -0,0 +1,76 @@
+import fcntl
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+# Change generation (bumped on every committed write), snapshot generation (bumped on every new snapshot)
+_GENERATIONS = struct.Struct("<QQ")
+
+
+class IndexLock:
+    """
+    Coordinates processes that share one set of index files.
+    Writers hold an exclusive flock on the lock file while they change the files; processes
+    catching up with those changes hold it shared. Threads of one process are serialized
+    first, since flock locks belong to the open file rather than the thread.
+    A small generation file lets readers notice a change with a single read, without locking.
+    """
+
+    def __init__(self, prefix: str):
+        self._thread_lock = threading.Lock()
+        self._snapshot_thread_lock = threading.Lock()
+        self._lock_fd = os.open(prefix + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+        self._generation_fd = os.open(prefix + ".gen", os.O_RDWR | os.O_CREAT, 0o644)
+        self._snapshot_fd = os.open(prefix + ".snapshot.lock", os.O_RDWR | os.O_CREAT, 0o644)
+
+    @contextmanager
+    def _hold(self, operation: int) -> Iterator[None]:
+        with self._thread_lock:
+            fcntl.flock(self._lock_fd, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def exclusive(self):
+        """Context manager for changing the shared files; one writer across all processes."""
+        return self._hold(fcntl.LOCK_EX)
+
+    def shared(self):
+        """Context manager for reading the shared files while no writer is changing them."""
+        return self._hold(fcntl.LOCK_SH)
+
+    def generations(self) -> Tuple[int, int]:
+        """Returns the (change, snapshot) generations last published by any process."""
+        data = os.pread(self._generation_fd, _GENERATIONS.size, 0)
+        if len(data) < _GENERATIONS.size:
+            return 0, 0
+        return _GENERATIONS.unpack(data)
+
+    def publish(self, generation: int, snapshot_generation: int):
+        """Records new generations. Must be called while holding the exclusive lock."""
+        os.pwrite(self._generation_fd, _GENERATIONS.pack(generation, snapshot_generation), 0)
+
+    def acquire_snapshot(self, blocking: bool = False) -> bool:
+        """
+        Claims the right to build the next snapshot. Without blocking, returns False at once
+        if another process (or thread) is already building one.
+        """
+        if not self._snapshot_thread_lock.acquire(blocking):
+            return False
+        try:
+            fcntl.flock(self._snapshot_fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            return True
+        except BlockingIOError:
+            self._snapshot_thread_lock.release()
+            return False
+
+    def release_snapshot(self):
+        fcntl.flock(self._snapshot_fd, fcntl.LOCK_UN)
+        self._snapshot_thread_lock.release()
+
+    def close(self):
+        for fd in (self._lock_fd, self._generation_fd, self._snapshot_fd):
+            os.close(fd)
@@ -0,0 +1,327 @@
+import asyncio
+import io
+import logging
+import os
+import socket
+import uuid
+import zipfile
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Set, Tuple
+from sqlalchemy import or_, update
+from sqlalchemy.future import select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.ingest_job import IngestJob
+from app.schemas.resume import BulkFileResult
+from app.utils.pdf_parser import extract_pages_from_pdf
+from app.utils.chunking import PageChunk, chunk_pages, chunk_documents
+from app.services.embeddings import get_embeddings
+from app.services.llm_scheduler import PRIORITY_BULK
+from app.services.faiss_store import faiss_store
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+# Identifies this process in the claims it holds on ingestion jobs
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+@dataclass
+class _Work:
+    job_id: str
+    filename: str
+    owner_id: Optional[str] = None
+    content: Optional[bytes] = None
+    pages: List[Tuple[int, str]] = field(default_factory=list)
+    chunks: List[PageChunk] = field(default_factory=list)
+    embeddings: List[List[float]] = field(default_factory=list)
+
+class IngestionError(Exception):
+    """Raised by a pipeline stage when a resume cannot be ingested."""
+
+async def _update_job(job_id: str, **fields):
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(IngestJob).where(IngestJob.id == job_id).values(**fields))
+        await db.commit()
+
+def _lease_until() -> datetime:
+    return datetime.utcnow() + timedelta(seconds=settings.ingest_lease_seconds)
+
+def chunk_metadata(filename: str, chunk: PageChunk, chunk_index: int, owner_id: Optional[str] = None) -> dict:
+    """Builds the metadata stored alongside each chunk vector."""
+    metadata = {
+        "filename": filename,
+        "text": chunk.text,
+        "chunk_index": chunk_index,
+        "page_start": chunk.page_start,
+        "page_end": chunk.page_end,
+    }
+    if owner_id is not None:
+        metadata["owner_id"] = owner_id
+    return metadata
+
+async def create_job(filename: str, content: bytes, owner_id: Optional[str] = None) -> IngestJob:
+    async with AsyncSessionLocal() as db:
+        # The process accepting the upload runs it, so the job starts out claimed by it
+        job = IngestJob(
+            filename=filename, content=content, owner_id=owner_id,
+            claimed_by=WORKER_ID, lease_until=_lease_until()
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        return job
+
+async def get_job(job_id: str) -> IngestJob | None:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(IngestJob).where(IngestJob.id == job_id))
+        return result.scalars().first()
+
+class IngestPipeline:
+    """
+    Runs resume ingestion as parse -> chunk -> embed -> index stages.
+    Each stage has its own worker tasks and hands work to the next through a bounded queue,
+    so a slow stage applies backpressure instead of buffering unbounded uploads in memory.
+    CPU-bound stages run in worker threads to keep the event loop responsive.
+
+    Every unfinished job is claimed by one worker process at a time through a lease on its
+    row, which the holder keeps renewing. Jobs nobody holds, because their worker crashed
+    or was restarted, are taken over by whichever live worker claims them first.
+    """
+
+    def __init__(self, workers_per_stage: int = None, queue_size: int = None):
+        self.workers_per_stage = workers_per_stage or settings.ingest_workers
+        self.queue_size = queue_size or settings.ingest_queue_size
+        self._queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+        self._held: Set[str] = set()  # Ids of claimed jobs this pipeline has queued or is running
+
+    async def start(self):
+        stages = [self._parse, self._chunk, self._embed, self._index]
+        self._queues = [asyncio.Queue(maxsize=self.queue_size) for _ in stages]
+        for position, stage in enumerate(stages):
+            for _ in range(self.workers_per_stage):
+                self._tasks.append(asyncio.create_task(self._run_stage(position, stage)))
+        # Claim unfinished jobs before any new upload can be created, then feed them in the background
+        claimed = await self._claim_unfinished()
+        self._tasks.append(asyncio.create_task(self._resubmit(claimed)))
+        self._tasks.append(asyncio.create_task(self._renew_leases()))
+        self._tasks.append(asyncio.create_task(self._take_over_abandoned()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Hand unfinished jobs straight to the other workers instead of making them wait out the lease
+        try:
+            await self._extend_claims(self._held, lease_until=None)
+        except Exception as e:
+            logger.error(f"Error releasing ingestion job claims: {e}")
+        self._held = set()
+
+    async def submit(self, job: IngestJob):
+        """Queues a persisted job for the first stage, waiting if the pipeline is saturated."""
+        self._held.add(job.id)
+        await self._queues[0].put(_Work(job_id=job.id, filename=job.filename, owner_id=job.owner_id, content=job.content))
+
+    async def _claim_unfinished(self) -> List[IngestJob]:
+        """
+        Atomically claims the unfinished jobs that no live worker holds: the UPDATE only matches
+        rows whose lease is missing or lapsed, so two workers never claim the same job.
+        """
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(IngestJob)
+                .where(IngestJob.status.not_in(TERMINAL_STATUSES))
+                .where(or_(IngestJob.lease_until.is_(None), IngestJob.lease_until < datetime.utcnow()))
+                # A claim is not a change to the job itself
+                .values(claimed_by=WORKER_ID, lease_until=_lease_until(), updated_at=IngestJob.updated_at)
+                .returning(IngestJob)
+                .execution_options(synchronize_session=False)
+            )
+            jobs = sorted(result.scalars().all(), key=lambda job: job.created_at)
+            await db.commit()
+            return jobs
+
+    async def _extend_claims(self, job_ids: Iterable[str], lease_until: Optional[datetime]):
+        """Moves the lease of the given jobs, where this process still holds them; None releases them."""
+        job_ids = list(job_ids)
+        async with AsyncSessionLocal() as db:
+            for start in range(0, len(job_ids), 500):
+                await db.execute(
+                    update(IngestJob)
+                    .where(IngestJob.id.in_(job_ids[start:start + 500]))
+                    .where(IngestJob.claimed_by == WORKER_ID)
+                    .where(IngestJob.status.not_in(TERMINAL_STATUSES))
+                    .values(lease_until=lease_until, updated_at=IngestJob.updated_at)
+                )
+            await db.commit()
+
+    async def _renew_leases(self):
+        """Renews the claims this pipeline holds well before they lapse, including jobs still waiting in a queue."""
+        while True:
+            await asyncio.sleep(settings.ingest_lease_seconds / 3)
+            try:
+                await self._extend_claims(self._held, _lease_until())
+            except Exception as e:
+                logger.error(f"Error renewing ingestion job leases: {e}")
+
+    async def _take_over_abandoned(self):
+        """Periodically claims and runs jobs whose worker stopped renewing its lease."""
+        while True:
+            await asyncio.sleep(settings.ingest_lease_seconds / 2)
+            try:
+                claimed = await self._claim_unfinished()
+            except Exception as e:
+                logger.error(f"Error claiming abandoned ingestion jobs: {e}")
+                continue
+            await self._resubmit(claimed)
+
+    async def _resubmit(self, jobs: List[IngestJob]):
+        if jobs:
+            logger.info(f"Resuming {len(jobs)} unfinished ingestion jobs.")
+        # Held from the moment they are claimed, so their leases are renewed while they wait for room
+        self._held.update(job.id for job in jobs)
+        for job in jobs:
+            await self.submit(job)
+
+    async def _run_stage(self, position: int, stage):
+        inbox = self._queues[position]
+        outbox = self._queues[position + 1] if position + 1 < len(self._queues) else None
+        while True:
+            work = await inbox.get()
+            try:
+                await stage(work)
+                if outbox is not None:
+                    await outbox.put(work)
+                else:
+                    self._held.discard(work.job_id)
+            except IngestionError as e:
+                await self._fail(work, e)
+            except Exception as e:
+                logger.error(f"Error processing resume {work.filename}: {e}")
+                await self._fail(work, e)
+            finally:
+                inbox.task_done()
+
+    async def _fail(self, work: _Work, error: Exception):
+        self._held.discard(work.job_id)
+        # Never lets a database error escape, which would end the stage's worker task
+        try:
+            await _update_job(work.job_id, status="failed", error=str(error), content=None)
+        except Exception as e:
+            logger.error(f"Error marking ingestion job {work.job_id} as failed: {e}")
+
+    async def _parse(self, work: _Work):
+        await _update_job(work.job_id, status="parsing")
+        work.pages = await asyncio.to_thread(extract_pages_from_pdf, work.content)
+        work.content = None
+        if not work.pages:
+            raise IngestionError("Could not extract text from PDF.")
+
+    async def _chunk(self, work: _Work):
+        await _update_job(work.job_id, status="chunking")
+        work.chunks = await asyncio.to_thread(list, chunk_pages(work.pages))
+        work.pages = []
+        if not work.chunks:
+            raise IngestionError("No chunks generated from text.")
+
+    async def _embed(self, work: _Work):
+        await _update_job(work.job_id, status="embedding")
+        work.embeddings = await get_embeddings([chunk.text for chunk in work.chunks], priority=PRIORITY_BULK)
+
+    async def _index(self, work: _Work):
+        await _update_job(work.job_id, status="indexing")
+        metadatas = [
+            chunk_metadata(work.filename, chunk, i, work.owner_id)
+            for i, chunk in enumerate(work.chunks)
+        ]
+        # Keyed by job, so a rerun after a crash before the completion update replaces its earlier chunks
+        await asyncio.to_thread(faiss_store.add_vectors, work.embeddings, metadatas, work.job_id)
+        await _update_job(work.job_id, status="completed", num_chunks=len(work.chunks), content=None)
+
+def expand_uploads(files: List[Tuple[str, bytes]]) -> List[Tuple[str, bytes]]:
+    """Flattens uploaded PDFs and the PDF members of any uploaded zip archives."""
+    expanded = []
+    for filename, content in files:
+        if filename.lower().endswith(".zip"):
+            with zipfile.ZipFile(io.BytesIO(content)) as archive:
+                for member in archive.infolist():
+                    if not member.is_dir() and member.filename.lower().endswith(".pdf"):
+                        expanded.append((member.filename, archive.read(member)))
+        else:
+            expanded.append((filename, content))
+    return expanded
+
+def _parse(content: bytes) -> List[Tuple[int, str]]:
+    pages = extract_pages_from_pdf(content)
+    if not pages:
+        raise IngestionError("Could not extract text from PDF.")
+    return pages
+
+async def ingest_bulk(files: List[Tuple[str, bytes]], owner_id: Optional[str] = None) -> List[BulkFileResult]:
+    """
+    Ingests many resumes at once. Every parsed file is chunked in one batch, chunks
+    from every file are packed into shared, size-limited embedding calls, and all
+    surviving vectors go into the store with a single add (and therefore a single
+    persisted log batch).
+    """
+    parsed = await asyncio.gather(
+        *(asyncio.to_thread(_parse, content) for _, content in files),
+        return_exceptions=True
+    )
+    documents = [outcome for outcome in parsed if not isinstance(outcome, Exception)]
+    chunked = iter(await asyncio.to_thread(chunk_documents, documents))
+
+    results = []
+    pending = []  # (result, chunks) for files that made it through parsing and chunking
+    for (filename, _), outcome in zip(files, parsed):
+        if not isinstance(outcome, Exception):
+            outcome = next(chunked) or IngestionError("No chunks generated from text.")
+        if isinstance(outcome, Exception):
+            results.append(BulkFileResult(filename=filename, status="failed", error=str(outcome)))
+        else:
+            result = BulkFileResult(filename=filename, status="indexed", num_chunks=len(outcome))
+            results.append(result)
+            pending.append((result, outcome))
+
+    # Flatten chunks across files, remembering which file each one came from
+    owners = [i for i, (_, chunks) in enumerate(pending) for _ in chunks]
+    all_chunks = [chunk for _, chunks in pending for chunk in chunks]
+    batch_size = settings.embedding_batch_size
+    batches = [all_chunks[start:start + batch_size] for start in range(0, len(all_chunks), batch_size)]
+    embedded = await asyncio.gather(
+        *(get_embeddings([chunk.text for chunk in batch], priority=PRIORITY_BULK) for batch in batches),
+        return_exceptions=True
+    )
+
+    embeddings = []
+    for batch_number, outcome in enumerate(embedded):
+        if isinstance(outcome, Exception):
+            start = batch_number * batch_size
+            for owner in set(owners[start:start + batch_size]):
+                result = pending[owner][0]
+                result.status, result.num_chunks = "failed", None
+                result.error = f"Embedding request failed: {outcome}"
+            outcome = [None] * len(batches[batch_number])
+        embeddings.extend(outcome)
+
+    vectors, metadatas = [], []
+    chunk_offsets = {}
+    for owner, chunk, embedding in zip(owners, all_chunks, embeddings):
+        result = pending[owner][0]
+        if result.status != "indexed":
+            continue
+        chunk_index = chunk_offsets.get(owner, 0)
+        chunk_offsets[owner] = chunk_index + 1
+        vectors.append(embedding)
+        metadatas.append(chunk_metadata(result.filename, chunk, chunk_index, owner_id))
+
+    await asyncio.to_thread(faiss_store.add_vectors, vectors, metadatas)
+    return results
+
+# Singleton instance
+ingest_pipeline = IngestPipeline()
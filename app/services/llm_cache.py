@@ -0,0 +1,161 @@
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.services.llm_scheduler import chat_completion, stream_chat_completion
+from app.services.tiered_cache import TieredCache
+from app.utils.json_stream import JsonStreamParser
+
+logger = logging.getLogger(__name__)
+
+class LLMResponseCache(TieredCache):
+    """
+    Cache of validated chat completion results keyed by sha256(model, system prompt, user prompt, response_format).
+    Only worth it for deterministic (temperature 0) calls. A bounded in-memory LRU sits in front of
+    a SQLite file; entries expire after a TTL and the least recently used rows are evicted past a size limit.
+    """
+
+    def __init__(self, path: str, memory_items: int, disk_items: int, ttl_seconds: float):
+        super().__init__(path, "responses", "payload TEXT", memory_items, disk_items, ttl_seconds=ttl_seconds)
+        # Per-agent counters: agent -> {"hits": n, "misses": n}
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+    @staticmethod
+    def key(model: str, system_prompt: str, user_prompt: str, response_format: Dict[str, Any]) -> bytes:
+        material = json.dumps([model, system_prompt, user_prompt, response_format], sort_keys=True)
+        return hashlib.sha256(material.encode("utf-8")).digest()
+
+    def _encode(self, payload: Dict[str, Any]) -> str:
+        return json.dumps(payload)
+
+    def _decode(self, stored: str) -> Dict[str, Any]:
+        return json.loads(stored)
+
+    async def get(self, agent: str, key: bytes) -> Optional[Dict[str, Any]]:
+        """Returns the cached payload, or None when absent or expired. Counts the lookup against the agent."""
+        payload = self._memory_get_many([key]).get(key)
+        if payload is None:
+            payload = (await self._disk_get_many([key])).get(key)
+        with self._lock:
+            self._counts[agent]["hits" if payload is not None else "misses"] += 1
+        return payload
+
+    async def put(self, key: bytes, payload: Dict[str, Any]):
+        """Stores a schema-validated result in both tiers."""
+        await self._put_many([(key, payload)])
+
+    def stats(self) -> dict:
+        with self._lock:
+            agents = {}
+            for agent, counts in self._counts.items():
+                lookups = counts["hits"] + counts["misses"]
+                agents[agent] = {**counts, "hit_rate": counts["hits"] / lookups if lookups else 0.0}
+            return {"agents": agents, **self._tier_stats()}
+
+async def cached_json_completion(
+    agent: str,
+    response_model: Type[BaseModel],
+    system_prompt: str,
+    user_prompt: str,
+    model: str = "gpt-4o-mini"
+) -> BaseModel:
+    """
+    Runs a deterministic JSON chat completion and validates it into response_model.
+    Results are cached only after they validate, so errors and agent fallbacks are never stored.
+    Parsing and validation errors propagate to the caller.
+    """
+    response_format = {"type": "json_object"}
+    key = None
+    if settings.llm_cache_enabled:
+        key = llm_cache.key(model, system_prompt, user_prompt, response_format)
+        cached = await llm_cache.get(agent, key)
+        if cached is not None:
+            return response_model(**cached)
+
+    response = await chat_completion(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        temperature=0.0,  # Deterministic output
+        response_format=response_format
+    )
+
+    content = response.choices[0].message.content
+    parsed_json = json.loads(content)
+
+    # Pydantic will automatically validate the schema structure, raising ValueError if malformed
+    result = response_model(**parsed_json)
+    if key is not None:
+        await llm_cache.put(key, result.model_dump(mode="json"))
+    return result
+
+def _walk(value: Any, path: tuple, max_depth: int):
+    """Yields (path, value) for a decoded document in the same order JsonStreamParser reports them."""
+    if len(path) < max_depth:
+        if isinstance(value, dict):
+            for key, child in value.items():
+                yield from _walk(child, path + (key,), max_depth)
+        elif isinstance(value, list):
+            for index, child in enumerate(value):
+                yield from _walk(child, path + (index,), max_depth)
+    if path:
+        yield path, value
+
+async def stream_json_completion(
+    agent: str,
+    response_model: Type[BaseModel],
+    system_prompt: str,
+    user_prompt: str,
+    max_depth: int = 2,
+    cache: bool = True,
+    model: str = "gpt-4o-mini"
+) -> AsyncIterator[Tuple[tuple, Any]]:
+    """
+    Streaming counterpart of cached_json_completion.
+    Yields (path, value) for every JSON value up to max_depth as soon as it has streamed in,
+    then ((), result) with the validated response_model. Cache hits replay the same events at once.
+    """
+    response_format = {"type": "json_object"}
+    key = None
+    if cache and settings.llm_cache_enabled:
+        key = llm_cache.key(model, system_prompt, user_prompt, response_format)
+        cached = await llm_cache.get(agent, key)
+        if cached is not None:
+            for event in _walk(cached, (), max_depth):
+                yield event
+            yield (), response_model(**cached)
+            return
+
+    parser = JsonStreamParser(max_depth)
+    deltas = stream_chat_completion(
+        model=model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        temperature=0.0,  # Deterministic output
+        response_format=response_format
+    )
+    async for delta in deltas:
+        for event in parser.feed(delta):
+            yield event
+
+    result = response_model(**json.loads(parser.buffer))
+    if key is not None:
+        await llm_cache.put(key, result.model_dump(mode="json"))
+    yield (), result
+
+# Singleton instance
+llm_cache = LLMResponseCache(
+    settings.llm_cache_path,
+    memory_items=settings.llm_cache_memory_items,
+    disk_items=settings.llm_cache_disk_items,
+    ttl_seconds=settings.llm_cache_ttl_seconds
+)
@@ -0,0 +1,238 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.tokens import count_tokens_batch
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+# The OpenAI SDK takes longer to import than the rest of the app together, so it is only
+# imported when the first client is needed (on the first call or during warm-up).
+_client: Optional["AsyncOpenAI"] = None
+
+# Priority lanes; lower values are dispatched first
+PRIORITY_INTERACTIVE = 0  # Requests a user is waiting on: evaluation, audit, decisions, questions, search
+PRIORITY_BULK = 1  # Background work such as ingestion embeddings
+
+def get_client() -> "AsyncOpenAI":
+    """Returns the shared OpenAI client, creating it on first use."""
+    global _client
+    if _client is None:
+        from openai import AsyncOpenAI
+        # Note: The AsyncOpenAI client will read OPENAI_API_KEY from environment
+        # or it can be explicitly passed. Retries are handled by the scheduler, not the SDK.
+        _client = AsyncOpenAI(api_key=settings.openai_api_key, max_retries=0)
+    return _client
+
+def _retryable_errors() -> Tuple[type, ...]:
+    """(rate limit, connection, server) errors; the first is also what pauses dispatch."""
+    import openai
+    return (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+class LLMUnavailableError(Exception):
+    """Raised when an LLM call still fails with a retryable error after every retry."""
+
+class TokenBucket:
+    """
+    Refills continuously at a per-minute rate and holds at most `burst_seconds` worth of budget.
+    A rate of 0 or less means unlimited.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float):
+        self.rate = per_minute / 60.0
+        self.capacity = self.rate * burst_seconds
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be taken. Requests larger than the whole bucket wait for it to be full."""
+        if self.rate <= 0:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        # Charged at most one full bucket, so an oversized request cannot put every later caller behind its debt
+        if self.rate > 0:
+            self.level -= min(amount, self.capacity)
+
+class LLMScheduler:
+    """
+    Single gate for every OpenAI call.
+    Calls wait in priority order for a concurrency slot and for room in both the
+    requests/min and tokens/min buckets; retryable failures are retried with jittered
+    exponential backoff (or the provider's Retry-After), and a 429 pauses dispatch for everyone.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int,
+        max_retries: int,
+        backoff_base_s: float,
+        backoff_max_s: float,
+        burst_seconds: float
+    ):
+        self._requests = TokenBucket(requests_per_minute, burst_seconds)
+        self._tokens = TokenBucket(tokens_per_minute, burst_seconds)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self._active = 0
+        self._waiting = []  # heap of (priority, sequence, tokens, future)
+        self._sequence = itertools.count()
+        self._timer = None
+        self._paused_until = 0.0
+        self.calls = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.exhausted = 0
+
+    async def run(self, call: Callable[[], Awaitable[Any]], tokens: int = 0, priority: int = PRIORITY_INTERACTIVE) -> Any:
+        """Runs `call` once a slot and rate budget are available, retrying retryable errors."""
+        attempt = 0
+        while True:
+            await self._acquire(priority, tokens)
+            try:
+                self.calls += 1
+                return await call()
+            except Exception as e:
+                retryable = _retryable_errors()
+                if not isinstance(e, retryable):
+                    raise
+                rate_limited = isinstance(e, retryable[0])
+                if rate_limited:
+                    self.rate_limited += 1
+                if attempt >= self.max_retries:
+                    self.exhausted += 1
+                    raise LLMUnavailableError(f"LLM provider unavailable after {attempt + 1} attempts: {e}") from e
+                delay = self._backoff(attempt, e)
+                if rate_limited:
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                attempt += 1
+                self.retries += 1
+                logger.warning(f"Retrying LLM call in {delay:.2f}s after {type(e).__name__} (attempt {attempt}).")
+            finally:
+                self._release()
+            await asyncio.sleep(delay)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        delay = random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * 2 ** attempt))
+        retry_after = self._retry_after(error)
+        return max(delay, retry_after) if retry_after is not None else delay
+
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        response = getattr(error, "response", None)
+        if response is None:
+            return None
+        try:
+            if "retry-after-ms" in response.headers:
+                return float(response.headers["retry-after-ms"]) / 1000
+            if "retry-after" in response.headers:
+                return float(response.headers["retry-after"])
+        except ValueError:
+            pass
+        return None
+
+    async def _acquire(self, priority: int, tokens: int):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._sequence), tokens, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Granted just before the cancellation landed: hand the slot back
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self):
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # Strict priority: the head waits for budget rather than letting lower lanes jump ahead
+        while self._waiting and self._active < self.max_concurrency:
+            _, _, tokens, future = self._waiting[0]
+            if future.done():
+                heapq.heappop(self._waiting)
+                continue
+            now = time.monotonic()
+            wait = max(self._paused_until - now, self._requests.wait_time(1, now), self._tokens.wait_time(tokens, now))
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._waiting)
+            self._requests.take(1)
+            self._tokens.take(tokens)
+            self._active += 1
+            future.set_result(None)
+
+    @property
+    def max_call_tokens(self) -> Optional[float]:
+        """The most tokens one call can be paced on; callers split larger work into several calls. None if unlimited."""
+        return self._tokens.capacity if self._tokens.rate > 0 else None
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "exhausted": self.exhausted,
+            "active": self._active,
+            "waiting": sum(1 for *_, future in self._waiting if not future.done()),
+        }
+
+# Singleton instance
+llm_scheduler = LLMScheduler(
+    requests_per_minute=settings.llm_requests_per_minute,
+    tokens_per_minute=settings.llm_tokens_per_minute,
+    max_concurrency=settings.llm_max_concurrency,
+    max_retries=settings.llm_max_retries,
+    backoff_base_s=settings.llm_backoff_base_s,
+    backoff_max_s=settings.llm_backoff_max_s,
+    burst_seconds=settings.llm_burst_seconds
+)
+
+async def chat_completion(priority: int = PRIORITY_INTERACTIVE, **kwargs) -> Any:
+    """client.chat.completions.create through the scheduler, paced on prompt tokens plus expected output."""
+    tokens = await asyncio.to_thread(count_tokens_batch, [message["content"] for message in kwargs["messages"]])
+    tokens += kwargs.get("max_tokens") or settings.llm_completion_token_estimate
+    return await llm_scheduler.run(lambda: get_client().chat.completions.create(**kwargs), tokens, priority)
+
+async def create_embeddings(priority: int = PRIORITY_INTERACTIVE, tokens: Optional[int] = None, **kwargs) -> Any:
+    """client.embeddings.create through the scheduler, paced on input tokens (counted here unless given)."""
+    if tokens is None:
+        tokens = await asyncio.to_thread(count_tokens_batch, kwargs["input"])
+    return await llm_scheduler.run(lambda: get_client().embeddings.create(**kwargs), tokens, priority)
+
+async def stream_chat_completion(priority: int = PRIORITY_INTERACTIVE, **kwargs) -> AsyncIterator[str]:
+    """
+    Streams the content deltas of a chat completion.
+    Pacing and retries cover opening the stream, which is where rate limits are reported.
+    """
+    tokens = await asyncio.to_thread(count_tokens_batch, [message["content"] for message in kwargs["messages"]])
+    tokens += kwargs.get("max_tokens") or settings.llm_completion_token_estimate
+    stream = await llm_scheduler.run(lambda: get_client().chat.completions.create(stream=True, **kwargs), tokens, priority)
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
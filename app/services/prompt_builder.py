@@ -0,0 +1,109 @@
+import json
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from app.utils.tokens import count_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+TRUNCATION_MARKER = " ...[truncated]"
+
+def compact_json(data: Any) -> str:
+    """Serializes structured prompt data without indentation or padding whitespace."""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+def split_chunks(text: str) -> List[str]:
+    """Splits context built by joining resume chunks with blank lines back into its chunks."""
+    return [chunk.strip() for chunk in text.split("\n\n") if chunk.strip()]
+
+@dataclass
+class PromptSection:
+    """
+    One titled block of a user prompt.
+    Items are ordered most to least important; when the prompt is over budget, sections
+    with the highest drop_priority lose their trailing items first, then have their last
+    remaining item truncated. Sections with drop_priority 0 are never trimmed.
+    """
+    heading: str
+    items: List[str]
+    drop_priority: int = 0
+    joiner: str = "\n\n"
+
+    def render(self, omitted: int) -> str:
+        body = self.joiner.join(self.items)
+        if omitted:
+            body += f"{self.joiner}[{omitted} more omitted to fit the token budget]"
+        return f"{self.heading}\n{body}"
+
+class PromptStats:
+    """Per-agent prompt token counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._agents: Dict[str, Dict[str, int]] = defaultdict(lambda: {"calls": 0, "tokens": 0, "max_tokens": 0, "trimmed_calls": 0})
+
+    def record(self, agent: str, tokens: int, trimmed: bool):
+        with self._lock:
+            counts = self._agents[agent]
+            counts["calls"] += 1
+            counts["tokens"] += tokens
+            counts["max_tokens"] = max(counts["max_tokens"], tokens)
+            counts["trimmed_calls"] += int(trimmed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                agent: {**counts, "avg_tokens": counts["tokens"] / counts["calls"] if counts["calls"] else 0.0}
+                for agent, counts in self._agents.items()
+            }
+
+def build_user_prompt(agent: str, system_prompt: str, sections: List[PromptSection], instruction: str, budget: int) -> str:
+    """
+    Renders the sections and closing instruction into a user prompt whose tokens, together
+    with the system prompt, fit within budget. Records the final token count for the agent.
+    """
+    sections = [PromptSection(s.heading, list(s.items), s.drop_priority, s.joiner) for s in sections]
+    omitted = [0] * len(sections)
+    fixed_tokens = count_tokens(system_prompt)
+
+    def render() -> str:
+        blocks = [section.render(omitted[i]) for i, section in enumerate(sections)]
+        return "\n\n".join(blocks + [instruction])
+
+    prompt = render()
+    tokens = fixed_tokens + count_tokens(prompt)
+    trimmed = False
+    while tokens > budget:
+        candidates = [i for i, section in enumerate(sections) if section.drop_priority > 0 and section.items]
+        if not candidates:
+            logger.warning(f"{agent} prompt needs {tokens} tokens, over its budget of {budget}, with nothing left to trim.")
+            break
+        i = max(candidates, key=lambda index: (sections[index].drop_priority, index))
+        section = sections[i]
+        if len(section.items) > 1:
+            section.items.pop()
+            omitted[i] += 1
+        else:
+            # Last item of the section: keep as much of it as the budget allows
+            item = section.items[0]
+            if item.endswith(TRUNCATION_MARKER):
+                item = item[:-len(TRUNCATION_MARKER)]
+            keep = count_tokens(item) - (tokens - budget) - count_tokens(TRUNCATION_MARKER)
+            if keep <= 0:
+                section.items.pop()
+                omitted[i] += 1
+            else:
+                section.items[0] = truncate_to_tokens(item, keep) + TRUNCATION_MARKER
+        trimmed = True
+        prompt = render()
+        tokens = fixed_tokens + count_tokens(prompt)
+
+    prompt_stats.record(agent, tokens, trimmed)
+    logger.debug(f"{agent} prompt: {tokens} tokens (budget {budget}{', trimmed' if trimmed else ''}).")
+    return prompt
+
+# Singleton instance
+prompt_stats = PromptStats()
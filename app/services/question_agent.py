@@ -1,32 +1,32 @@
 import json
 import logging
-from typing import List, Dict, Any
-from app.services.embeddings import get_embeddings, client
-from app.services.faiss_store import faiss_store
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
+from app.core.config import settings
+from app.services.llm_cache import stream_json_completion
+from app.services.llm_scheduler import chat_completion
+from app.services.prompt_builder import PromptSection, build_user_prompt
+from app.services.retrieval import retrieve_chunks
 from app.schemas.question import QuestionResponse
 
 logger = logging.getLogger(__name__)
 
-async def generate_interview_questions(role: str) -> QuestionResponse:
+async def _question_prompts(role: str, filename: Optional[str], owner_id: Optional[str]) -> Tuple[str, str]:
     """
-    Generates resume-aware interview questions based on the complete context or top chunks.
-    Since we don't have a specific query, we retrieve the top chunks that generally 
+    Retrieves the resume chunks that best match the role and builds the (system, user) prompts.
+    Since we don't have a specific query, we retrieve the top chunks that generally
     match the 'role' to provide context to the LLM.
     """
-    try:
-        # Step 1: Retrieve relevant resume chunks
-        # We embed the role itself to find the most relevant experiences in the resume
-        query_embedding = (await get_embeddings([role]))[0]
-        results = faiss_store.search(query_embedding, top_k=5)
-        
-        context_texts = [metadata.get("text", "") for metadata, score in results if metadata.get("text")]
-        resume_context = "\n\n".join(context_texts)
-        
-        if not resume_context:
-            resume_context = "No relevant resume data found in the index for this role."
+    # Step 1: Retrieve relevant resume chunks
+    # We search with the role itself to find the most relevant experiences in the resume
+    results = await retrieve_chunks(role, top_k=5, filename=filename, owner_id=owner_id)
+
+    # Kept in search order so the least relevant chunks are the first dropped when over budget
+    context_texts = [metadata.get("text", "") for metadata, score in results if metadata.get("text")]
+    if not context_texts:
+        context_texts = ["No relevant resume data found in the index for this role."]
 
-        # Step 2: Build the prompt
-        system_prompt = """You are an expert technical interviewer and senior engineering manager.
+    # Step 2: Build the prompt
+    system_prompt = """You are an expert technical interviewer and senior engineering manager.
 Your task is to generate exactly 5 advanced, highly technical interview questions for a candidate.
 
 CRITICAL REQUIREMENTS:
@@ -45,16 +45,29 @@ CRITICAL REQUIREMENTS:
   ]
 }
 """
-        
-        user_prompt = f"""Role: {role}
-        
-Candidate Resume Context:
-{resume_context}
 
-Generate the 5 interview questions based on the requirements."""
+    user_prompt = build_user_prompt(
+        "questions",
+        system_prompt,
+        [
+            PromptSection("Role:", [role]),
+            PromptSection("Candidate Resume Context:", context_texts, drop_priority=1),
+        ],
+        "Generate the 5 interview questions based on the requirements.",
+        settings.prompt_budget_questions
+    )
+    return system_prompt, user_prompt
+
+async def generate_interview_questions(role: str, filename: Optional[str] = None, owner_id: Optional[str] = None) -> QuestionResponse:
+    """
+    Generates resume-aware interview questions based on the complete context or top chunks.
+    Retrieval can be scoped to one resume (filename) and/or one uploader (owner_id).
+    """
+    try:
+        system_prompt, user_prompt = await _question_prompts(role, filename, owner_id)
 
         # Step 3: Call OpenAI API
-        response = await client.chat.completions.create(
+        response = await chat_completion(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -77,3 +90,26 @@ Generate the 5 interview questions based on the requirements."""
     except Exception as e:
         logger.error(f"Error generating questions: {e}")
         raise
+
+async def stream_interview_questions(
+    role: str, filename: Optional[str] = None, owner_id: Optional[str] = None
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Streaming variant of generate_interview_questions.
+    Yields ("question", {"index", "question"}) as soon as each question has streamed in,
+    then ("result", QuestionResponse) once the whole response is validated.
+    """
+    try:
+        system_prompt, user_prompt = await _question_prompts(role, filename, owner_id)
+
+        # Question generation is not cached, matching the non-streaming endpoint
+        events = stream_json_completion("questions", QuestionResponse, system_prompt, user_prompt, cache=False)
+        async for path, value in events:
+            if path[:1] == ("questions",) and len(path) == 2 and path[1] < 5:
+                yield "question", {"index": path[1], "question": value}
+            elif not path:
+                yield "result", QuestionResponse(questions=value.questions[:5])
+
+    except Exception as e:
+        logger.error(f"Error generating questions: {e}")
+        raise
@@ -0,0 +1,56 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.services.embeddings import get_query_embedding
+from app.services.faiss_store import faiss_store
+from app.services.llm_scheduler import LLMUnavailableError
+from app.services.warmup import ensure_vector_store
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODES = ("vector", "lexical", "hybrid")
+
+def _embedding_errors() -> Tuple[type, ...]:
+    """Failures of the query embedding that hybrid search answers with lexical results alone."""
+    import openai
+    # OpenAIError also covers what the scheduler does not retry (authentication, bad requests, ...)
+    return (asyncio.TimeoutError, LLMUnavailableError, openai.OpenAIError)
+
+async def retrieve_chunks(
+    query: str,
+    top_k: int = 5,
+    filename: Optional[str] = None,
+    owner_id: Optional[str] = None,
+    mode: Optional[str] = None
+) -> List[Tuple[Dict[str, Any], float]]:
+    """
+    Retrieves the chunks that best match a query, in `mode` or else the configured search_mode.
+    - vector:  cosine similarity of the query embedding (one OpenAI call per uncached query)
+    - lexical: BM25 over chunk text, served locally without any OpenAI call
+    - hybrid:  reciprocal-rank fusion of both; if the query embedding fails or takes longer
+               than hybrid_embedding_timeout_s, the lexical ranking is returned alone
+    Index searches run in a worker thread so they do not stall the event loop.
+    """
+    mode = mode or settings.search_mode
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown search mode '{mode}'. Expected one of {', '.join(SEARCH_MODES)}.")
+
+    if mode == "lexical":
+        return await asyncio.to_thread(faiss_store.search_lexical, query, top_k=top_k, filename=filename, owner_id=owner_id)
+
+    if mode == "vector":
+        query_embedding = await get_query_embedding(query)
+        await ensure_vector_store()
+        return await asyncio.to_thread(faiss_store.search, query_embedding, top_k=top_k, filename=filename, owner_id=owner_id)
+
+    try:
+        # Cancelling this wait leaves a coalesced embedding request running for its other callers
+        query_embedding = await asyncio.wait_for(get_query_embedding(query), settings.hybrid_embedding_timeout_s or None)
+        await ensure_vector_store()
+    except _embedding_errors() as e:
+        logger.warning(f"Hybrid search is using lexical results only: {e!r}")
+        query_embedding = None
+    return await asyncio.to_thread(
+        faiss_store.search_hybrid, query, query_embedding, top_k=top_k, filename=filename, owner_id=owner_id
+    )
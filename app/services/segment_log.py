@@ -0,0 +1,162 @@
+import json
+import logging
+import os
+import re
+import struct
+import zlib
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RECORD_ADD = 1
+RECORD_DELETE = 2
+
+# magic, record type, vector count, dimension, metadata byte length, crc32 of payload
+_HEADER = struct.Struct("<4sBIIII")
+_MAGIC = b"FSEG"
+
+
+class SegmentLog:
+    """
+    Append-only write-ahead log of vector batches and deletions, split into numbered segment files.
+    Every append is fsynced before returning so an acknowledged batch survives a crash.
+    Segments are rotated when a snapshot starts and deleted once the snapshot is durable.
+    Several processes may share a log as long as appends and rotations are serialized by the
+    caller: appends always go to the newest segment on disk, and `position` tracks how far this
+    process has read so later replays can continue from there.
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self.directory = os.path.dirname(os.path.abspath(prefix))
+        self._pattern = re.compile(re.escape(os.path.basename(prefix)) + r"\.(\d{6})\.log$")
+        self._file = None
+        existing = self.segments()
+        self._seq = existing[-1][0] if existing else 1
+        # (segment sequence number, byte offset) just past the last record this process has seen
+        self.position: Tuple[int, int] = (0, 0)
+
+    def _segment_path(self, seq: int) -> str:
+        return f"{self.prefix}.{seq:06d}.log"
+
+    def segments(self) -> List[Tuple[int, str]]:
+        """Returns (sequence number, path) for every segment on disk, oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        found = []
+        for name in os.listdir(self.directory):
+            match = self._pattern.match(name)
+            if match:
+                found.append((int(match.group(1)), os.path.join(self.directory, name)))
+        return sorted(found)
+
+    def _open(self):
+        segments = self.segments()
+        latest = segments[-1][0] if segments else self._seq
+        if self._file is not None and latest != self._seq:
+            # Another process rotated the log since our last append
+            self._file.close()
+            self._file = None
+        if self._file is None:
+            self._seq = latest
+            self._file = open(self._segment_path(self._seq), "ab")
+        return self._file
+
+    def append_add(self, ids: np.ndarray, vectors: np.ndarray, metadatas: List[Dict[str, Any]]):
+        """Appends one batch of vectors and metadata and fsyncs it to disk."""
+        meta_bytes = json.dumps(metadatas).encode("utf-8")
+        payload = (
+            np.ascontiguousarray(ids, dtype=np.int64).tobytes()
+            + np.ascontiguousarray(vectors, dtype=np.float32).tobytes()
+            + meta_bytes
+        )
+        header = _HEADER.pack(_MAGIC, RECORD_ADD, len(ids), vectors.shape[1], len(meta_bytes), zlib.crc32(payload))
+        self._write(header + payload)
+
+    def append_delete(self, ids: np.ndarray):
+        """Appends a deletion of the given vector ids and fsyncs it to disk."""
+        payload = np.ascontiguousarray(ids, dtype=np.int64).tobytes()
+        self._write(_HEADER.pack(_MAGIC, RECORD_DELETE, len(ids), 0, 0, zlib.crc32(payload)) + payload)
+
+    def _write(self, record: bytes):
+        f = self._open()
+        f.write(record)
+        f.flush()
+        os.fsync(f.fileno())
+        self.position = (self._seq, f.tell())
+
+    def rotate(self) -> List[str]:
+        """
+        Seals the active segment and starts a new one.
+        Returns the paths of all sealed segments, which a snapshot taken now will cover.
+        The new segment is created right away so other processes sharing the log append to it.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        segments = self.segments()
+        latest = segments[-1][0] if segments else self._seq
+        sealed = [path for seq, path in segments if seq <= latest]
+        self._seq = latest + 1
+        open(self._segment_path(self._seq), "ab").close()
+        return sealed
+
+    def remove(self, paths: List[str]):
+        """Deletes sealed segments that are covered by a durable snapshot."""
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def replay(self, since: Tuple[int, int] = (0, 0)) -> Iterator[Tuple[int, np.ndarray, np.ndarray, List[Dict[str, Any]]]]:
+        """
+        Yields (record type, ids, vectors, metadatas) for every intact record in log order,
+        starting at the `since` position, and advances `position` past each record yielded.
+        Delete records carry an empty vector array and no metadata.
+        A torn or corrupt tail left by a crash mid-append is truncated away.
+        """
+        for seq, path in self.segments():
+            if seq < since[0]:
+                continue
+            start = since[1] if seq == since[0] else 0
+            with open(path, "rb") as f:
+                f.seek(start)
+                data = f.read()
+            offset = 0
+            self.position = (seq, start)
+            while offset < len(data):
+                record = self._decode(data, offset)
+                if record is None:
+                    logger.warning(f"Truncating corrupt tail of {path} at byte {start + offset}.")
+                    with open(path, "r+b") as f:
+                        f.truncate(start + offset)
+                    break
+                record_type, ids, vectors, metadatas, offset = record
+                self.position = (seq, start + offset)
+                yield record_type, ids, vectors, metadatas
+
+    @staticmethod
+    def _decode(data: bytes, offset: int):
+        if offset + _HEADER.size > len(data):
+            return None
+        magic, record_type, count, dim, meta_len, crc = _HEADER.unpack_from(data, offset)
+        if magic != _MAGIC or record_type not in (RECORD_ADD, RECORD_DELETE):
+            return None
+        start = offset + _HEADER.size
+        ids_len = count * 8
+        vec_len = count * dim * 4
+        end = start + ids_len + vec_len + meta_len
+        if end > len(data) or zlib.crc32(data[start:end]) != crc:
+            return None
+        ids = np.frombuffer(data, dtype=np.int64, count=count, offset=start)
+        vectors = np.frombuffer(data, dtype=np.float32, count=count * dim, offset=start + ids_len).reshape(count, dim)
+        metadatas = json.loads(data[start + ids_len + vec_len:end].decode("utf-8")) if meta_len else []
+        return record_type, ids, vectors, metadatas, end
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
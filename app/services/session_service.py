@@ -1,10 +1,16 @@
+from sqlalchemy import Float, cast, insert, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
 from fastapi import HTTPException
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import base64
+import json
 import uuid
 
 from app.models.session import InterviewSession, RoundEvaluation
+from app.schemas.decision import SCORE_AXES, RoundEvaluation as DecisionRoundEvaluation
 from app.schemas.session import SessionCreate, RoundCreate
 
 async def create_session(db: AsyncSession, user_id: str, session_in: SessionCreate) -> InterviewSession:
@@ -17,13 +23,66 @@ async def create_session(db: AsyncSession, user_id: str, session_in: SessionCrea
     await db.refresh(db_session)
     return db_session
 
-async def get_user_sessions(db: AsyncSession, user_id: str) -> list[InterviewSession]:
-    result = await db.execute(
+def _encode_cursor(created_at: datetime, session_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), session_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        created_at, session_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(created_at), str(session_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid session page cursor.")
+
+# Just the columns SessionResponse needs; rounds are never loaded for a listing
+_LIST_COLUMNS = (
+    InterviewSession.id,
+    InterviewSession.user_id,
+    InterviewSession.role,
+    InterviewSession.status,
+    InterviewSession.created_at,
+    InterviewSession.round_count,
+    InterviewSession.score_sum,
+    InterviewSession.mean_score,
+    InterviewSession.last_score,
+    InterviewSession.hallucination_count,
+    *(getattr(InterviewSession, f"{axis}_{part}") for axis in SCORE_AXES for part in ("sum", "rounds")),
+)
+
+async def get_user_sessions(
+    db: AsyncSession,
+    user_id: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    role: Optional[str] = None
+) -> Tuple[list, Optional[str]]:
+    """
+    Returns one page of a user's sessions, newest first, and the cursor of the next page.
+    Pages are keyset-paginated on (created_at, id): the cursor holds the last row returned and
+    the next page seeks past it in the (user_id, created_at, id) index, so every page costs the
+    same however deep into the history it is.
+    """
+    query = (
         select(InterviewSession)
+        .options(load_only(*_LIST_COLUMNS))
         .where(InterviewSession.user_id == user_id)
-        .order_by(InterviewSession.created_at.desc())
+        .order_by(InterviewSession.created_at.desc(), InterviewSession.id.desc())
+        .limit(limit + 1)
     )
-    return result.scalars().all()
+    if status is not None:
+        query = query.where(InterviewSession.status == status)
+    if role is not None:
+        query = query.where(InterviewSession.role == role)
+    if cursor is not None:
+        query = query.where(tuple_(InterviewSession.created_at, InterviewSession.id) < _decode_cursor(cursor))
+
+    rows = (await db.execute(query)).scalars().all()
+    # The extra row only tells whether there is a next page
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, _encode_cursor(rows[-1].created_at, rows[-1].id)
 
 async def get_session_detail(db: AsyncSession, user_id: str, session_id: str) -> InterviewSession:
     result = await db.execute(
@@ -36,32 +95,86 @@ async def get_session_detail(db: AsyncSession, user_id: str, session_id: str) ->
         raise HTTPException(status_code=404, detail="Session not found or not owned by user.")
     return session
 
-async def add_evaluation_round(db: AsyncSession, user_id: str, session_id: str, round_in: RoundCreate) -> RoundEvaluation:
-    # Verify session ownership first
-    session = await get_session_detail(db, user_id, session_id)
-    
-    if session.status != "active":
-        raise HTTPException(status_code=400, detail="Cannot add round to a completed session.")
-        
-    next_round_num = len(session.rounds) + 1
-    
-    eval_data = round_in.round_evaluation
-    
-    db_round = RoundEvaluation(
-        session_id=session_id,
-        round_number=next_round_num,
-        final_score=eval_data.final_score,
-        hallucination_detected=eval_data.audit.hallucination_detected,
-        reasoning_alignment_score=eval_data.audit.reasoning_alignment_score,
-        score_consistency=eval_data.audit.score_consistency,
-        raw_evaluation_json=eval_data.model_dump()
+def _aggregate_updates(evaluations: List[DecisionRoundEvaluation]) -> Dict[str, Any]:
+    """SET clauses that fold new rounds into a session's counter and score aggregates."""
+    count = len(evaluations)
+    score_total = sum(eval_data.final_score for eval_data in evaluations)
+    values = {
+        "round_count": InterviewSession.round_count + count,
+        "score_sum": InterviewSession.score_sum + score_total,
+        # Right-hand sides see the row before the update, so the mean is taken over the new totals
+        "mean_score": cast(InterviewSession.score_sum + score_total, Float) / (InterviewSession.round_count + count),
+        "last_score": evaluations[-1].final_score,
+        "hallucination_count": InterviewSession.hallucination_count + sum(
+            eval_data.audit.hallucination_detected for eval_data in evaluations
+        ),
+    }
+    for axis in SCORE_AXES:
+        reported = [float(eval_data.scores[axis]) for eval_data in evaluations if eval_data.scores.get(axis) is not None]
+        if reported:
+            values[f"{axis}_sum"] = getattr(InterviewSession, f"{axis}_sum") + sum(reported)
+            values[f"{axis}_rounds"] = getattr(InterviewSession, f"{axis}_rounds") + len(reported)
+    return values
+
+async def _record_rounds(db: AsyncSession, user_id: str, session_id: str, evaluations: List[DecisionRoundEvaluation]) -> int:
+    """
+    Reserves the next round numbers of a session and folds the rounds into its score aggregates,
+    with one atomic UPDATE of the session row, so existing rounds are never loaded.
+    Returns the first reserved number. The row stays locked until the caller commits the
+    rounds themselves, which keeps the aggregates in step and serializes concurrent adds.
+    """
+    result = await db.execute(
+        update(InterviewSession)
+        .where(
+            InterviewSession.id == session_id,
+            InterviewSession.user_id == user_id,
+            InterviewSession.status == "active"
+        )
+        .values(_aggregate_updates(evaluations))
+        .returning(InterviewSession.round_count)
+        .execution_options(synchronize_session=False)
     )
-    
+    last = result.scalar_one_or_none()
+    if last is None:
+        # Nothing updated: tell a missing session apart from a completed one
+        found = await db.execute(
+            select(InterviewSession.id).where(InterviewSession.id == session_id, InterviewSession.user_id == user_id)
+        )
+        if found.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Session not found or not owned by user.")
+        raise HTTPException(status_code=400, detail="Cannot add round to a completed session.")
+    return last - len(evaluations) + 1
+
+def _round_values(session_id: str, round_number: int, eval_data: DecisionRoundEvaluation) -> Dict[str, Any]:
+    # id and created_at are set here rather than by column defaults so bulk inserts can return them
+    return {
+        "id": str(uuid.uuid4()),
+        "session_id": session_id,
+        "round_number": round_number,
+        "final_score": eval_data.final_score,
+        "hallucination_detected": eval_data.audit.hallucination_detected,
+        "reasoning_alignment_score": eval_data.audit.reasoning_alignment_score,
+        "score_consistency": eval_data.audit.score_consistency,
+        "raw_evaluation_json": eval_data.model_dump(),
+        "created_at": datetime.utcnow(),
+    }
+
+async def add_evaluation_round(db: AsyncSession, user_id: str, session_id: str, round_in: RoundCreate) -> RoundEvaluation:
+    # Verifies ownership and status while numbering the round and updating the session's aggregates
+    round_number = await _record_rounds(db, user_id, session_id, [round_in.round_evaluation])
+    db_round = RoundEvaluation(**_round_values(session_id, round_number, round_in.round_evaluation))
     db.add(db_round)
     await db.commit()
-    await db.refresh(db_round)
     return db_round
 
+async def add_evaluation_rounds(db: AsyncSession, user_id: str, session_id: str, rounds_in: List[RoundCreate]) -> List[Dict[str, Any]]:
+    """Adds many rounds in one transaction: one session row update and one executemany INSERT."""
+    first = await _record_rounds(db, user_id, session_id, [round_in.round_evaluation for round_in in rounds_in])
+    rows = [_round_values(session_id, first + i, round_in.round_evaluation) for i, round_in in enumerate(rounds_in)]
+    await db.execute(insert(RoundEvaluation), rows)
+    await db.commit()
+    return rows
+
 async def complete_session(db: AsyncSession, user_id: str, session_id: str) -> InterviewSession:
     session = await get_session_detail(db, user_id, session_id)
     session.status = "completed"
@@ -0,0 +1,150 @@
+import asyncio
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+class TieredCache:
+    """
+    A bounded in-memory LRU in front of a SQLite table of key -> value rows, which evicts its
+    least recently used rows once it grows past disk_items. With ttl_seconds, entries also
+    expire that long after they were stored.
+    The memory tier is served inline. The SQLite tier (lookups, last-used updates, commits and
+    eviction) runs on a single worker thread that owns the connection, so callers on the event
+    loop await it instead of stalling every other request, and disk operations never interleave.
+    Subclasses name the table and value column and convert values to and from their stored form.
+    """
+
+    def __init__(
+        self, path: str, table: str, value_column: str, memory_items: int, disk_items: int,
+        ttl_seconds: Optional[float] = None
+    ):
+        self.table = table
+        self.value_column = value_column.split()[0]
+        self.memory_items = memory_items
+        self.disk_items = disk_items
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at, value); entries that never expire have expires_at=inf
+        self._memory: "OrderedDict[bytes, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{table}-cache")
+
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        expires_column = "expires_at REAL NOT NULL, " if ttl_seconds is not None else ""
+        self._db.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            f"key BLOB PRIMARY KEY, {value_column} NOT NULL, {expires_column}last_used REAL NOT NULL)"
+        )
+        self._db.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_last_used ON {table} (last_used)")
+        self._db.commit()
+        self._disk_count = self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def _encode(self, value: Any) -> Any:
+        """Converts a value to what its SQLite column stores; runs on the worker thread."""
+        return value
+
+    def _decode(self, stored: Any) -> Any:
+        """Converts a stored column value back; runs on the worker thread."""
+        return stored
+
+    def _expires_at(self, now: float) -> float:
+        return now + self.ttl_seconds if self.ttl_seconds is not None else math.inf
+
+    def _memory_get_many(self, keys: Iterable[bytes]) -> Dict[bytes, Any]:
+        found = {}
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                entry = self._memory.get(key)
+                if entry is not None and entry[0] > now:
+                    self._memory.move_to_end(key)
+                    found[key] = entry[1]
+        return found
+
+    async def _disk_get_many(self, keys: List[bytes]) -> Dict[bytes, Any]:
+        """Reads keys the memory tier missed from SQLite, and remembers what it finds."""
+        found = await self._run(self._read, keys)
+        with self._lock:
+            for key, (expires_at, value) in found.items():
+                self._remember(key, expires_at, value)
+        return {key: value for key, (_, value) in found.items()}
+
+    async def _put_many(self, items: List[Tuple[bytes, Any]]):
+        """Stores values in both tiers; the memory tier is updated before the disk write is awaited."""
+        now = time.time()
+        expires_at = self._expires_at(now)
+        with self._lock:
+            for key, value in items:
+                self._remember(key, expires_at, value)
+        await self._run(self._write, items, now)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _remember(self, key: bytes, expires_at: float, value: Any):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _read(self, keys: List[bytes]) -> Dict[bytes, Tuple[float, Any]]:
+        """Returns key -> (expires_at, value) for the live rows among keys, dropping expired ones."""
+        expires = "expires_at" if self.ttl_seconds is not None else "NULL"
+        rows = []
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            rows += self._db.execute(
+                f"SELECT key, {self.value_column}, {expires} FROM {self.table} "
+                f"WHERE key IN ({','.join('?' * len(batch))})", batch
+            ).fetchall()
+        now = time.time()
+        entries = [(key, stored, math.inf if expires_at is None else expires_at) for key, stored, expires_at in rows]
+        expired = [(key,) for key, _, expires_at in entries if expires_at <= now]
+        live = [entry for entry in entries if entry[2] > now]
+        if live:
+            self._db.executemany(f"UPDATE {self.table} SET last_used = ? WHERE key = ?", [(now, key) for key, _, _ in live])
+        if expired:
+            self._db.executemany(f"DELETE FROM {self.table} WHERE key = ?", expired)
+            self._disk_count -= len(expired)
+        if rows:
+            self._db.commit()
+        return {key: (expires_at, self._decode(stored)) for key, stored, expires_at in live}
+
+    def _write(self, items: List[Tuple[bytes, Any]], now: float):
+        rows = [(key, self._encode(value)) for key, value in items]
+        before = self._db.total_changes
+        if self.ttl_seconds is not None:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, {self.value_column}, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                [(key, stored, now + self.ttl_seconds, now) for key, stored in rows]
+            )
+        else:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, {self.value_column}, last_used) VALUES (?, ?, ?)",
+                [(key, stored, now) for key, stored in rows]
+            )
+        # Replacing an existing key also counts as a change; the overcount is corrected when _evict recounts
+        self._disk_count += self._db.total_changes - before
+        if self._disk_count > self.disk_items:
+            self._evict(now)
+        self._db.commit()
+
+    def _evict(self, now: float):
+        if self.ttl_seconds is not None:
+            self._db.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+            self._disk_count = self._db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        # Trim 10% below the limit so eviction does not run on every insert
+        excess = self._disk_count - int(self.disk_items * 0.9)
+        if excess > 0:
+            self._db.execute(
+                f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} ORDER BY last_used LIMIT ?)", (excess,)
+            )
+            self._disk_count = self._db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def _tier_stats(self) -> dict:
+        return {"memory_items": len(self._memory), "disk_items": self._disk_count}
@@ -0,0 +1,112 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.user import User
+
+@dataclass(frozen=True)
+class CachedUser:
+    """The identity of a signed-in user, as remembered for their token."""
+    id: str
+    email: str
+    created_at: Optional[datetime]
+
+    def to_user(self) -> User:
+        # A fresh transient instance per request, so no request can alter another's user
+        return User(id=self.id, email=self.email, created_at=self.created_at)
+
+class UserCache:
+    """
+    Bounded in-process LRU of verified bearer tokens -> user identity, keyed by sha256(token).
+    A request whose token is cached needs neither the JWT signature check nor the users lookup.
+    An entry expires after ttl_seconds and never outlives the token's own exp claim.
+    Updates and deletes of a User through the ORM drop that user's entries in this process;
+    the TTL bounds how long other worker processes can keep serving them.
+    """
+
+    def __init__(self, max_items: int, ttl_seconds: float):
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[float, CachedUser]]" = OrderedDict()
+        self._keys_by_user: Dict[str, Set[bytes]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[CachedUser]:
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+
+    def put(self, token: str, user: User, token_expires_at: Optional[float] = None) -> CachedUser:
+        identity = CachedUser(id=user.id, email=user.email, created_at=user.created_at)
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        key = self.key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, identity)
+            self._entries.move_to_end(key)
+            self._keys_by_user.setdefault(identity.id, set()).add(key)
+            while len(self._entries) > self.max_items:
+                self._drop(next(iter(self._entries)))
+        return identity
+
+    def invalidate_user(self, user_id: str):
+        """Forgets every cached token of a user."""
+        with self._lock:
+            keys = self._keys_by_user.pop(user_id, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            self.invalidations += len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _drop(self, key: bytes):
+        _, identity = self._entries.pop(key)
+        keys = self._keys_by_user.get(identity.id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[identity.id]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "items": len(self._entries),
+            "invalidations": self.invalidations,
+        }
+
+# Singleton instance
+user_cache = UserCache(max_items=settings.auth_cache_items, ttl_seconds=settings.auth_cache_ttl_seconds)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User):
+    user_cache.invalidate_user(target.id)
@@ -0,0 +1,57 @@
+import os
+import threading
+
+import numpy as np
+
+
+class VectorFile:
+    """
+    Full-precision float32 vectors in a flat file, where row i holds the vector with id i.
+    Compressed indexes keep only quantized codes in memory and read back just the rows of a
+    search's shortlist from here to score it exactly. The file is memory-mapped read-only,
+    so the rows a process touches live in the shared page cache rather than its own memory.
+    """
+
+    def __init__(self, path: str, dimension: int):
+        self.path = path
+        self.dimension = dimension
+        self.row_bytes = dimension * 4
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._map = None
+        self._lock = threading.Lock()
+
+    @property
+    def rows(self) -> int:
+        return os.fstat(self._fd).st_size // self.row_bytes
+
+    def put(self, ids: np.ndarray, vectors: np.ndarray):
+        """Writes vectors at their ids' rows. Idempotent, so log replay can re-apply them."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        # Ids are handed out in ascending runs, so a batch is written with one pwrite per run
+        breaks = np.flatnonzero(np.diff(ids) != 1) + 1
+        for run_ids, run in zip(np.split(ids, breaks), np.split(vectors, breaks)):
+            os.pwrite(self._fd, run.tobytes(), int(run_ids[0]) * self.row_bytes)
+
+    def get(self, ids: np.ndarray) -> np.ndarray:
+        """Reads the vectors of the given ids."""
+        if ids.size == 0:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        needed = int(ids.max()) + 1
+        with self._lock:
+            if self._map is None or self._map.shape[0] < needed:
+                # Remap once the file has grown past the current mapping
+                rows = self.rows
+                if rows < needed:
+                    raise KeyError(f"Vector {needed - 1} is not in {self.path} ({rows} rows).")
+                self._map = np.memmap(self.path, dtype=np.float32, mode="r", shape=(rows, self.dimension))
+            mapped = self._map
+        return mapped[ids]
+
+    def sync(self):
+        """Flushes written rows to disk."""
+        os.fsync(self._fd)
+
+    def close(self):
+        with self._lock:
+            self._map = None
+        os.close(self._fd)
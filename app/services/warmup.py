@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.services.faiss_store import faiss_store
+from app.services.llm_scheduler import get_client
+from app.utils.tokens import get_encoding
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+DEGRADED = "degraded"  # Loaded a fallback; requests are served, with reduced quality
+FAILED = "failed"
+
+class Readiness:
+    """
+    Per-subsystem startup state behind the /ready probe.
+    The app accepts connections as soon as the database is ready; everything else loads in a
+    background warm-up, and anything a request needs before warm-up gets to it loads on first use.
+    """
+
+    def __init__(self, *names: str):
+        self._states: Dict[str, Dict[str, Any]] = {name: {"status": PENDING} for name in names}
+
+    def mark(self, name: str, status: str, seconds: Optional[float] = None, detail: Optional[str] = None):
+        state = {"status": status}
+        if seconds is not None:
+            state["seconds"] = round(seconds, 3)
+        if detail is not None:
+            state["detail"] = detail
+        self._states[name] = state
+
+    async def load(self, name: str, loader: Callable[[], Optional[str]]):
+        """
+        Runs a blocking loader in a worker thread and records the outcome.
+        A loader returns an explanation instead of raising when it fell back to something usable.
+        """
+        self.mark(name, LOADING)
+        start = time.perf_counter()
+        try:
+            fallback = await asyncio.to_thread(loader)
+        except Exception as e:
+            logger.error(f"Warm-up of {name} failed: {e}")
+            self.mark(name, FAILED, time.perf_counter() - start, str(e))
+            return
+        self.mark(name, DEGRADED if fallback else READY, time.perf_counter() - start, fallback)
+
+    def status(self, name: str) -> str:
+        return self._states[name]["status"]
+
+    @property
+    def ready(self) -> bool:
+        return all(state["status"] in (READY, DEGRADED) for state in self._states.values())
+
+    def report(self) -> Dict[str, Any]:
+        return {"ready": self.ready, "subsystems": {name: dict(state) for name, state in self._states.items()}}
+
+def _load_vector_store() -> None:
+    faiss_store.ensure_loaded()
+
+def _load_tokenizer() -> Optional[str]:
+    if get_encoding() is None:
+        return "tokenizer unavailable; token counts are estimated from text length"
+    return None
+
+def _load_llm_client() -> None:
+    get_client()
+
+async def ensure_vector_store():
+    """Loads the vector store off the event loop when a request needs it before warm-up has."""
+    if not faiss_store.loaded:
+        await asyncio.to_thread(faiss_store.ensure_loaded)
+
+async def warm_up():
+    """Loads the vector store, tokenizer and OpenAI SDK in the background after startup."""
+    start = time.perf_counter()
+    await readiness.load("vector_store", _load_vector_store)
+    await readiness.load("tokenizer", _load_tokenizer)
+    await readiness.load("llm_client", _load_llm_client)
+    logger.info(f"Warm-up finished in {time.perf_counter() - start:.2f}s.")
+    await _retry_tokenizer()
+
+async def _retry_tokenizer():
+    """Keeps retrying a tokenizer that fell back to estimates, so its readiness recovers once it loads."""
+    while readiness.status("tokenizer") == DEGRADED:
+        await asyncio.sleep(settings.tokenizer_retry_seconds)
+        # Marked only on success, so the probe does not flap to loading on every attempt
+        if await asyncio.to_thread(_load_tokenizer) is None:
+            readiness.mark("tokenizer", READY)
+
+# Singleton instance
+readiness = Readiness("database", "vector_store", "tokenizer", "llm_client")
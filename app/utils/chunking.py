@@ -1,30 +1,154 @@
-import tiktoken
-from typing import List
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
 from app.core.config import settings
+from app.utils.tokens import token_lengths, token_windows
+
+# One sentence (up to terminal punctuation) or line, together with the whitespace that follows it
+_SEGMENT = re.compile(r"\S(?:[^.!?\n]+|[.!?]+(?=[^.!?\s]))*[.!?]*\s*")
+# A segment followed by a blank line closes a section
+_SECTION_BREAK = re.compile(r"\n[^\S\n]*\n\s*$")
+
+class PageChunk(NamedTuple):
+    text: str
+    page_start: int
+    page_end: int
+
+def _page_segments(pages: Iterable[Tuple[int, str]]) -> Iterator[Tuple[List[str], List[Tuple[int, int]]]]:
+    """
+    Segments each (page number, text) page, holding back a sentence cut off at the end of a
+    page until the next one. Yields the segments with the (first, last) page of each.
+    """
+    carry, carry_page = "", None
+    for page_num, page in pages:
+        segments = _SEGMENT.findall(carry + page)
+        spans = [(page_num, page_num)] * len(segments)
+        if segments and carry:
+            spans[0] = (carry_page, page_num)
+        carry = ""
+        if segments and not segments[-1][-1].isspace():
+            # Pages are separated by a space, as when the document text is joined
+            if segments[-1][-1] in ".!?":
+                segments[-1] += " "
+            else:
+                carry, carry_page = segments.pop() + " ", spans.pop()[0]
+        if segments:
+            yield segments, spans
+    if carry.strip():
+        yield [carry], [(carry_page, carry_page)]
+
+class _Packer:
+    """
+    Packs segments into chunks of at most `size` tokens. When a chunk fills up it ends at its
+    last section break past the halfway mark, or else after its last whole segment, and the
+    next chunk starts with the trailing segments of that chunk that fit in `overlap` tokens.
+    """
+
+    def __init__(self, size: int, overlap: int):
+        if not 0 <= overlap < size:
+            raise ValueError("chunk_overlap must be at least 0 and smaller than chunk_size.")
+        self.size = size
+        self.overlap = overlap
+        self._reset()
+
+    def _reset(self):
+        self.segments: List[str] = []
+        self.lengths: List[int] = []
+        self.spans: List[Tuple[int, int]] = []
+        self.tokens = 0
+        self.carried = 0  # Leading segments already emitted as the previous chunk's overlap
+
+    def add(self, segments: List[str], lengths: List[int], spans: List[Tuple[int, int]]) -> Iterator[PageChunk]:
+        for segment, length, span in zip(segments, lengths, spans):
+            if length > self.size:
+                # A single sentence longer than a chunk: fall back to fixed token windows
+                yield from self.finish()
+                for window in token_windows(segment, self.size, self.size - self.overlap):
+                    if window.strip():
+                        yield PageChunk(window.strip(), *span)
+                continue
+            while self.tokens + length > self.size:
+                if len(self.segments) > self.carried:
+                    yield self._emit(self._cut())
+                else:
+                    self.tokens -= self.lengths.pop(0)
+                    self.segments.pop(0)
+                    self.spans.pop(0)
+                    self.carried -= 1
+            self.segments.append(segment)
+            self.lengths.append(length)
+            self.spans.append(span)
+            self.tokens += length
+
+    def finish(self) -> Iterator[PageChunk]:
+        if len(self.segments) > self.carried:
+            chunk = "".join(self.segments).strip()
+            if chunk:
+                yield PageChunk(chunk, self.spans[0][0], self.spans[-1][1])
+        self._reset()
+
+    def _cut(self) -> int:
+        cut = len(self.segments)
+        total = 0
+        for i, (segment, length) in enumerate(zip(self.segments, self.lengths), 1):
+            total += length
+            if i > self.carried and total * 2 >= self.size and _SECTION_BREAK.search(segment):
+                cut = i
+        return cut
+
+    def _emit(self, cut: int) -> PageChunk:
+        chunk = PageChunk("".join(self.segments[:cut]).strip(), self.spans[0][0], self.spans[cut - 1][1])
+        start, total = cut, 0
+        while start > 1 and total + self.lengths[start - 1] <= self.overlap:
+            start -= 1
+            total += self.lengths[start]
+        self.segments = self.segments[start:]
+        self.lengths = self.lengths[start:]
+        self.spans = self.spans[start:]
+        self.tokens = sum(self.lengths)
+        self.carried = cut - start
+        return chunk
+
+def _packer(chunk_size: Optional[int], chunk_overlap: Optional[int]) -> _Packer:
+    return _Packer(
+        settings.chunk_size if chunk_size is None else chunk_size,
+        settings.chunk_overlap if chunk_overlap is None else chunk_overlap
+    )
+
+def chunk_pages(pages: Iterable[Tuple[int, str]], chunk_size: int = None, chunk_overlap: int = None) -> Iterator[PageChunk]:
+    """
+    Chunks a document given as a stream of (page number, text) pages, without joining the
+    pages first. Chunks hold whole sentences and lines, end at section breaks where
+    possible, overlap by whole sentences, and record the pages they span.
+    """
+    packer = _packer(chunk_size, chunk_overlap)
+    for segments, spans in _page_segments(pages):
+        yield from packer.add(segments, token_lengths(segments), spans)
+    yield from packer.finish()
 
 def chunk_text(text: str, chunk_size: int = None, chunk_overlap: int = None) -> List[str]:
     """
-    Split text into chunks based on token count using tiktoken.
-    """
-    if chunk_size is None:
-        chunk_size = settings.chunk_size
-    if chunk_overlap is None:
-        chunk_overlap = settings.chunk_overlap
-        
-    encoding = tiktoken.get_encoding("cl100k_base") # encoding for text-embedding-3-small
-    tokens = encoding.encode(text)
-    
-    chunks = []
-    if len(tokens) == 0:
-        return chunks
-        
-    start = 0
-    while start < len(tokens):
-        end = start + chunk_size
-        chunk_tokens = tokens[start:end]
-        chunks.append(encoding.decode(chunk_tokens))
-        
-        # Move start forward but account for overlap
-        start += chunk_size - chunk_overlap
-        
-    return chunks
+    Split text into chunks of at most chunk_size tokens along sentence and section boundaries.
+    """
+    return [chunk.text for chunk in chunk_pages([(1, text)], chunk_size, chunk_overlap)]
+
+def chunk_documents(documents: List[List[Tuple[int, str]]], chunk_size: int = None, chunk_overlap: int = None) -> List[List[PageChunk]]:
+    """Chunks many paged documents, tokenizing the sentences of all of them in a single pass."""
+    segmented = []
+    for pages in documents:
+        segments, spans = [], []
+        for page_segments, page_spans in _page_segments(pages):
+            segments.extend(page_segments)
+            spans.extend(page_spans)
+        segmented.append((segments, spans))
+    lengths = token_lengths([segment for segments, _ in segmented for segment in segments])
+
+    results = []
+    offset = 0
+    for segments, spans in segmented:
+        packer = _packer(chunk_size, chunk_overlap)
+        chunks = list(packer.add(segments, lengths[offset:offset + len(segments)], spans))
+        chunks.extend(packer.finish())
+        offset += len(segments)
+        results.append(chunks)
+    return results
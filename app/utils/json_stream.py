@@ -0,0 +1,81 @@
+import json
+from typing import Any, List, Tuple
+
+class JsonStreamParser:
+    """
+    Incrementally scans a JSON document that arrives in pieces (e.g. streamed LLM output)
+    and reports every value nested at most `max_depth` levels deep as soon as it is complete.
+    Paths are tuples of object keys and array indexes, e.g. ("questions", 2).
+    Nested values are reported before the container that holds them.
+    """
+
+    def __init__(self, max_depth: int = 2):
+        self.max_depth = max_depth
+        self.buffer = ""
+        self._pos = 0
+        # One frame per open container: [opening char, start offset, current key or index, expecting a key]
+        self._stack: List[list] = []
+        self._in_string = False
+        self._escape = False
+        self._scalar_start = None
+
+    def feed(self, text: str) -> List[Tuple[tuple, Any]]:
+        """Consumes the next piece of text and returns the (path, value) pairs it completed."""
+        self.buffer += text
+        completed = []
+        buffer = self.buffer
+        for i in range(self._pos, len(buffer)):
+            c = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._end_scalar(i + 1, completed)
+                continue
+
+            if self._scalar_start is not None:
+                # Numbers and literals only end at the next delimiter
+                if c not in " \t\r\n,]}":
+                    continue
+                self._end_scalar(i, completed)
+
+            if c in " \t\r\n:":
+                continue
+            if c == '"':
+                self._in_string = True
+                self._scalar_start = i
+            elif c in "{[":
+                self._stack.append([c, i, None if c == "{" else 0, c == "{"])
+            elif c in "}]":
+                frame = self._stack.pop()
+                self._complete(self._path(), buffer[frame[1]:i + 1], completed)
+            elif c == ",":
+                frame = self._stack[-1]
+                if frame[0] == "[":
+                    frame[2] += 1
+                else:
+                    frame[3] = True
+            else:
+                self._scalar_start = i
+        self._pos = len(buffer)
+        return completed
+
+    def _end_scalar(self, end: int, completed: list):
+        raw = self.buffer[self._scalar_start:end]
+        self._scalar_start = None
+        frame = self._stack[-1] if self._stack else None
+        if frame is not None and frame[0] == "{" and frame[3]:
+            frame[2] = json.loads(raw)
+            frame[3] = False
+            return
+        self._complete(self._path(), raw, completed)
+
+    def _path(self) -> tuple:
+        return tuple(frame[2] for frame in self._stack)
+
+    def _complete(self, path: tuple, raw: str, completed: list):
+        if 1 <= len(path) <= self.max_depth:
+            completed.append((path, json.loads(raw)))
@@ -1,15 +1,118 @@
 import io
-import PyPDF2
+import os
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import PyPDF2
+
+class PDFLimitError(ValueError):
+    """Raised when a PDF exceeds the page or extraction time limit."""
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+def _workers() -> int:
+    # More processes than CPUs only adds another parse of the document per process
+    return max(min(settings.pdf_workers, os.cpu_count() or 1), 1)
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=_workers())
+    return _pool
+
+def shutdown_pool():
+    """Stops the page extraction worker processes, if any were started."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """
+    Kills the workers of a pool that is stuck on a document past its deadline; the next
+    extraction starts a fresh pool. shutdown() alone would let a hostile page keep its
+    worker busy, and every later upload queue behind it.
+    """
+    global _pool
+    if _pool is pool:
+        _pool = None
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+def _reader(file_bytes: bytes) -> "PyPDF2.PdfReader":
+    # PyPDF2 is imported on the first upload rather than at startup
+    import PyPDF2
+    return PyPDF2.PdfReader(io.BytesIO(file_bytes))
+
+def _extract_page_range(file_bytes: bytes, start: int, stop: int) -> List[str]:
+    """Runs in a worker process: parses the PDF and extracts pages [start, stop)."""
+    pdf_reader = _reader(file_bytes)
+    return [pdf_reader.pages[page_num].extract_text() or "" for page_num in range(start, stop)]
+
+def iter_pdf_pages(file_bytes: bytes, max_pages: int = None, timeout_s: float = None) -> Iterator[Tuple[int, str]]:
+    """
+    Yields (page number, text) for each page of a PDF, numbering pages from 1.
+    Pages are extracted in worker processes, so a page that takes too long can be stopped:
+    documents with at least pdf_parallel_min_pages pages are split into page ranges extracted
+    in parallel, smaller ones go to a single worker. Pages are still yielded in order.
+    Raises PDFLimitError if the document has more than max_pages pages or extraction
+    takes longer than timeout_s seconds; the workers still extracting it are then killed.
+    """
+    max_pages = settings.pdf_max_pages if max_pages is None else max_pages
+    timeout_s = settings.pdf_timeout_s if timeout_s is None else timeout_s
+    deadline = time.monotonic() + timeout_s
+
+    pdf_reader = _reader(file_bytes)
+    num_pages = len(pdf_reader.pages)
+    if num_pages > max_pages:
+        raise PDFLimitError(f"PDF has {num_pages} pages; the limit is {max_pages}.")
+
+    if num_pages < settings.pdf_parallel_min_pages:
+        step = max(num_pages, 1)
+    else:
+        # Every task parses the whole document again, so give each worker one large page range
+        step = max(settings.pdf_min_pages_per_task, -(-num_pages // _workers()))
+    ranges = [(start, min(start + step, num_pages)) for start in range(0, num_pages, step)]
+
+    page_num = 0
+    restarted = False
+    while ranges:
+        pool = _get_pool()
+        futures = [pool.submit(_extract_page_range, file_bytes, start, stop) for start, stop in ranges]
+        try:
+            for future in futures:
+                try:
+                    texts = future.result(timeout=max(deadline - time.monotonic(), 0))
+                except FutureTimeoutError:
+                    _discard_pool(pool)
+                    raise PDFLimitError(f"PDF text extraction exceeded {timeout_s:g}s at page {page_num + 1} of {num_pages}.")
+                ranges.pop(0)
+                for text in texts:
+                    page_num += 1
+                    yield page_num, text
+        except (BrokenProcessPool, CancelledError):
+            # Another document's timeout (or a crash) took the shared workers down; finish on a fresh pool, once
+            if restarted:
+                raise
+            restarted = True
+            _discard_pool(pool)
+        finally:
+            for future in futures:
+                future.cancel()
+
+def extract_pages_from_pdf(file_bytes: bytes) -> List[Tuple[int, str]]:
+    """Extracts the (page number, text) of every page that has text."""
+    return [(page_num, text) for page_num, text in iter_pdf_pages(file_bytes) if text.strip()]
 
 def extract_text_from_pdf(file_bytes: bytes) -> str:
     """
     Extract text content from a PDF file provided as bytes.
     """
-    pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_bytes))
-    text = ""
-    for page_num in range(len(pdf_reader.pages)):
-        page = pdf_reader.pages[page_num]
-        extracted = page.extract_text()
-        if extracted:
-            text += extracted + " "
-    return text.strip()
+    return " ".join(text for _, text in iter_pdf_pages(file_bytes) if text).strip()
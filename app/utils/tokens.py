@@ -0,0 +1,83 @@
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, List, Optional
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import tiktoken
+
+logger = logging.getLogger(__name__)
+
+ENCODING_NAME = "cl100k_base"  # encoding for text-embedding-3-small
+
+_encoding = None
+_failed_at: Optional[float] = None  # time.monotonic() of the last failed load
+_load_lock = threading.Lock()
+
+def get_encoding() -> Optional["tiktoken.Encoding"]:
+    """
+    Loads the tokenizer once per process, on first use or during warm-up.
+    Returns None when it cannot be loaded (e.g. the BPE file is not cached and there is no network).
+    A failed load is retried on use once tokenizer_retry_seconds have passed; while one caller
+    retries, the others keep estimating rather than waiting on the download.
+    """
+    global _encoding, _failed_at
+    if _encoding is not None:
+        return _encoding
+    retrying = _failed_at is not None
+    if retrying and time.monotonic() - _failed_at < settings.tokenizer_retry_seconds:
+        return None
+    if not _load_lock.acquire(blocking=not retrying):
+        return None
+    try:
+        if _encoding is None:
+            import tiktoken
+            _encoding = tiktoken.get_encoding(ENCODING_NAME)
+            if retrying:
+                logger.info("Loaded tiktoken encoding; token counts are exact again.")
+            _failed_at = None
+    except Exception as e:
+        logger.error(f"Could not load tiktoken encoding, estimating tokens from length: {e}")
+        _failed_at = time.monotonic()
+    finally:
+        _load_lock.release()
+    return _encoding
+
+def count_tokens(text: str) -> int:
+    encoding = get_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+def count_tokens_batch(texts: List[str]) -> int:
+    encoding = get_encoding()
+    if encoding is None:
+        return sum(len(text) // 4 + 1 for text in texts)
+    return sum(len(tokens) for tokens in encoding.encode_batch(texts, disallowed_special=()))
+
+def token_lengths(texts: List[str]) -> List[int]:
+    """Token count of each text."""
+    encoding = get_encoding()
+    if encoding is None:
+        return [len(text) // 4 + 1 for text in texts]
+    # encode_ordinary_batch hands every text to a thread pool, which costs more than encoding short texts
+    encode = encoding.encode_ordinary
+    return [len(encode(text)) for text in texts]
+
+def token_windows(text: str, size: int, stride: int) -> List[str]:
+    """Splits text into windows of `size` tokens whose starts are `stride` tokens apart."""
+    encoding = get_encoding()
+    if encoding is None:
+        return [text[start:start + size * 4] for start in range(0, len(text), stride * 4)]
+    tokens = encoding.encode_ordinary(text)
+    return [encoding.decode(tokens[start:start + size]) for start in range(0, len(tokens), stride)]
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cuts text down to at most max_tokens tokens."""
+    encoding = get_encoding()
+    if encoding is None:
+        return text[:max_tokens * 4]
+    tokens = encoding.encode(text, disallowed_special=())
+    return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
@@ -0,0 +1,111 @@
+"""Shared helpers for benchmarks: synthetic PDFs and stubbed OpenAI embeddings and chat backends."""
+import asyncio
+import random
+from types import SimpleNamespace
+
+import numpy as np
+
+WORDS = (
+    "python fastapi kafka postgres redis kubernetes terraform latency throughput "
+    "designed built scaled migrated reduced improved led mentored pipeline service "
+    "distributed caching sharding replication observability embeddings retrieval"
+).split()
+
+
+def synthetic_text(n_words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def make_pdf(pages) -> bytes:
+    """Builds a minimal valid PDF with one line of Helvetica text per page."""
+    body = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+    num = 4
+    for text in pages:
+        page_id, content_id = num, num + 1
+        num += 2
+        kids.append(page_id)
+        stream = b"BT /F1 10 Tf 72 720 Td (" + text.encode("latin-1").replace(b"(", b"").replace(b")", b"") + b") Tj ET"
+        body[page_id] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        body[content_id] = b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+    body[2] = b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % k for k in kids) + b"] /Count %d >>" % len(pages)
+
+    out = b"%PDF-1.4\n"
+    offsets = {}
+    for i in sorted(body):
+        offsets[i] = len(out)
+        out += b"%d 0 obj\n" % i + body[i] + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % num
+    for i in range(1, num):
+        out += b"%010d 00000 n \n" % offsets[i]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (num, xref)
+    return out
+
+
+class StubEmbeddings:
+    """
+    Drop-in replacement for client.embeddings that sleeps for a simulated
+    network round trip and returns random vectors. Counts upstream calls.
+    """
+
+    def __init__(self, latency_s: float = 0.05, dim: int = 1536, max_concurrency: int = None):
+        self.latency_s = latency_s
+        self.dim = dim
+        self.calls = 0
+        self.texts = 0
+        self._rng = np.random.default_rng(0)
+        # Models a provider connection pool / concurrency limit when set
+        self._slots = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def create(self, model, input, **kwargs):
+        self.calls += 1
+        self.texts += len(input)
+        if self._slots is not None:
+            async with self._slots:
+                await asyncio.sleep(self.latency_s)
+        else:
+            await asyncio.sleep(self.latency_s)
+        vectors = self._rng.standard_normal((len(input), self.dim), dtype=np.float32)
+        return SimpleNamespace(
+            data=[SimpleNamespace(index=i, embedding=v.tolist()) for i, v in enumerate(vectors)],
+            usage=SimpleNamespace(prompt_tokens=0, total_tokens=0),
+        )
+
+
+class StubChat:
+    """
+    Drop-in replacement for client.chat that returns a fixed completion.
+    The first token arrives after `latency_s` and each further ~4-character token
+    after `token_delay_s`; with stream=True the tokens are yielded as they are produced.
+    """
+
+    def __init__(self, content: str, latency_s: float = 0.3, token_delay_s: float = 0.02):
+        self.content = content
+        self.latency_s = latency_s
+        self.token_delay_s = token_delay_s
+        self.calls = 0
+        self.completions = SimpleNamespace(create=self.create)
+
+    def _tokens(self):
+        return [self.content[i:i + 4] for i in range(0, len(self.content), 4)]
+
+    async def create(self, stream=False, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency_s)
+        if stream:
+            return self._stream()
+        await asyncio.sleep(self.token_delay_s * len(self._tokens()))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))])
+
+    async def _stream(self):
+        for token in self._tokens():
+            await asyncio.sleep(self.token_delay_s)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
@@ -0,0 +1,83 @@
+"""
+Recall@k vs. query latency for the FAISS index types FaissStore can migrate to.
+
+Uses synthetic clustered 1536-d unit vectors (resume chunks cluster by topic)
+and exact flat search as ground truth.
+
+    python -m benchmarks.bench_ann_indexes --n 200000 --nlist 1024
+"""
+import argparse
+import os
+import time
+
+import faiss
+import numpy as np
+
+
+def clustered_vectors(n, dim, clusters, rng):
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    vectors = centers[rng.integers(0, clusters, n)] + 0.6 * rng.standard_normal((n, dim), dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--nlist", type=int, default=1024)
+    parser.add_argument("--pq-m", type=int, default=64)
+    parser.add_argument("--hnsw-m", type=int, default=32)
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    from app.core.config import settings
+    from app.services.faiss_store import build_index
+
+    settings.faiss_nlist = args.nlist
+    settings.faiss_pq_m = args.pq_m
+    settings.faiss_hnsw_m = args.hnsw_m
+
+    rng = np.random.default_rng(0)
+    data = clustered_vectors(args.n, args.dim, max(16, args.n // 500), rng)
+    ids = np.arange(args.n, dtype=np.int64)
+    queries = data[rng.choice(args.n, args.queries, replace=False)] + 0.05 * rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+    faiss.normalize_L2(queries)
+
+    configs = [("flat", "-", [None])]
+    configs += [("ivf_flat", "nprobe", [1, 8, 32, 128])]
+    configs += [("ivf_pq", "nprobe", [8, 32, 128])]
+    configs += [("hnsw", "efSearch", [16, 64, 256])]
+
+    truth = None
+    print(f"{'index':<10} {'param':>14} {'build s':>8} {'recall@' + str(args.k):>9} {'ms/query':>9}")
+    for index_type, param_name, values in configs:
+        start = time.perf_counter()
+        index = build_index(index_type, args.dim)
+        if not index.is_trained:
+            index.train(data[rng.choice(args.n, min(args.n, max(args.nlist, 256) * 64), replace=False)])
+        index.add_with_ids(data, ids)
+        build_s = time.perf_counter() - start
+        inner = faiss.downcast_index(index.index)
+
+        for value in values:
+            if param_name == "nprobe":
+                inner.nprobe = value
+            elif param_name == "efSearch":
+                inner.hnsw.efSearch = value
+
+            start = time.perf_counter()
+            found = np.vstack([index.search(queries[i:i + 1], args.k)[1] for i in range(args.queries)])
+            ms_per_query = (time.perf_counter() - start) * 1000 / args.queries
+
+            if truth is None:
+                truth = found
+            recall = np.mean([len(set(found[i]) & set(truth[i])) / args.k for i in range(args.queries)])
+            label = f"{param_name}={value}" if value is not None else "exact"
+            print(f"{index_type:<10} {label:>14} {build_s:>8.1f} {recall:>9.3f} {ms_per_query:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Load test of GET /sessions with and without the in-process token -> user cache.
+
+--users users each hold a bearer token and --sessions-per-user sessions. --concurrency
+client threads issue --requests requests in total through the ASGI app, each with a random
+user's token. SQL statements are counted on the engine, split into the users lookups that
+authentication runs and everything else.
+
+    python -m benchmarks.bench_auth_cache --users 50 --requests 2000 --concurrency 8
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--sessions-per-user", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/bench.db"
+    os.environ["FAISS_INDEX_PATH"] = os.path.join(tmp, "bench_index.bin")
+    os.environ["EMBEDDING_CACHE_PATH"] = os.path.join(tmp, "embeddings.db")
+    os.environ["LLM_CACHE_PATH"] = os.path.join(tmp, "llm_cache.db")
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+
+    from app.core.config import settings
+    from app.core.database import engine
+    from app.main import app
+    from app.services.user_cache import user_cache
+
+    counts = {"users": 0, "other": 0}
+    counts_lock = threading.Lock()
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        with counts_lock:
+            counts["users" if "FROM users" in statement else "other"] += 1
+
+    with TestClient(app) as client:
+        tokens = []
+        for i in range(args.users):
+            credentials = {"email": f"user{i}@example.com", "password": "benchmark-password"}
+            client.post("/auth/register", json=credentials).raise_for_status()
+            response = client.post("/auth/login", data={"username": credentials["email"], "password": credentials["password"]})
+            token = response.json()["access_token"]
+            tokens.append(token)
+            for _ in range(args.sessions_per_user):
+                client.post("/sessions", json={"role": "Backend Engineer"}, headers={"Authorization": f"Bearer {token}"})
+
+        def request(seed):
+            token = random.Random(seed).choice(tokens)
+            start = time.perf_counter()
+            response = client.get("/sessions", headers={"Authorization": f"Bearer {token}"})
+            elapsed = time.perf_counter() - start
+            assert response.status_code == 200, response.text
+            return elapsed
+
+        print(f"{args.users} users x {args.sessions_per_user} sessions, {args.requests} GET /sessions, {args.concurrency} client threads")
+        print(f"{'token cache':<12} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'users SELECTs/req':>18} {'other SQL/req':>14}")
+        for enabled in (False, True):
+            settings.auth_cache_enabled = enabled
+            user_cache.clear()
+            with ThreadPoolExecutor(args.concurrency) as pool:
+                list(pool.map(request, range(args.concurrency * 4)))  # warm up
+                counts.update(users=0, other=0)
+                start = time.perf_counter()
+                latencies = np.array(list(pool.map(request, range(args.requests)))) * 1000
+                wall = time.perf_counter() - start
+            print(
+                f"{'on' if enabled else 'off':<12} {args.requests / wall:>8.0f} {np.percentile(latencies, 50):>8.2f} "
+                f"{np.percentile(latencies, 95):>8.2f} {counts['users'] / args.requests:>18.3f} {counts['other'] / args.requests:>14.3f}"
+            )
+        print("cache stats:", user_cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Batch search against one-at-a-time search for a screening run of 64 queries.
+
+Measures the FAISS step alone (64 one-row searches vs one 64-row matrix search)
+and the full handlers (64 sequential GET /search calls vs one POST /search/batch)
+against a stubbed embeddings backend with simulated network latency.
+
+    python -m benchmarks.bench_batch_search --chunks 100000 --queries 64
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import faiss
+import numpy as np
+
+from benchmarks._synthetic import StubEmbeddings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=64)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ["FAISS_INDEX_PATH"] = os.path.join(tmp, "bench_index.bin")
+    os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+    # The stub has its own concurrency limit; the scheduler's account pacing would dominate the timings
+    os.environ["LLM_REQUESTS_PER_MINUTE"] = "0"
+    os.environ["LLM_TOKENS_PER_MINUTE"] = "0"
+    os.environ["EMBEDDING_COALESCE_WINDOW_MS"] = "0"
+
+    from app.api.endpoints import search_resume, search_resume_batch
+    from app.schemas.resume import BatchSearchQuery, BatchSearchRequest
+    from app.services import llm_scheduler
+    from app.services.faiss_store import faiss_store
+
+    faiss_store.ensure_loaded()
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.chunks, faiss_store.dimension), dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    faiss_store.index.add_with_ids(vectors, np.arange(args.chunks, dtype=np.int64))
+    faiss_store.chunks.put_many(range(args.chunks), (
+        {"filename": f"resume_{idx // 10}.pdf", "text": "", "chunk_index": idx % 10} for idx in range(args.chunks)
+    ))
+    faiss_store._next_id = args.chunks
+
+    query_vectors = rng.standard_normal((args.queries, faiss_store.dimension), dtype=np.float32).tolist()
+    top_ks = [args.top_k] * args.queries
+    queries = [f"screening question {i}" for i in range(args.queries)]
+
+    def faiss_single():
+        for vector in query_vectors:
+            faiss_store.search(vector, top_k=args.top_k)
+
+    def faiss_batch():
+        faiss_store.search_batch(query_vectors, top_ks)
+
+    async def handler_single():
+        for query in queries:
+            await search_resume(query=query, top_k=args.top_k, filename=None, mine=False, mode="vector", current_user=None)
+
+    async def handler_batch():
+        request = BatchSearchRequest(queries=[BatchSearchQuery(query=q, top_k=args.top_k) for q in queries])
+        await search_resume_batch(request, current_user=None)
+
+    print(f"{args.chunks} chunks, {args.queries} queries, top_k={args.top_k}")
+    print(f"{'path':<28} {'ms / run':>9} {'upstream calls':>15}")
+    for label, fn in (("faiss: 64 single searches", faiss_single), ("faiss: one batch search", faiss_batch)):
+        fn()  # warm up
+        start = time.perf_counter()
+        for _ in range(args.repeats):
+            fn()
+        print(f"{label:<28} {(time.perf_counter() - start) * 1000 / args.repeats:>9.2f} {'-':>15}")
+
+    for label, fn in (("handler: 64 GET /search", handler_single), ("handler: POST /search/batch", handler_batch)):
+        stub = StubEmbeddings(latency_s=args.latency_ms / 1000)
+        llm_scheduler.get_client().embeddings = stub
+        start = time.perf_counter()
+        for _ in range(args.repeats):
+            asyncio.run(fn())
+        print(f"{label:<28} {(time.perf_counter() - start) * 1000 / args.repeats:>9.2f} {stub.calls // args.repeats:>15}")
+    faiss_store._log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Throughput of POST /upload-resumes against one POST /upload-resume per file.
+
+Both paths run against a stubbed embeddings backend with a fixed simulated
+round trip, so the comparison isolates API round trips and index writes.
+
+    python -m benchmarks.bench_bulk_upload --files 500
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks._synthetic import StubEmbeddings, make_pdf, synthetic_text
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/bench.db"
+    os.environ["FAISS_INDEX_PATH"] = os.path.join(tmp, "bench_index.bin")
+    # Both passes embed the same files, so the embedding cache would hide the second pass's cost
+    os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+    # The stub has no rate limit; token pacing would make both passes wait out the same account budget
+    os.environ["LLM_TOKENS_PER_MINUTE"] = "0"
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.services import llm_scheduler
+
+    stub = StubEmbeddings(latency_s=args.latency_ms / 1000)
+    llm_scheduler.get_client().embeddings = stub
+
+    pdfs = [make_pdf([synthetic_text(400, seed=i * 2), synthetic_text(400, seed=i * 2 + 1)]) for i in range(args.files)]
+
+    with TestClient(app) as client:
+        stub.calls = 0
+        start = time.perf_counter()
+        job_ids = [
+            client.post("/upload-resume", files={"file": (f"single_{i}.pdf", pdf, "application/pdf")}).json()["id"]
+            for i, pdf in enumerate(pdfs)
+        ]
+        while job_ids:
+            job_ids = [job_id for job_id in job_ids
+                       if client.get(f"/ingest-jobs/{job_id}").json()["status"] not in ("completed", "failed")]
+            time.sleep(0.05)
+        single_s = time.perf_counter() - start
+        single_calls = stub.calls
+
+        stub.calls = 0
+        start = time.perf_counter()
+        response = client.post(
+            "/upload-resumes",
+            files=[("files", (f"bulk_{i}.pdf", pdf, "application/pdf")) for i, pdf in enumerate(pdfs)],
+        )
+        bulk_s = time.perf_counter() - start
+        response.raise_for_status()
+        bulk_calls = stub.calls
+
+    print(f"{'path':<16} {'seconds':>9} {'files/s':>9} {'embed calls':>12}")
+    print(f"{'single uploads':<16} {single_s:>9.2f} {args.files / single_s:>9.1f} {single_calls:>12}")
+    print(f"{'bulk upload':<16} {bulk_s:>9.2f} {args.files / bulk_s:>9.1f} {bulk_calls:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Startup time and resident metadata memory as the number of stored chunks grows.
+
+Compares loading the legacy all-in-memory JSON metadata file against opening
+the SQLite chunk store and fetching the rows for one top-5 search result.
+
+    python -m benchmarks.bench_chunk_store --sizes 10000,100000,500000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.services.chunk_store import ChunkStore
+from benchmarks._synthetic import synthetic_text
+
+
+def measure(fn):
+    """Returns (result, seconds, peak traced bytes) for one call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {int(k): v for k, v in data["metadata"].items()}
+
+
+def open_and_fetch(path, ids):
+    store = ChunkStore(path)
+    rows = store.get_many(ids)
+    store.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,500000")
+    parser.add_argument("--chunk-words", type=int, default=120)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    text = synthetic_text(args.chunk_words)
+    print(f"{'chunks':>10} {'json load ms':>13} {'json peak MB':>13} {'store open+fetch ms':>20} {'store peak MB':>14} {'db MB':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(s) for s in args.sizes.split(",")):
+            metadata = {
+                idx: {"filename": f"resume_{idx // 10}.pdf", "text": text, "chunk_index": idx % 10}
+                for idx in range(size)
+            }
+            json_path = os.path.join(tmp, f"meta_{size}.json")
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump({"next_id": size, "metadata": metadata}, f)
+            db_path = os.path.join(tmp, f"chunks_{size}.db")
+            store = ChunkStore(db_path)
+            store.put_many(metadata.keys(), metadata.values())
+            store.checkpoint()
+            store.close()
+            del metadata
+
+            top_ids = rng.choice(size, 5, replace=False)
+            _, json_s, json_peak = measure(lambda: load_json(json_path))
+            _, store_s, store_peak = measure(lambda: open_and_fetch(db_path, top_ids))
+            print(
+                f"{size:>10} {json_s * 1000:>13.1f} {json_peak / 2**20:>13.1f} "
+                f"{store_s * 1000:>20.2f} {store_peak / 2**20:>14.2f} {os.path.getsize(db_path) / 2**20:>7.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
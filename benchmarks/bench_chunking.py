@@ -0,0 +1,106 @@
+"""
+Chunking throughput (MB/s of text) of the previous fixed-window chunker against the
+structure-aware chunker: per document, streamed page by page, and as one batch.
+
+Documents are synthetic resumes with headed sections, bullet lines and sentences.
+Without network access the cl100k_base tokenizer cannot be downloaded; both
+chunkers then run on a byte-level tiktoken encoding instead, which keeps the
+comparison fair but makes the absolute numbers pessimistic.
+
+    python -m benchmarks.bench_chunking --docs 200 --pages 3
+"""
+import argparse
+import random
+import time
+
+import tiktoken
+
+from benchmarks._synthetic import WORDS
+
+SECTIONS = ("Summary", "Experience", "Projects", "Skills", "Education")
+
+
+def synthetic_resume(pages, seed):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(pages):
+        lines = []
+        for heading in SECTIONS:
+            lines.append(heading)
+            for _ in range(rng.randint(3, 8)):
+                sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 25))).capitalize()
+                lines.append(f"- {sentence}." if rng.random() < 0.5 else f"{sentence}. {sentence[::-1].capitalize()}.")
+            lines.append("")
+        out.append("\n".join(lines))
+    return out
+
+
+def legacy_chunk_text(text, chunk_size, chunk_overlap):
+    encoding = tiktoken.get_encoding("cl100k_base")
+    tokens = encoding.encode(text)
+    chunks = []
+    start = 0
+    while start < len(tokens):
+        chunks.append(encoding.decode(tokens[start:start + chunk_size]))
+        start += chunk_size - chunk_overlap
+    return chunks
+
+
+def byte_level_encoding():
+    return tiktoken.Encoding(
+        "byte_level",
+        pat_str=r"""'s|'t|'re|'ve|'m|'ll|'d| ?\p{L}+| ?\p{N}+| ?[^\s\p{L}\p{N}]+|\s+(?!\S)|\s+""",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={},
+    )
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--chunk-overlap", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from app.utils import chunking, tokens
+
+    if tokens.get_encoding() is None:
+        encoding = byte_level_encoding()
+        tokens._encoding = encoding
+        tiktoken.get_encoding = lambda name: encoding
+        print("cl100k_base unavailable: using a byte-level encoding for both chunkers")
+
+    documents = [list(enumerate(synthetic_resume(args.pages, seed), 1)) for seed in range(args.docs)]
+    texts = [" ".join(text for _, text in pages) for pages in documents]
+    megabytes = sum(len(text.encode("utf-8")) for text in texts) / 1e6
+    size, overlap = args.chunk_size, args.chunk_overlap
+
+    runs = {
+        "legacy fixed windows": lambda: [legacy_chunk_text(text, size, overlap) for text in texts],
+        "chunk_text": lambda: [chunking.chunk_text(text, size, overlap) for text in texts],
+        "chunk_pages (streamed)": lambda: [list(chunking.chunk_pages(pages, size, overlap)) for pages in documents],
+        "chunk_documents (batch)": lambda: chunking.chunk_documents(documents, size, overlap),
+    }
+
+    print(f"{args.docs} documents, {megabytes:.2f} MB of text, chunk_size={size} overlap={overlap}")
+    print(f"{'implementation':<24} {'MB/s':>8} {'chunks':>8} {'mid-sentence ends':>18}")
+    for name, run in runs.items():
+        seconds, chunked = timed(run, args.repeat)
+        chunks = [getattr(chunk, "text", chunk) for document in chunked for chunk in document]
+        ragged = sum(1 for chunk in chunks if chunk.rstrip()[-1:] not in ".!?" and not chunk.rstrip().endswith(tuple(SECTIONS)))
+        print(f"{name:<24} {megabytes / seconds:>8.1f} {len(chunks):>8} {ragged / len(chunks):>17.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Latency of POST /make-decision in fast mode (local metrics and rule-based
+justification) against full mode, where a stubbed LLM writes the justification.
+
+    python -m benchmarks.bench_decision --rounds 8
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks._synthetic import StubChat
+
+WEAKNESSES = [
+    "Did not discuss failure modes", "No mention of failure modes", "Vague on consistency guarantees",
+    "Lacked metrics", "Did not quantify latency", "Unclear data model",
+]
+
+
+def make_request(rounds, seed=0):
+    from app.schemas.decision import DecisionRequest
+
+    rng = random.Random(seed)
+    return DecisionRequest(role="Backend Engineer", rounds=[{
+        "scores": {axis: rng.randint(4, 9) for axis in
+                   ("conceptual_clarity", "technical_depth", "real_world_application", "communication_precision")},
+        "weaknesses": rng.sample(WEAKNESSES, 2),
+        "final_score": rng.randint(40, 90),
+        "audit": {"hallucination_detected": rng.random() < 0.1, "reasoning_alignment_score": 8, "score_consistency": "Consistent"},
+    } for _ in range(rounds)])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=1000)
+    parser.add_argument("--llm-latency-ms", type=float, default=800.0)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ["FAISS_INDEX_PATH"] = os.path.join(tmp, "bench_index.bin")
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+
+    from app.services import llm_scheduler
+    from app.services.decision_agent import make_hiring_decision
+
+    request = make_request(args.rounds)
+    llm_scheduler.get_client().chat = StubChat(json.dumps({"justification": "Stub justification."}), args.llm_latency_ms / 1000, 0.0)
+
+    async def timed(mode, repeats):
+        latencies = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            await make_hiring_decision(request, mode=mode)
+            latencies.append((time.perf_counter() - start) * 1000)
+        return latencies
+
+    print(f"{args.rounds} rounds")
+    print(f"{'mode':<6} {'p50 ms':>9} {'p99 ms':>9}")
+    for mode, repeats in (("fast", args.repeats), ("full", 3)):
+        latencies = asyncio.run(timed(mode, repeats))
+        print(f"{mode:<6} {np.percentile(latencies, 50):>9.3f} {np.percentile(latencies, 99):>9.3f}")
+    print(asyncio.run(make_hiring_decision(request, mode="fast")).justification)
+
+
+if __name__ == "__main__":
+    main()
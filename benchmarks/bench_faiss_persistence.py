@@ -0,0 +1,83 @@
+"""
+Ingest latency of FaissStore.add_vectors as the index grows.
+
+Compares the segment-log append path against the legacy full rewrite
+(faiss.write_index + re-dumping the whole metadata JSON) at each checkpoint.
+
+    python -m benchmarks.bench_faiss_persistence --sizes 10000,100000,1000000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import faiss
+import numpy as np
+
+from app.core.config import settings
+
+
+def legacy_save(store, metadata):
+    faiss.write_index(store.index, store.index_path)
+    with open(store.metadata_path + ".legacy", "w", encoding="utf-8") as f:
+        json.dump({"next_id": store._next_id, "metadata": metadata}, f)
+
+
+def grow_to(store, metadata, target, dim, rng):
+    """Bulk-loads synthetic chunks straight into the index and chunk store, bypassing the log."""
+    step = 50000
+    while store.index.ntotal < target:
+        n = min(step, target - store.index.ntotal)
+        vectors = rng.standard_normal((n, dim), dtype=np.float32)
+        faiss.normalize_L2(vectors)
+        ids = np.arange(store._next_id, store._next_id + n, dtype=np.int64)
+        store.index.add_with_ids(vectors, ids)
+        metas = [{"filename": "synthetic.pdf", "text": "x" * 400, "chunk_index": int(idx)} for idx in ids]
+        store.chunks.put_many(ids, metas)
+        metadata.update(zip(ids.tolist(), metas))
+        store._next_id += n
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--batch", type=int, default=20, help="Chunks per simulated resume upload")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.faiss_index_path = os.path.join(tmp, "bench_index.bin")
+        # Keep snapshots out of the measured window; they run on a background thread in production.
+        settings.faiss_snapshot_interval = 1 << 62
+        from app.services.faiss_store import FaissStore
+
+        store = FaissStore()
+        store.ensure_loaded()
+        store.dimension = args.dim
+        store.index = faiss.IndexIDMap(faiss.IndexFlatIP(args.dim))
+        store.delta = faiss.IndexIDMap(faiss.IndexFlatIP(args.dim))
+
+        metadata = {}  # What the legacy format would hold in memory and re-dump on every save
+        print(f"{'chunks':>10} {'append p50 ms':>14} {'append max ms':>14} {'legacy save ms':>15}")
+        for size in (int(s) for s in args.sizes.split(",")):
+            grow_to(store, metadata, size, args.dim, rng)
+            timings = []
+            for _ in range(args.repeats):
+                batch = rng.standard_normal((args.batch, args.dim), dtype=np.float32).tolist()
+                metas = [{"filename": "bench.pdf", "text": "y" * 400, "chunk_index": i} for i in range(args.batch)]
+                start = time.perf_counter()
+                store.add_vectors(batch, metas)
+                timings.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            legacy_save(store, metadata)
+            legacy_ms = (time.perf_counter() - start) * 1000
+            print(f"{size:>10} {np.median(timings):>14.2f} {max(timings):>14.2f} {legacy_ms:>15.1f}")
+        store._log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Query latency of lexical (BM25), vector and hybrid (reciprocal-rank fusion) search on a 100k-chunk store.
+
+Chunk text is drawn from a Zipf-distributed vocabulary so term frequencies look like real
+prose, and queries are a few mid-frequency terms. Embeddings are random unit vectors; vector
+search cost does not depend on what they encode.
+
+"store" rows time the FaissStore calls alone, with the query embedding precomputed.
+"end-to-end" rows go through retrieve_chunks with the OpenAI embedding call stubbed to take
+--embed-ms, which is what vector and hybrid queries wait on for every uncached query; the
+"OpenAI down" row has the embedding call fail, so hybrid answers from BM25 alone.
+
+    python -m benchmarks.bench_lexical_search --chunks 100000 --queries 200
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+import numpy as np
+
+
+def zipf_words(vocabulary, rng, n):
+    ranks = np.arange(1, vocabulary + 1)
+    weights = 1.0 / ranks ** 1.1
+    return rng.choice(vocabulary, size=n, p=weights / weights.sum())
+
+
+def timed(fn, items):
+    latencies = []
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.percentile(latencies, 50), np.percentile(latencies, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=100000)
+    parser.add_argument("--chunk-words", type=int, default=120)
+    parser.add_argument("--chunks-per-resume", type=int, default=10)
+    parser.add_argument("--vocabulary", type=int, default=30000)
+    parser.add_argument("--query-words", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--embed-ms", type=float, default=200.0, help="Simulated OpenAI embedding latency")
+    parser.add_argument("--dim", type=int, default=1536)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ["FAISS_INDEX_PATH"] = os.path.join(tmp, "bench_index.bin")
+    os.environ["FAISS_SNAPSHOT_INTERVAL"] = str(1 << 62)
+    from app.services.faiss_store import FaissStore
+
+    store = FaissStore()
+    rng = np.random.default_rng(0)
+    words = [f"term{i}" for i in range(args.vocabulary)]
+
+    start = time.perf_counter()
+    for batch in range(0, args.chunks, 5000):
+        n = min(5000, args.chunks - batch)
+        text_ids = zipf_words(args.vocabulary, rng, n * args.chunk_words).reshape(n, args.chunk_words)
+        store.add_vectors(rng.standard_normal((n, args.dim), dtype=np.float32).tolist(), [
+            {
+                "filename": f"resume_{(batch + i) // args.chunks_per_resume}.pdf",
+                "text": " ".join(words[w] for w in text_ids[i]),
+                "chunk_index": (batch + i) % args.chunks_per_resume,
+            }
+            for i in range(n)
+        ])
+    store.save_index()
+    print(f"{args.chunks} chunks of {args.chunk_words} words, vocabulary {args.vocabulary}, dim={args.dim}: indexed in {time.perf_counter() - start:.1f}s")
+
+    queries = [" ".join(words[w] for w in rng.integers(100, 5000, args.query_words)) for _ in range(args.queries)]
+    embeddings = rng.standard_normal((args.queries, args.dim), dtype=np.float32).tolist()
+    resumes = [f"resume_{i}.pdf" for i in rng.integers(0, args.chunks // args.chunks_per_resume, args.queries)]
+    hits = sum(bool(store.search_lexical(query, top_k=5)) for query in queries)
+    print(f"{args.queries} queries of {args.query_words} terms, {hits} with lexical matches")
+
+    print(f"{'path':<12} {'mode':<22} {'p50 ms':>8} {'p95 ms':>8}")
+    rows = [
+        ("lexical", lambda i: store.search_lexical(queries[i], top_k=5)),
+        ("vector", lambda i: store.search(embeddings[i], top_k=5)),
+        ("hybrid", lambda i: store.search_hybrid(queries[i], embeddings[i], top_k=5)),
+        ("lexical, per resume", lambda i: store.search_lexical(queries[i], top_k=5, filename=resumes[i])),
+        ("vector, per resume", lambda i: store.search(embeddings[i], top_k=5, filename=resumes[i])),
+        ("hybrid, per resume", lambda i: store.search_hybrid(queries[i], embeddings[i], top_k=5, filename=resumes[i])),
+    ]
+    for mode, fn in rows:
+        p50, p95 = timed(fn, range(args.queries))
+        print(f"{'store':<12} {mode:<22} {p50:>8.2f} {p95:>8.2f}")
+
+    from app.services import retrieval
+    from app.services.llm_scheduler import LLMUnavailableError
+
+    retrieval.faiss_store = store
+    # Every query of the outage row would log its fallback
+    logging.getLogger(retrieval.__name__).setLevel(logging.ERROR)
+    by_query = dict(zip(queries, embeddings))
+
+    async def slow_embedding(text):
+        await asyncio.sleep(args.embed_ms / 1000)
+        return by_query[text]
+
+    async def unavailable(text):
+        raise LLMUnavailableError("stubbed outage")
+
+    loop = asyncio.new_event_loop()
+    for mode, embedding in (("lexical", slow_embedding), ("vector", slow_embedding), ("hybrid", slow_embedding), ("hybrid, OpenAI down", unavailable)):
+        retrieval.get_query_embedding = embedding
+        p50, p95 = timed(lambda query: loop.run_until_complete(retrieval.retrieve_chunks(query, top_k=5, mode=mode.split(",")[0])), queries)
+        print(f"{'end-to-end':<12} {mode:<22} {p50:>8.2f} {p95:>8.2f}")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+LLM scheduler against a local stub OpenAI server that enforces its own rate limit.
+
+The stub answers /v1/chat/completions and /v1/embeddings over HTTP and returns
+429 with Retry-After once more than --server-rpm requests arrive within a minute
+(scaled down by --time-scale so a run takes seconds). A burst of interactive chat
+calls and bulk embedding calls is sent through the real OpenAI client, first with
+pacing disabled (retries only) and then paced to the server's limit.
+
+    python -m benchmarks.bench_llm_scheduler --chat 40 --embed 80 --server-rpm 30
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+class StubOpenAI(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, rpm, window_s, latency_s):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.rpm = rpm
+        self.window_s = window_s
+        self.latency_s = latency_s
+        self.lock = threading.Lock()
+        self.recent = deque()
+        self.accepted = 0
+        self.rejected = 0
+
+    def admit(self) -> bool:
+        now = time.monotonic()
+        with self.lock:
+            while self.recent and self.recent[0] <= now - self.window_s:
+                self.recent.popleft()
+            if len(self.recent) >= self.rpm:
+                self.rejected += 1
+                return False
+            self.recent.append(now)
+            self.accepted += 1
+            return True
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, headers=()):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if not self.server.admit():
+            retry_ms = str(int(self.server.window_s * 1000 / 10))
+            self._send(429, {"error": {"message": "Rate limit reached", "type": "requests"}}, [("retry-after-ms", retry_ms)])
+            return
+        time.sleep(self.server.latency_s)
+        if self.path.endswith("/embeddings"):
+            data = [{"object": "embedding", "index": i, "embedding": [0.0] * 8} for i in range(len(request["input"]))]
+            self._send(200, {"object": "list", "data": data, "model": request["model"], "usage": {"prompt_tokens": 0, "total_tokens": 0}})
+        else:
+            self._send(200, {
+                "id": "chatcmpl-stub", "object": "chat.completion", "created": 0, "model": request["model"],
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "{}"}}],
+            })
+
+
+async def burst(scheduler_module, chats, embeds):
+    latencies = {"interactive chat": [], "bulk embeddings": []}
+    failures = {"interactive chat": 0, "bulk embeddings": 0}
+
+    async def timed(lane, coro):
+        start = time.perf_counter()
+        try:
+            await coro
+            latencies[lane].append((time.perf_counter() - start) * 1000)
+        except scheduler_module.LLMUnavailableError:
+            failures[lane] += 1
+
+    tasks = [
+        timed("bulk embeddings", scheduler_module.create_embeddings(
+            priority=scheduler_module.PRIORITY_BULK, model="text-embedding-3-small", input=["chunk text"] * 16))
+        for _ in range(embeds)
+    ] + [
+        timed("interactive chat", scheduler_module.chat_completion(
+            model="gpt-4o-mini", messages=[{"role": "user", "content": "Evaluate this answer."}], max_tokens=200))
+        for _ in range(chats)
+    ]
+    await asyncio.gather(*tasks)
+    return latencies, failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chat", type=int, default=40)
+    parser.add_argument("--embed", type=int, default=80)
+    parser.add_argument("--server-rpm", type=int, default=30)
+    parser.add_argument("--time-scale", type=float, default=60.0, help="Compress one minute into 60/time-scale seconds")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    from openai import AsyncOpenAI
+    from app.services import llm_scheduler
+
+    window_s = 60.0 / args.time_scale
+    print(f"stub limit: {args.server_rpm} requests per {window_s:.1f}s window")
+    print(f"{'mode':<8} {'lane':<18} {'ok':>4} {'failed':>7} {'p50 ms':>8} {'p99 ms':>8}   server 429s / retries")
+    for mode, rpm in (("retry", 0), ("paced", args.server_rpm * args.time_scale)):
+        server = StubOpenAI(args.server_rpm, window_s, args.latency_ms / 1000)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        llm_scheduler._client = AsyncOpenAI(
+            api_key="sk-benchmark", base_url=f"http://127.0.0.1:{server.server_address[1]}/v1", max_retries=0
+        )
+        llm_scheduler.llm_scheduler = llm_scheduler.LLMScheduler(
+            requests_per_minute=rpm, tokens_per_minute=0, max_concurrency=16,
+            max_retries=8, backoff_base_s=window_s / 20, backoff_max_s=window_s, burst_seconds=5.0 / args.time_scale
+        )
+        latencies, failures = asyncio.run(burst(llm_scheduler, args.chat, args.embed))
+        stats = llm_scheduler.llm_scheduler.stats()
+        for lane, values in latencies.items():
+            p50, p99 = (np.percentile(values, 50), np.percentile(values, 99)) if values else (0.0, 0.0)
+            print(f"{mode:<8} {lane:<18} {len(values):>4} {failures[lane]:>7} {p50:>8.1f} {p99:>8.1f}   "
+                  f"{server.rejected} / {stats['retries']}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
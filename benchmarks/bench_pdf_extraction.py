@@ -0,0 +1,80 @@
+"""
+Text extraction from a synthetic 200-page PDF: the previous serial extractor
+(string concatenation in the calling thread) against iter_pdf_pages run as one task
+on a single worker process and fanned out across the page extraction process pool.
+Also reports the time until the first page is available to a streaming consumer.
+
+    python -m benchmarks.bench_pdf_extraction --pages 200 --workers 4
+"""
+import argparse
+import io
+import os
+import time
+
+import PyPDF2
+
+from benchmarks._synthetic import make_pdf, synthetic_text
+
+
+def legacy_extract_text_from_pdf(file_bytes):
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_bytes))
+    text = ""
+    for page_num in range(len(pdf_reader.pages)):
+        extracted = pdf_reader.pages[page_num].extract_text()
+        if extracted:
+            text += extracted + " "
+    return text.strip()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--words", type=int, default=600, help="Words of text per page")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from app.core.config import settings
+    from app.utils import pdf_parser
+
+    pdf = make_pdf([synthetic_text(args.words, seed=i) for i in range(args.pages)])
+    settings.pdf_max_pages = args.pages
+    settings.pdf_workers = args.workers
+    print(f"{args.pages} pages, {len(pdf) / 1e6:.1f} MB PDF, {pdf_parser._workers()} worker processes ({os.cpu_count()} CPUs)")
+    if pdf_parser._workers() <= 1:
+        print("only one CPU: the pool has one worker and the pool row runs serially")
+
+    def streamed():
+        start = time.perf_counter()
+        first = None
+        pages = 0
+        for _ in pdf_parser.iter_pdf_pages(pdf):
+            first = first or time.perf_counter() - start
+            pages += 1
+        return first, pages
+
+    # Warm the pool so worker start-up is not billed to the first run
+    settings.pdf_parallel_min_pages = 1
+    list(pdf_parser.iter_pdf_pages(make_pdf(["warm up"] * 2)))
+
+    print(f"{'extractor':<22} {'total ms':>9} {'first page ms':>14} {'pages/s':>9}")
+    for name, min_pages in (("legacy serial", None), ("iter_pdf_pages 1 task", args.pages + 1), ("iter_pdf_pages pool", 1)):
+        best_total, best_first = float("inf"), float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            if min_pages is None:
+                legacy_extract_text_from_pdf(pdf)
+                first = time.perf_counter() - start
+            else:
+                settings.pdf_parallel_min_pages = min_pages
+                first, pages = streamed()
+                assert pages == args.pages
+            best_total = min(best_total, time.perf_counter() - start)
+            best_first = min(best_first, first)
+        print(f"{name:<22} {best_total * 1000:>9.1f} {best_first * 1000:>14.1f} {args.pages / best_total:>9.0f}")
+
+    pdf_parser.shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
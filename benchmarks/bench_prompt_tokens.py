@@ -0,0 +1,141 @@
+"""
+Prompt tokens per agent call before and after the token-budgeted prompt builder.
+
+The legacy prompts (indented JSON, every retrieved chunk inlined) are rebuilt
+here from the templates the agents used to send; the new prompts are captured
+from the agents themselves with retrieval and the LLM call stubbed out.
+Resume context is sized by --chunks chunks of --chunk-words words each.
+
+    python -m benchmarks.bench_prompt_tokens --chunks 12 --chunk-words 250
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+from dataclasses import asdict
+
+from benchmarks._synthetic import synthetic_text
+
+
+def legacy_prompts(role, chunks, question, answer, evaluation, metrics):
+    context = "\n\n".join(chunks)
+    return {
+        "questions": f"""Role: {role}
+
+Candidate Resume Context:
+{context}
+
+Generate the 5 interview questions based on the requirements.""",
+        "evaluation": f"""Question:
+{question}
+
+Candidate Resume Context:
+{context}
+
+Candidate Answer:
+{answer}
+
+Evaluate the candidate's answer based on the criteria.""",
+        "audit": f"""Question:
+{question}
+
+Candidate Answer:
+{answer}
+
+Resume Context:
+{context}
+
+Evaluation Output:
+{json.dumps(evaluation, indent=2)}
+
+Evaluate the integrity of the evaluation based on the instructions.""",
+        "decision": f"""Role: {role}
+
+Computed Decision:
+{json.dumps(asdict(metrics), indent=2)}
+
+Write the justification for this decision based on the instructions.""",
+    }
+
+
+async def builder_prompts(role, chunks, question, answer, evaluation, decision_request):
+    from app.schemas.auditor import AuditRequest, AuditResponse
+    from app.schemas.decision import DecisionJustification
+    from app.schemas.evaluation import EvaluationRequest
+    from app.services import auditor_agent, decision_agent, evaluation_agent, question_agent
+
+    captured = {}
+
+    async def capture(agent, response_model, system_prompt, user_prompt, model="gpt-4o"):
+        captured[agent] = (system_prompt, user_prompt)
+        if response_model is DecisionJustification:
+            return DecisionJustification(justification="stub")
+        return auditor_agent.FALLBACK_AUDIT if response_model is AuditResponse else None
+
+    async def retrieve(*args, **kwargs):
+        return [({"text": chunk}, 1.0) for chunk in chunks]
+
+    auditor_agent.cached_json_completion = capture
+    decision_agent.cached_json_completion = capture
+    question_agent.retrieve_chunks = retrieve
+
+    captured["questions"] = await question_agent._question_prompts(role, None, None)
+    captured["evaluation"] = evaluation_agent._evaluation_prompts(
+        EvaluationRequest(question=question, resume_context="\n\n".join(chunks), answer=answer)
+    )
+    await auditor_agent.audit_evaluation(AuditRequest(
+        question=question, candidate_answer=answer, resume_context="\n\n".join(chunks), evaluation_json=evaluation
+    ))
+    await decision_agent.make_hiring_decision(decision_request)
+    return captured
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=12)
+    parser.add_argument("--chunk-words", type=int, default=250)
+    parser.add_argument("--rounds", type=int, default=8)
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+    os.environ["FAISS_INDEX_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_index.bin")
+    from app.core.config import settings
+    from app.services.decision_engine import compute_decision_metrics
+    from app.utils.tokens import count_tokens, get_encoding
+    from benchmarks.bench_decision import make_request
+
+    role = "Senior Backend Engineer"
+    chunks = [synthetic_text(args.chunk_words, seed=i) for i in range(args.chunks)]
+    question = "How would you shard the ingestion pipeline when a single tenant dominates write volume?"
+    answer = synthetic_text(400, seed=args.chunks)
+    evaluation = {
+        "scores": {"conceptual_clarity": 7, "technical_depth": 6, "real_world_application": 7, "communication_precision": 8},
+        "confidence_level": "Medium",
+        "strengths": ["Identified hot partitions", "Discussed back-pressure"],
+        "weaknesses": ["Did not quantify rebalancing cost", "No mention of idempotent retries"],
+        "improvement_suggestions": ["Estimate the write amplification of re-sharding"],
+        "final_score": 68,
+    }
+    decision_request = make_request(args.rounds)
+    metrics = compute_decision_metrics(decision_request)
+
+    legacy = legacy_prompts(role, chunks, question, answer, evaluation, metrics)
+    current = asyncio.run(builder_prompts(role, chunks, question, answer, evaluation, decision_request))
+    budgets = {
+        "questions": settings.prompt_budget_questions, "evaluation": settings.prompt_budget_evaluation,
+        "audit": settings.prompt_budget_audit, "decision": settings.prompt_budget_decision,
+    }
+
+    print(f"tokenizer: {'tiktoken' if get_encoding() else 'length estimate'}")
+    print(f"{'agent':<11} {'legacy':>8} {'builder':>8} {'saved':>7} {'budget':>7}")
+    for agent in ("questions", "evaluation", "audit", "decision"):
+        system_prompt, user_prompt = current[agent]
+        before = count_tokens(system_prompt) + count_tokens(legacy[agent])
+        after = count_tokens(system_prompt) + count_tokens(user_prompt)
+        print(f"{agent:<11} {before:>8} {after:>8} {1 - after / before:>6.0%} {budgets[agent]:>7}")
+
+
+if __name__ == "__main__":
+    main()
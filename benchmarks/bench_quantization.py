@@ -0,0 +1,103 @@
+"""
+Memory and recall@5 of compressed FAISS storage against the flat float32 index.
+
+A synthetic corpus of clustered unit vectors (resume chunks are far from uniformly
+spread) is loaded through FaissStore.add_vectors, and a snapshot migrates it from
+flat to each index type. The store is then reopened, so the base index is the
+memory-mapped snapshot as in production. Queries are perturbed corpus vectors;
+ground truth is an exact numpy top-5.
+
+"index MB" is the snapshot size, which is what a process maps into memory.
+"vectors MB" is the full-precision file kept on disk for re-ranking.
+
+    python -m benchmarks.bench_quantization --chunks 20000 --queries 200
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+
+def clustered_corpus(n, dim, clusters, rng):
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    vectors = centers[rng.integers(0, clusters, n)] + 0.6 * rng.standard_normal((n, dim), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def open_store(path, index_type, rerank_factor, corpus=None):
+    """Opens a store over `path`, first loading `corpus` into it and snapshotting if given."""
+    from app.core.config import settings
+    from app.services.faiss_store import FaissStore
+
+    settings.faiss_index_path = path
+    settings.faiss_index_type = index_type
+    settings.faiss_rerank_factor = rerank_factor
+    settings.faiss_migrate_threshold = 1
+    settings.faiss_snapshot_interval = 1 << 62
+    settings.faiss_exact_scope_max = 0
+    if corpus is not None:
+        store = FaissStore()
+        for start in range(0, len(corpus), 5000):
+            batch = corpus[start:start + 5000]
+            store.add_vectors(batch.tolist(), [{"filename": f"resume_{start + i}.pdf", "text": ""} for i in range(len(batch))])
+        store.save_index()
+        store._shared.close()
+    store = FaissStore()
+    store.ensure_loaded()
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--clusters", type=int, default=500)
+    parser.add_argument("--rerank-factor", type=int, default=4)
+    parser.add_argument("--nlist", type=int, default=256)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    from app.core.config import settings
+    settings.faiss_nlist = args.nlist
+
+    rng = np.random.default_rng(0)
+    corpus = clustered_corpus(args.chunks, args.dim, args.clusters, rng)
+    queries = corpus[rng.integers(0, args.chunks, args.queries)] + 0.05 * rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    truth = np.argsort(-(queries @ corpus.T), axis=1)[:, :5]
+
+    print(f"{args.chunks} chunks, dim={args.dim}, {args.queries} queries, re-rank factor {args.rerank_factor}")
+    print(f"{'index':<10} {'re-rank':>8} {'index MB':>9} {'bytes/chunk':>12} {'vs flat':>8} {'vectors MB':>11} {'recall@5':>9} {'ms/query':>9}")
+    flat_bytes = None
+    for index_type in ("flat", "fp16", "sq8", "ivf_pq"):
+        path = os.path.join(tmp, index_type, "index.bin")
+        os.makedirs(os.path.dirname(path))
+        # Built with re-ranking on so the full-precision vector file exists for the re-ranked row
+        open_store(path, index_type, args.rerank_factor, corpus)._shared.close()
+        for rerank_factor in ((0,) if index_type == "flat" else (0, args.rerank_factor)):
+            store = open_store(path, index_type, rerank_factor)
+            index_bytes = os.path.getsize(path)
+            flat_bytes = flat_bytes or index_bytes
+            vectors_path = path.replace(".bin", "_vectors.f32")
+            vector_bytes = os.path.getsize(vectors_path) if os.path.exists(vectors_path) else 0
+
+            hits = 0
+            start = time.perf_counter()
+            for query, expected in zip(queries, truth):
+                results = store.search(query.tolist(), top_k=5)
+                found = {int(metadata["filename"][7:-4]) for metadata, _ in results}
+                hits += len(found & set(expected.tolist()))
+            ms = (time.perf_counter() - start) * 1000 / args.queries
+            print(
+                f"{index_type:<10} {('x' + str(rerank_factor)) if rerank_factor else 'off':>8} {index_bytes / 1e6:>9.1f} "
+                f"{index_bytes / args.chunks:>12.0f} {flat_bytes / index_bytes:>7.1f}x {vector_bytes / 1e6:>11.1f} {hits / truth.size:>9.3f} {ms:>9.2f}"
+            )
+            store._shared.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Load test for query embedding micro-batching.
+
+Fires N concurrent /search requests (handler coroutines, no HTTP transport) at a
+stubbed embeddings backend, with the coalescer disabled and then enabled, and
+reports p50/p99 latency and the number of upstream embedding calls.
+
+    python -m benchmarks.bench_query_coalescing --concurrency 200
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks._synthetic import StubEmbeddings
+
+
+async def run(concurrency, duplicate_ratio):
+    from app.api.endpoints import search_resume
+
+    distinct = max(1, int(concurrency * (1 - duplicate_ratio)))
+    queries = [f"distributed systems experience {i % distinct}" for i in range(concurrency)]
+
+    async def one(query):
+        start = time.perf_counter()
+        await search_resume(query=query, top_k=5, filename=None, mine=False, mode="vector", current_user=None)
+        return (time.perf_counter() - start) * 1000
+
+    return await asyncio.gather(*(one(q) for q in queries))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--upstream-concurrency", type=int, default=20,
+                        help="Simulated provider connection/concurrency limit")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.25)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ["FAISS_INDEX_PATH"] = os.path.join(tmp, "bench_index.bin")
+    os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+    # The stub has its own concurrency limit; the scheduler's account pacing would dominate the timings
+    os.environ["LLM_REQUESTS_PER_MINUTE"] = "0"
+    os.environ["LLM_TOKENS_PER_MINUTE"] = "0"
+
+    from app.core.config import settings
+    from app.services import embeddings, llm_scheduler
+
+    print(f"{'mode':<12} {'p50 ms':>8} {'p99 ms':>8} {'upstream calls':>15}")
+    for mode, window_ms in (("direct", 0.0), ("coalesced", 5.0)):
+        stub = StubEmbeddings(latency_s=args.latency_ms / 1000, max_concurrency=args.upstream_concurrency)
+        llm_scheduler.get_client().embeddings = stub
+        settings.embedding_coalesce_window_ms = window_ms
+        embeddings.query_coalescer.window_s = window_ms / 1000
+        latencies = asyncio.run(run(args.concurrency, args.duplicate_ratio))
+        print(f"{mode:<12} {np.percentile(latencies, 50):>8.1f} {np.percentile(latencies, 99):>8.1f} {stub.calls:>15}")
+
+
+if __name__ == "__main__":
+    main()
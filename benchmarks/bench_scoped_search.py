@@ -0,0 +1,78 @@
+"""
+Scoped (per-resume / per-user) search latency with 10k resumes in the store.
+
+Compares FaissStore's filter-aware search against searching the global index
+and post-filtering an over-fetched top_k.
+
+    python -m benchmarks.bench_scoped_search --resumes 10000 --chunks 10
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import faiss
+import numpy as np
+
+
+def timed(fn, repeats):
+    start = time.perf_counter()
+    for i in range(repeats):
+        result = fn(i)
+    return (time.perf_counter() - start) * 1000 / repeats, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=10000)
+    parser.add_argument("--chunks", type=int, default=10, help="Chunks per resume")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--overfetch", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ["FAISS_INDEX_PATH"] = os.path.join(tmp, "bench_index.bin")
+    from app.services.faiss_store import FaissStore, build_index
+
+    store = FaissStore()
+    store.ensure_loaded()
+    store.dimension = args.dim
+    store.index = build_index("flat", args.dim)
+    store.delta = build_index("flat", args.dim)
+
+    rng = np.random.default_rng(0)
+    n = args.resumes * args.chunks
+    vectors = rng.standard_normal((n, args.dim), dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    store.index.add_with_ids(vectors, np.arange(n, dtype=np.int64))
+    store.chunks.put_many(range(n), ({
+        "filename": f"resume_{idx // args.chunks}.pdf", "text": "", "chunk_index": idx % args.chunks,
+        "owner_id": f"user_{(idx // args.chunks) % args.users}",
+    } for idx in range(n)))
+    store._next_id = n
+    queries = rng.standard_normal((args.repeats, args.dim), dtype=np.float32).tolist()
+
+    def post_filter(i, key, value):
+        hits = store.search(queries[i], top_k=args.overfetch)
+        return [m for m, _ in hits if m.get(key) == value][:5]
+
+    rows = [
+        ("global top-5", lambda i: store.search(queries[i], top_k=5)),
+        (f"resume post-filter (k={args.overfetch})", lambda i: post_filter(i, "filename", f"resume_{i}.pdf")),
+        ("resume scoped", lambda i: store.search(queries[i], top_k=5, filename=f"resume_{i}.pdf")),
+        (f"user post-filter (k={args.overfetch})", lambda i: post_filter(i, "owner_id", f"user_{i % args.users}")),
+        ("user scoped", lambda i: store.search(queries[i], top_k=5, owner_id=f"user_{i % args.users}")),
+    ]
+    print(f"{n} chunks, {args.resumes} resumes, {args.users} users")
+    print(f"{'query':<32} {'ms/query':>9} {'results':>8}")
+    for label, fn in rows:
+        ms, result = timed(fn, args.repeats)
+        print(f"{label:<32} {ms:>9.3f} {len(result):>8}")
+    store._log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+GET /sessions latency against history depth, with one user owning 100k sessions in SQLite.
+
+"previous" is the old unbounded listing (every session as a full ORM object).
+"keyset" is get_user_sessions resuming from a cursor at the given depth; "offset" is
+the same page fetched with LIMIT/OFFSET, which scans and discards every earlier row.
+
+    python -m benchmarks.bench_session_listing --sessions 100000 --page-size 50
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+
+async def run(args):
+    from sqlalchemy import insert, select, text
+    from sqlalchemy.orm import load_only
+
+    from app.core.database import AsyncSessionLocal, Base, engine, upgrade_schema
+    from app.models import user, session, ingest_job  # noqa: F401
+    from app.models.session import InterviewSession
+    from app.services.session_service import _LIST_COLUMNS, _encode_cursor, get_user_sessions
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(upgrade_schema)
+
+    user_id = str(uuid.uuid4())
+    others = [str(uuid.uuid4()) for _ in range(10)]
+    start_time = datetime(2024, 1, 1)
+    async with AsyncSessionLocal() as db:
+        for batch in range(0, args.sessions + args.other_sessions, 10000):
+            await db.execute(insert(InterviewSession), [
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": user_id if i < args.sessions else others[i % len(others)],
+                    "role": ("Backend Engineer", "Data Engineer", "SRE")[i % 3],
+                    "status": "completed" if i % 4 else "active",
+                    "created_at": start_time + timedelta(seconds=i),
+                }
+                for i in range(batch, min(batch + 10000, args.sessions + args.other_sessions))
+            ])
+        await db.commit()
+
+        # Rows in listing order, to build the cursor a client would hold at each depth
+        ordered = (await db.execute(
+            select(InterviewSession.created_at, InterviewSession.id)
+            .where(InterviewSession.user_id == user_id)
+            .order_by(InterviewSession.created_at.desc(), InterviewSession.id.desc())
+        )).all()
+
+    async def timed(fn):
+        async with AsyncSessionLocal() as db:
+            await fn(db)  # warm up
+            start = time.perf_counter()
+            for _ in range(args.repeats):
+                await fn(db)
+            return (time.perf_counter() - start) * 1000 / args.repeats
+
+    async def previous(db):
+        result = await db.execute(
+            select(InterviewSession).where(InterviewSession.user_id == user_id).order_by(InterviewSession.created_at.desc())
+        )
+        return result.scalars().all()
+
+    def keyset(depth, **filters):
+        cursor = _encode_cursor(*ordered[depth - 1]) if depth else None
+        return lambda db: get_user_sessions(db, user_id, args.page_size, cursor=cursor, **filters)
+
+    def offset(depth):
+        query = (
+            select(InterviewSession)
+            .options(load_only(*_LIST_COLUMNS))
+            .where(InterviewSession.user_id == user_id)
+            .order_by(InterviewSession.created_at.desc(), InterviewSession.id.desc())
+            .limit(args.page_size).offset(depth)
+        )
+
+        async def fetch(db):
+            return (await db.execute(query)).scalars().all()
+        return fetch
+
+    print(f"{args.sessions} sessions for the user, {args.other_sessions} for others, page size {args.page_size}")
+    print(f"{'listing':<34} {'ms':>9}")
+    print(f"{'previous: all sessions':<34} {await timed(previous):>9.2f}")
+    for depth in (0, 1000, 10000, 50000, args.sessions - args.page_size):
+        if depth >= args.sessions:
+            continue
+        print(f"{f'keyset: page at row {depth}':<34} {await timed(keyset(depth)):>9.2f}")
+        print(f"{f'offset: page at row {depth}':<34} {await timed(offset(depth)):>9.2f}")
+    print(f"{'keyset: status=active, row 50000':<34} {await timed(keyset(min(50000, args.sessions - 1), status='active')):>9.2f}")
+    print(f"{'keyset: role=SRE, row 50000':<34} {await timed(keyset(min(50000, args.sessions - 1), role='SRE')):>9.2f}")
+
+    async with engine.connect() as conn:
+        plan = (await conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM interview_sessions WHERE user_id = :u AND (created_at, id) < (:c, :i) "
+            "ORDER BY created_at DESC, id DESC LIMIT 51"
+        ), {"u": user_id, "c": "2024", "i": ""})).all()
+        print("plan:", "; ".join(row[-1] for row in plan))
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--other-sessions", type=int, default=20000, help="Sessions of other users in the table")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/bench.db"
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Cost of adding interview rounds to a session, on SQLite.
+
+- 50th round:   latency of adding one round to a session that already has 49
+- 50 rounds:    adding 50 rounds to an empty session, one request each or in one bulk request
+
+"legacy" is the previous add_evaluation_round, rebuilt here: it loaded the session with
+every existing round (including its raw evaluation JSON) to number the new one, then
+committed and refreshed per round. "counter" numbers rounds from the session's
+round_count column; "bulk" is add_evaluation_rounds, one transaction for all rounds.
+
+    python -m benchmarks.bench_session_rounds --prior 49 --bulk 50 --repeats 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+WEAKNESSES = [
+    "Did not discuss failure modes of the proposed queue", "Vague on consistency guarantees across regions",
+    "Lacked metrics to back the latency claims", "Unclear data model for multi-tenant isolation",
+    "Skipped capacity planning for peak load", "No rollback plan for the schema migration",
+]
+
+
+def make_round(rng):
+    from app.schemas.session import RoundCreate
+
+    return RoundCreate(round_evaluation={
+        "scores": {axis: rng.randint(4, 9) for axis in
+                   ("conceptual_clarity", "technical_depth", "real_world_application", "communication_precision")},
+        "weaknesses": rng.sample(WEAKNESSES, 3),
+        "final_score": rng.randint(40, 90),
+        "audit": {"hallucination_detected": rng.random() < 0.1, "reasoning_alignment_score": 8, "score_consistency": "Consistent"},
+    })
+
+
+async def legacy_add_round(db, user_id, session_id, round_in):
+    from app.models.session import RoundEvaluation
+    from app.services.session_service import get_session_detail
+
+    session = await get_session_detail(db, user_id, session_id)
+    eval_data = round_in.round_evaluation
+    db_round = RoundEvaluation(
+        session_id=session_id,
+        round_number=len(session.rounds) + 1,
+        final_score=eval_data.final_score,
+        hallucination_detected=eval_data.audit.hallucination_detected,
+        reasoning_alignment_score=eval_data.audit.reasoning_alignment_score,
+        score_consistency=eval_data.audit.score_consistency,
+        raw_evaluation_json=eval_data.model_dump()
+    )
+    db.add(db_round)
+    await db.commit()
+    await db.refresh(db_round)
+    return db_round
+
+
+async def run(args):
+    from app.core.database import AsyncSessionLocal, Base, engine, upgrade_schema
+    from app.models import user, session, ingest_job  # noqa: F401
+    from app.schemas.session import SessionCreate
+    from app.services.session_service import add_evaluation_round, add_evaluation_rounds, create_session
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(upgrade_schema)
+
+    rng = random.Random(0)
+    user_id = "bench-user"
+
+    async def new_session(prior):
+        async with AsyncSessionLocal() as db:
+            created = await create_session(db, user_id, SessionCreate(role="Backend Engineer"))
+            if prior:
+                await add_evaluation_rounds(db, user_id, created.id, [make_round(rng) for _ in range(prior)])
+            return created.id
+
+    async def timed(prior, fn):
+        total = 0.0
+        for _ in range(args.repeats):
+            session_id = await new_session(prior)
+            async with AsyncSessionLocal() as db:
+                start = time.perf_counter()
+                await fn(db, session_id)
+                total += time.perf_counter() - start
+        return total * 1000 / args.repeats
+
+    async def sequential(add):
+        async def fn(db, session_id):
+            for _ in range(args.bulk):
+                await add(db, user_id, session_id, make_round(rng))
+        return fn
+
+    rows = [
+        (f"round {args.prior + 1}", "legacy", args.prior, lambda db, sid: legacy_add_round(db, user_id, sid, make_round(rng))),
+        (f"round {args.prior + 1}", "counter", args.prior, lambda db, sid: add_evaluation_round(db, user_id, sid, make_round(rng))),
+        (f"{args.bulk} rounds", "legacy, one by one", 0, await sequential(legacy_add_round)),
+        (f"{args.bulk} rounds", "counter, one by one", 0, await sequential(add_evaluation_round)),
+        (f"{args.bulk} rounds", "bulk", 0, lambda db, sid: add_evaluation_rounds(db, user_id, sid, [make_round(rng) for _ in range(args.bulk)])),
+    ]
+    print(f"{'operation':<12} {'path':<22} {'ms':>9}")
+    for operation, path, prior, fn in rows:
+        print(f"{operation:<12} {path:<22} {await timed(prior, fn):>9.2f}")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--prior", type=int, default=49, help="Rounds already in the session for the single-round case")
+    parser.add_argument("--bulk", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/bench.db"
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
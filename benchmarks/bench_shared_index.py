@@ -0,0 +1,95 @@
+"""
+Several worker processes sharing one FAISS index directory, as uvicorn/gunicorn
+workers do. Every worker adds batches, deletes one of its resumes and searches
+while the others write; snapshots are triggered along the way, so workers also
+hot-reload memory-mapped snapshots written by someone else. At the end every
+worker reports the ids and chunk counts it sees, which must be identical, and
+the time its searches took including catch-up.
+
+    python -m benchmarks.bench_shared_index --workers 4 --batches 50
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+
+
+def worker(rank, args, index_path, barrier, results):
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ["FAISS_INDEX_PATH"] = index_path
+    os.environ["FAISS_SNAPSHOT_INTERVAL"] = str(args.snapshot_interval)
+    from app.services.faiss_store import faiss_store, index_type_of
+
+    rng = np.random.default_rng(rank)
+    barrier.wait()
+    search_ms = []
+    for batch in range(args.batches):
+        vectors = rng.standard_normal((args.chunks, faiss_store.dimension), dtype=np.float32)
+        filename = f"worker{rank}_resume{batch}.pdf"
+        faiss_store.add_vectors(vectors.tolist(), [
+            {"filename": filename, "text": f"{filename} chunk {i}", "chunk_index": i, "owner_id": f"user{rank}"}
+            for i in range(args.chunks)
+        ])
+        start = time.perf_counter()
+        hits = faiss_store.search(vectors[0].tolist(), top_k=1, filename=filename)
+        search_ms.append((time.perf_counter() - start) * 1000)
+        # A worker always sees its own write, whatever the others did in between
+        assert hits and hits[0][0]["filename"] == filename, (rank, batch, hits)
+    faiss_store.delete_document(f"worker{rank}_resume0.pdf")
+    faiss_store.wait_for_snapshot()
+    barrier.wait()
+
+    # Everyone has finished writing: each worker must now see exactly the same index
+    query = np.ones(faiss_store.dimension, dtype=np.float32).tolist()
+    top = faiss_store.search(query, top_k=args.workers * args.batches * args.chunks)
+    results.put((
+        rank,
+        sorted((m["filename"], m["chunk_index"]) for m, _ in top),
+        faiss_store.index.ntotal + faiss_store.delta.ntotal,
+        faiss_store._snapshot_generation,
+        index_type_of(faiss_store.index),
+        float(np.median(search_ms)),
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batches", type=int, default=50)
+    parser.add_argument("--chunks", type=int, default=10, help="Chunks per simulated resume upload")
+    parser.add_argument("--snapshot-interval", type=int, default=200)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    index_path = os.path.join(tmp, "shared_index.bin")
+    ctx = multiprocessing.get_context("spawn")
+    # A worker that fails breaks the barrier for the others instead of leaving them waiting
+    barrier = ctx.Barrier(args.workers, timeout=120)
+    results = ctx.Queue()
+    processes = [ctx.Process(target=worker, args=(rank, args, index_path, barrier, results)) for rank in range(args.workers)]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    reports = sorted(results.get(timeout=300) for _ in processes)
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+
+    assert all(process.exitcode == 0 for process in processes), [process.exitcode for process in processes]
+    expected = args.workers * (args.batches - 1) * args.chunks
+    print(f"{args.workers} workers x {args.batches} uploads of {args.chunks} chunks in {elapsed:.1f}s")
+    print(f"{'worker':>6} {'visible chunks':>15} {'vectors':>8} {'snapshot gen':>13} {'index':>9} {'search p50 ms':>14}")
+    for rank, visible, vectors, snapshot_generation, index_type, search_ms in reports:
+        print(f"{rank:>6} {len(visible):>15} {vectors:>8} {snapshot_generation:>13} {index_type:>9} {search_ms:>14.2f}")
+    # HNSW is approximate even at k = ntotal, so only exact indexes must return every live chunk
+    if reports[0][4] != "hnsw":
+        assert all(len(report[1]) == expected for report in reports), f"a worker is missing chunks (expected {expected})"
+    assert all(report[1] == reports[0][1] for report in reports), "workers disagree on the index"
+    print("all workers see the same index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Cold start of the API process against an index on disk, each run in a fresh interpreter:
+
+- import:        `import app.main`
+- startup:       lifespan until the server would accept connections
+- first search:  latency of the first GET /search issued right after startup
+- ready:         process start until /ready returns 200
+
+The "eager" row emulates the previous startup: the OpenAI SDK, faiss, PyPDF2 and
+tiktoken imported up front, and the index read into memory (no mmap) at import.
+Query embeddings are stubbed, so no network is needed.
+
+    python -m benchmarks.bench_startup --vectors 50000 --tail 2000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+
+def build_index(index_path, vectors, tail, dim):
+    """Writes a snapshot of `vectors` vectors plus `tail` more in the segment log, as a running service leaves it."""
+    os.environ["FAISS_INDEX_PATH"] = index_path
+    os.environ["FAISS_SNAPSHOT_INTERVAL"] = str(1 << 62)
+    from app.services.faiss_store import FaissStore
+
+    store = FaissStore()
+    rng = np.random.default_rng(0)
+
+    def add(start, stop):
+        for batch in range(start, stop, 5000):
+            n = min(5000, stop - batch)
+            store.add_vectors(rng.standard_normal((n, dim), dtype=np.float32).tolist(), [
+                {"filename": f"resume_{(batch + i) // 10}.pdf", "text": "x" * 200, "chunk_index": (batch + i) % 10}
+                for i in range(n)
+            ])
+
+    add(0, vectors)
+    store.save_index()
+    add(vectors, vectors + tail)
+
+
+def child(mode):
+    """Runs in a fresh interpreter and prints its timings as JSON."""
+    start = time.perf_counter()
+    if mode == "eager":
+        import faiss  # noqa: F401
+        import openai  # noqa: F401
+        import PyPDF2  # noqa: F401
+        import tiktoken  # noqa: F401
+        os.environ["FAISS_MMAP"] = "false"
+    import app.main
+    from app.services import retrieval
+    from app.services.faiss_store import faiss_store
+    if mode == "eager":
+        faiss_store.ensure_loaded()
+    imported = time.perf_counter()
+
+    async def query_embedding(text):
+        return np.random.default_rng(0).standard_normal(faiss_store.dimension).tolist()
+
+    retrieval.get_query_embedding = query_embedding
+    from fastapi.testclient import TestClient
+
+    with TestClient(app.main.app) as client:
+        started = time.perf_counter()
+        response = client.get("/search", params={"query": "distributed systems", "top_k": 5})
+        searched = time.perf_counter()
+        assert response.status_code == 200 and response.json()["results"], response.text
+        while client.get("/ready").status_code != 200:
+            time.sleep(0.01)
+        ready = time.perf_counter()
+    print(json.dumps({
+        "import": imported - start,
+        "startup": started - imported,
+        "first_search": searched - started,
+        "ready": ready - start,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--vectors", type=int, default=50000, help="Vectors in the snapshot")
+    parser.add_argument("--tail", type=int, default=2000, help="Vectors logged after the snapshot")
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--child", choices=("eager", "lazy"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    if args.child:
+        child(args.child)
+        return
+
+    tmp = tempfile.mkdtemp()
+    index_path = os.path.join(tmp, "bench_index.bin")
+    env = dict(
+        os.environ,
+        FAISS_INDEX_PATH=index_path,
+        DATABASE_URL=f"sqlite+aiosqlite:///{tmp}/bench.db",
+        EMBEDDING_CACHE_PATH=os.path.join(tmp, "embeddings.db"),
+        LLM_CACHE_PATH=os.path.join(tmp, "llm_cache.db"),
+    )
+    subprocess.run(
+        [sys.executable, "-c", f"from benchmarks.bench_startup import build_index; build_index({index_path!r}, {args.vectors}, {args.tail}, {args.dim})"],
+        env=env, check=True
+    )
+    print(f"{args.vectors} vectors in the snapshot, {args.tail} in the log, dim={args.dim}")
+
+    print(f"{'mode':<6} {'import s':>9} {'startup s':>10} {'first search s':>15} {'ready s':>8}")
+    for mode in ("eager", "lazy"):
+        runs = []
+        for _ in range(args.repeat):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_startup", "--child", mode],
+                env=env, check=True, capture_output=True, text=True
+            ).stdout
+            runs.append(json.loads(out.strip().splitlines()[-1]))
+        best = {key: min(run[key] for run in runs) for key in runs[0]}
+        print(f"{mode:<6} {best['import']:>9.2f} {best['startup']:>10.2f} {best['first_search']:>15.3f} {best['ready']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
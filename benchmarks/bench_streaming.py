@@ -0,0 +1,76 @@
+"""
+Time to first question / first evaluation field with SSE streaming.
+
+Runs question generation and answer evaluation against a stubbed chat backend
+that produces tokens at a fixed rate, and compares the blocking call's total
+latency with the streaming variant's time to its first event and to its result.
+
+    python -m benchmarks.bench_streaming --token-ms 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from benchmarks._synthetic import StubChat, StubEmbeddings, synthetic_text
+
+QUESTIONS = {"questions": [f"{synthetic_text(30, seed=i)}?" for i in range(5)]}
+EVALUATION = {
+    "scores": {"conceptual_clarity": 7, "technical_depth": 6, "real_world_application": 8, "communication_precision": 7},
+    "confidence_level": "Medium",
+    "strengths": [synthetic_text(20, seed=10), synthetic_text(20, seed=11)],
+    "weaknesses": [synthetic_text(20, seed=12), synthetic_text(20, seed=13)],
+    "improvement_suggestions": [synthetic_text(20, seed=14), synthetic_text(20, seed=15)],
+    "final_score": 70,
+}
+
+
+async def measure(blocking, streaming):
+    start = time.perf_counter()
+    await blocking()
+    blocking_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    first_ms = None
+    async for event, _ in streaming():
+        if first_ms is None:
+            first_ms = (time.perf_counter() - start) * 1000
+    return blocking_ms, first_ms, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Time to the first generated token")
+    parser.add_argument("--token-ms", type=float, default=20.0, help="Time per further generated token")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ["FAISS_INDEX_PATH"] = os.path.join(tmp, "bench_index.bin")
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+
+    from app.schemas.evaluation import EvaluationRequest
+    from app.services import llm_scheduler
+    from app.services.evaluation_agent import evaluate_candidate_answer, stream_candidate_evaluation
+    from app.services.question_agent import generate_interview_questions, stream_interview_questions
+
+    llm_scheduler.get_client().embeddings = StubEmbeddings(latency_s=0.0)
+    request = EvaluationRequest(question="How would you shard the index?", answer=synthetic_text(80), resume_context="")
+    cases = (
+        ("questions", QUESTIONS,
+         lambda: generate_interview_questions("Backend Engineer"), lambda: stream_interview_questions("Backend Engineer")),
+        ("evaluation", EVALUATION,
+         lambda: evaluate_candidate_answer(request), lambda: stream_candidate_evaluation(request)),
+    )
+
+    print(f"{'call':<12} {'blocking ms':>12} {'first event ms':>15} {'stream result ms':>17}")
+    for label, content, blocking, streaming in cases:
+        llm_scheduler.get_client().chat = StubChat(json.dumps(content), args.latency_ms / 1000, args.token_ms / 1000)
+        blocking_ms, first_ms, total_ms = asyncio.run(measure(blocking, streaming))
+        print(f"{label:<12} {blocking_ms:>12.0f} {first_ms:>15.0f} {total_ms:>17.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import io
+import multiprocessing
+import os
+import time
+
+import pytest
+from PyPDF2 import PdfWriter
+
+from app.core.config import settings
+from app.utils import pdf_parser
+from app.utils.pdf_parser import PDFLimitError
+
+
+def _blank_pdf(pages: int) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=72, height=72)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def _slow_page_range(file_bytes: bytes, start: int, stop: int):
+    """Stands in for a page whose extraction never finishes in reasonable time."""
+    with open(os.environ["SLOW_PAGE_PID_FILE"], "w") as f:
+        f.write(str(os.getpid()))
+    time.sleep(60)
+    return [""] * (stop - start)
+
+
+@pytest.fixture
+def single_worker(monkeypatch):
+    # With one worker, a stuck page would make the next document queue behind it
+    monkeypatch.setattr(settings, "pdf_workers", 1)
+    pdf_parser.shutdown_pool()
+    yield
+    pdf_parser.shutdown_pool()
+
+
+def test_timeout_kills_the_worker_stuck_on_a_slow_page(single_worker, monkeypatch, tmp_path):
+    pid_file = tmp_path / "worker.pid"
+    monkeypatch.setenv("SLOW_PAGE_PID_FILE", str(pid_file))
+    monkeypatch.setattr(pdf_parser, "_extract_page_range", _slow_page_range)
+
+    start = time.monotonic()
+    with pytest.raises(PDFLimitError, match="exceeded"):
+        list(pdf_parser.iter_pdf_pages(_blank_pdf(2), timeout_s=0.5))
+    assert time.monotonic() - start < 5
+
+    stuck_pid = int(pid_file.read_text())
+    deadline = time.monotonic() + 5
+    while stuck_pid in {child.pid for child in multiprocessing.active_children()}:
+        assert time.monotonic() < deadline, "worker running the slow page was not stopped"
+        time.sleep(0.05)
+
+    # The next document gets a fresh worker instead of waiting out the slow page
+    monkeypatch.undo()
+    start = time.monotonic()
+    assert list(pdf_parser.iter_pdf_pages(_blank_pdf(2), timeout_s=10)) == [(1, ""), (2, "")]
+    assert time.monotonic() - start < 5
+
+
+def test_page_limit(single_worker):
+    with pytest.raises(PDFLimitError, match="pages"):
+        list(pdf_parser.iter_pdf_pages(_blank_pdf(3), max_pages=2))